@@ -11,10 +11,43 @@
 from mo_dots import Null, to_data, leaves_to_data, is_list
 from mo_imports import delay_import
 from mo_logs import Except
-from mo_logs.strings import toString, FORMATTERS
+from mo_logs.exceptions import get_stacktrace
 from mo_times import Timer
 
-from mo_json.scrubber import Scrubber, _keep_whitespace, trim_whitespace
+from mo_json.backends import register_backend, use_backend
+from mo_json.batch import batch_json
+from mo_json.compact import Compact, CompactScrubber, from_columns
+from mo_json.binary import (
+    BINARY_BASE64,
+    BINARY_BASE85,
+    BINARY_TEXT,
+    binary_types,
+    decode_binary,
+    utf8_buffer,
+    utf8_text,
+)
+from mo_json.digest import distinct_json, json_hash
+from mo_json.estimate import estimate_json_size
+from mo_json.flexible import flexible_decode, remove_line_comment, strip_comments
+from mo_json.formats import cbor2value, msgpack2value, value2cbor, value2msgpack
+from mo_json.guard import LimitExceeded, Limits, check_limits
+from mo_json.lazy import LazyList, LazyObject, lazy_value
+from mo_json.patch import json_diff, json_patch
+from mo_json.scrubber import (
+    DECIMAL_FLOAT,
+    DECIMAL_INT,
+    DECIMAL_STRING,
+    Scrubber,
+    _keep_whitespace,
+    shared_scrubber,
+    trim_whitespace,
+)
+from mo_json.shared import SharedJson, shared2value, value2shared
+from mo_json.temporal import ISO, MILLI, UNIX, convert_times
+from mo_json.template import compile_template
+from mo_json.tracer import PYPY_FALLBACK, SlowPathTracer, traced
+from mo_json.tracked import TrackedDocument
+from mo_json.truncate import Budget, truncated_json
 from mo_json.typed_encoder import detype
 from mo_json.typed_object import entype
 from mo_json.types import *
@@ -23,9 +56,17 @@ from mo_json.utils import *
 __all__ = [
     "ARRAY",
     "ARRAY_KEY",
+    "BINARY_BASE64",
+    "BINARY_BASE85",
+    "BINARY_TEXT",
     "BOOLEAN",
+    "Compact",
+    "DECIMAL_FLOAT",
+    "DECIMAL_INT",
+    "DECIMAL_STRING",
     "EXISTS",
     "INTERVAL",
+    "ISO",
     "IS_NULL",
     "JX_ANY",
     "JX_ARRAY",
@@ -36,49 +77,129 @@ __all__ = [
     "JX_NUMBER",
     "JX_TEXT",
     "JX_TIME",
+    "JsonDecodeError",
+    "LazyList",
+    "LazyObject",
+    "LimitExceeded",
+    "Limits",
+    "MILLI",
     "NUMBER",
     "OBJECT",
     "STRING",
+    "SharedJson",
+    "SlowPathTracer",
+    "StringMemo",
     "TIME",
+    "TrackedDocument",
+    "UNIX",
     "INTEGER",
+    "Budget",
+    "batch_json",
+    "cbor2value",
+    "convert_times",
     "detype",
+    "distinct_json",
     "entype",
+    "estimate_json_size",
+    "from_columns",
     "jx_type_to_json_type",
     "json2value",
+    "json_diff",
+    "json_hash",
+    "json_patch",
+    "msgpack2value",
     "python_type_to_jx_type",
     "python_type_to_json_type",
+    "register_backend",
+    "shared2value",
     "to_jx_type",
+    "truncated_json",
+    "use_backend",
+    "value2cbor",
     "value2json",
+    "value2msgpack",
+    "value2shared",
     "value_to_jx_type",
 ]
 
 logger = delay_import("mo_logs.logger")
-hjson2value = delay_import("hjson.loads")
 
 
 SNAP_TO_BASE_10 = False  # Identify floats near a round base10 value (has 000 or 999) and shorten
 FIND_LOOPS = True  # FIND LOOPS IN DATA STRUCTURES
-CAN_NOT_DECODE_JSON = "Can not decode JSON"
 
 true, false, null = True, False, None
 
 _get = object.__getattribute__
 
 
-def scrub(value, keep_whitespace=True):
-    return Scrubber(scrub_text=_keep_whitespace if keep_whitespace else trim_whitespace).scrub(value)
+DEFAULT_RULES = dict(scrub_text=_keep_whitespace, time_format=UNIX, decimal_policy=DECIMAL_INT, binary_policy=BINARY_TEXT)
 
 
-def value2json(obj, pretty=False, sort_keys=False, keep_whitespace=True):
+def scrub(value, keep_whitespace=True, in_place=False):
+    """
+    :param value: ANY VALUE
+    :param keep_whitespace: False TO TRIM STRINGS
+    :param in_place: True TO CLEAN THE dict AND list IN value WITHOUT COPYING THEM (value IS CHANGED)
+    :return: VALUE THAT CAN BE JSON-IZED
+    """
+    return shared_scrubber(scrub_text=_keep_whitespace if keep_whitespace else trim_whitespace, in_place=in_place).scrub(
+        value
+    )
+
+
+def value2json(
+    obj,
+    pretty=False,
+    sort_keys=False,
+    keep_whitespace=True,
+    budget=None,
+    time_format=UNIX,
+    decimal_policy=DECIMAL_INT,
+    binary_policy=BINARY_TEXT,
+    compact=None,
+):
     """
     :param obj:  THE VALUE TO TURN INTO JSON
     :param pretty: True TO MAKE A MULTI-LINE PRETTY VERSION
     :param sort_keys: True TO SORT KEYS
     :param keep_whitespace: False TO strip() THE WHITESPACE IN THE VALUES
+    :param budget: Budget TO STOP WALKING HUGE VALUES, EMITTING "..." MARKERS INSTEAD
+    :param time_format: HOW TIMES ARE EMITTED: UNIX (SECONDS), MILLI OR ISO
+    :param decimal_policy: HOW Decimal IS EMITTED: DECIMAL_INT (EXACT WHEN INTEGRAL), DECIMAL_FLOAT OR DECIMAL_STRING
+    :param binary_policy: HOW BINARY IS EMITTED: BINARY_TEXT (LATIN-1), OR TAGGED WITH BINARY_BASE64 OR BINARY_BASE85
+    :param compact: Compact PROFILE TO MAKE THE JSON SMALLER
     :return:
     """
+    rules = dict(
+        scrub_text=_keep_whitespace if keep_whitespace else trim_whitespace,
+        time_format=time_format,
+        decimal_policy=decimal_policy,
+        binary_policy=binary_policy,
+    )
+    if obj.__class__ is TrackedDocument and rules == DEFAULT_RULES and not (pretty or budget or compact):
+        # RE-ENCODE ONLY WHAT CHANGED
+        return obj.to_json()
+    if budget:
+        if compact:
+            obj = CompactScrubber(compact, **rules).scrub(obj)
+        json = truncated_json(
+            obj,
+            budget,
+            keep_whitespace=keep_whitespace,
+            time_format=time_format,
+            decimal_policy=decimal_policy,
+            binary_policy=binary_policy,
+        )
+        if pretty:
+            return pretty_json(json_decoder(json))
+        return json
+
     with Timer("scrub", too_long=0.1):
-        obj = Scrubber(scrub_text=_keep_whitespace if keep_whitespace else trim_whitespace).scrub(obj)
+        if compact:
+            obj = CompactScrubber(compact, **rules).scrub(obj)
+        else:
+            obj = shared_scrubber(**rules).scrub(obj)
     try:
         json = json_encoder(obj, pretty=pretty)
         if json == None:
@@ -90,196 +211,106 @@ def value2json(obj, pretty=False, sort_keys=False, keep_whitespace=True):
     except Exception as e:
         e = Except.wrap(e)
         try:
-            json = pypy_json_encode(obj)
+            json = traced(PYPY_FALLBACK, obj.__class__, pypy_json_encode, obj)
             return json
         except Exception:
             pass
         logger.error("Can not encode into JSON: {value}", value=str(repr(obj)), cause=e)
 
 
-def remove_line_comment(line):
-    mode = 0  # 0=code, 1=inside_string, 2=escaping
-    for i, c in enumerate(line):
-        if c == '"':
-            if mode == 0:
-                mode = 1
-            elif mode == 1:
-                mode = 0
-            else:
-                mode = 1
-        elif c == "\\":
-            if mode == 0:
-                mode = 0
-            elif mode == 1:
-                mode = 2
-            else:
-                mode = 1
-        elif mode == 2:
-            mode = 1
-        elif c == "#" and mode == 0:
-            return line[0:i]
-        elif c == "/" and mode == 0 and line[i + 1] == "/":
-            return line[0:i]
-    return line
-
-
 def check_depth(json, limit=30):
     """
     THROW ERROR IF JSON IS TOO DEEP
     :param json:  THE JSON STRING TO CHECK
     :param limit:  EXIST EARLY IF TOO DEEP
     """
-    l = len(json)
-    expecting = ["{"] * limit
-    e = -1
-    i = 0
-    while i < l:
-        c = json[i]
-        if c == '"':
-            i += 1
-            while True:
-                c = json[i]
-                if c == "\\" and json[i + 1] == '"':
-                    i += 2
-                    continue
-                i += 1
-                if c == '"':
-                    break
-        elif c == "{":
-            e += 1
-            expecting[e] = "}"
-            i += 1
-        elif c == "[":
-            e += 1
-            expecting[e] = "]"
-            i += 1
-        elif c in "]}":
-            if expecting[e] == c:
-                e -= 1
-            else:
-                logger.error("invalid JSON")
-            i += 1
-        else:
-            i += 1
-
-
-def json2value(json_string, params=Null, flexible=False, leaves=False):
+    try:
+        check_limits(json, Limits(max_depth=limit))
+    except LimitExceeded as cause:
+        logger.error("JSON is too deep", cause=cause)
+
+
+def json2value(
+    json_string,
+    params=Null,
+    flexible=False,
+    leaves=False,
+    binary=False,
+    lazy=False,
+    intern=False,
+    default=Null,
+    raise_fast=False,
+    limits=None,
+):
     """
-    :param json_string: THE JSON
+    :param json_string: THE JSON, AS str, OR UTF-8 bytes, bytearray OR memoryview (DECODED WITHOUT A TEXT COPY WHEN POSSIBLE)
     :param params: STANDARD JSON PARAMS
-    :param flexible: REMOVE COMMENTS (uses hjson)
+    :param flexible: ACCEPT COMMENTS AND TRAILING COMMAS (AND, WITH hjson, UNQUOTED KEYS AND VALUES)
     :param leaves: ASSUME JSON KEYS ARE DOT-DELIMITED
+    :param binary: True TO TURN {"$base64": ...} AND {"$base85": ...} TAGGED VALUES BACK INTO bytes
+    :param lazy: True TO RETURN A READ-ONLY PROXY THAT DECODES ONLY THE PARTS THAT ARE READ (SEE mo_json.lazy)
+    :param intern: True (OR A StringMemo) TO SHARE ONE str FOR EQUAL KEYS AND SHORT STRING VALUES, ACROSS CALLS
+    :param default: RETURNED, INSTEAD OF RAISING AN ERROR, WHEN THE JSON IS BAD
+    :param raise_fast: True TO RAISE THE JsonDecodeError WITHOUT A STACK TRACE (FOR BULK PIPELINES)
+    :param limits: Limits TO CHECK BEFORE DECODING, TO REJECT HOSTILE JSON (SEE mo_json.guard)
     :return: Python value
     """
-    if not isinstance(json_string, str) and json_string.__class__.__name__ != "FileString":
-        logger.error("only unicode json accepted")
+    if json_string.__class__ in binary_types:
+        json_string = utf8_buffer(json_string)
+    elif not isinstance(json_string, str) and json_string.__class__.__name__ != "FileString":
+        logger.error("only unicode json, or utf8 binary, accepted")
+    if lazy and (flexible or leaves or binary or intern):
+        logger.error("lazy=True can not be combined with flexible, leaves, binary or intern")
 
     try:
         if len(params):
             # LOOKUP REFERENCES
-            json_string = _simple_expand(json_string, (params,))
-
-        if flexible:
-            value = to_data(hjson2value(json_string))
-        else:
-            value = to_data(json_decoder(str(json_string)))
+            json_string = compile_template(utf8_text(json_string)).expand((params,))
 
-        if leaves:
-            value = leaves_to_data(value)
-
-        return value
-
-    except Exception as e:
-        e = Except.wrap(e)
+        if limits is not None:
+            check_limits(json_string, limits)
 
-        if not json_string.strip():
-            logger.error("JSON string is only whitespace")
+        if lazy:
+            if json_string.__class__ not in binary_types:
+                json_string = str(json_string)
+            return lazy_value(json_string)
 
-        c = e
-        while c.cause and "Expecting '" in c.cause and "' delimiter: line" in c.cause:
-            c = c.cause
-
-        if "Expecting '" in c and "' delimiter: line" in c:
-            line_index = int(strings.between(c.message, " line ", " column ")) - 1
-            column = int(strings.between(c.message, " column ", " ")) - 1
-            line = json_string.split("\n")[line_index].replace("\t", " ")
-            if column > 20:
-                sample = "..." + line[column - 20:]
-                pointer = "   " + (" " * 20) + "^"
+        if intern:
+            memo = shared_memo if intern is True else intern
+            if flexible:
+                hook = memo.hook_for(leaves, binary)
+                value = to_data(flexible_decode(utf8_text(json_string), memo.decoder(leaves, binary), object_pairs_hook=hook))
             else:
-                sample = line
-                pointer = (" " * column) + "^"
-
-            if len(sample) > 43:
-                sample = sample[:43] + "..."
-
-            logger.error(
-                CAN_NOT_DECODE_JSON + " at:\n\t{{sample}}\n\t{{pointer}}\n", sample=sample, pointer=pointer,
-            )
-
-        base_str = strings.limit(json_string, 1000).encode("utf8")
-        hexx_str = bytes2hex(base_str, " ")
-        try:
-            char_str = " " + "  ".join((chr(c) if c >= 32 else ".") for c in base_str)
-        except Exception as cause:
-            char_str = " "
-        logger.error(
-            CAN_NOT_DECODE_JSON + ":\n{{char_str}}\n{{hexx_str}}\n", char_str=char_str, hexx_str=hexx_str, cause=e,
-        )
-
-
-def bytes2hex(value, separator=" "):
-    return separator.join(f"{x:02X}" for x in value)
-
-
-_variable_pattern = re.compile(r"\{\{([\w_\.]+(\|[^\}^\|]+)*)\}\}")
-
-
-def _simple_expand(template, seq):
-    """
-    seq IS TUPLE OF OBJECTS IN PATH ORDER INTO THE DATA TREE
-    seq[-1] IS THE CURRENT CONTEXT
-    """
-
-    def replacer(found):
-        ops = found.group(1).split("|")
-
-        path = ops[0]
-        var = path.lstrip(".")
-        depth = min(len(seq), max(1, len(path) - len(var)))
-        try:
-            val = seq[-depth]
-            if var:
-                if is_sequence(val) and float(var) == round(float(var), 0):
-                    val = val[int(var)]
-                else:
-                    val = val[var]
-            for func_name in ops[1:]:
-                parts = func_name.split("(")
-                if len(parts) > 1:
-                    val = eval(parts[0] + "(val, " + "(".join(parts[1::]))
-                else:
-                    val = FORMATTERS[func_name](val)
-            val = toString(val)
-            return val
-        except Exception as cause:
-            from mo_logs import Except
+                value = to_data(memo.decoder(leaves, binary)(utf8_text(json_string)))
+        elif flexible:
+            # COMMENTS AND TRAILING COMMAS ARE REMOVED FOR THE C DECODER; ONLY TRUE hjson GOES TO hjson
+            if leaves:
+                # EXPAND THE PATHS WHILE PARSING, NOT IN A SECOND PASS
+                hook = leaves_binary_hook if binary else leaves_hook
+                decoder = leaves_binary_decoder if binary else leaves_decoder
+                value = to_data(flexible_decode(utf8_text(json_string), decoder, object_pairs_hook=hook))
+            elif binary:
+                value = to_data(flexible_decode(utf8_text(json_string), binary_decoder, object_hook=decode_binary))
+            else:
+                value = to_data(flexible_decode(utf8_text(json_string), json_decoder))
+        elif leaves:
+            # EXPAND THE PATHS WHILE PARSING, NOT IN A SECOND PASS
+            decoder = leaves_binary_decoder if binary else leaves_decoder
+            value = to_data(decoder(utf8_text(json_string)))
+        elif binary:
+            value = to_data(binary_decoder(utf8_text(json_string)))
+        elif json_string.__class__ in binary_types:
+            value = to_data(json_decoder(json_string))
+        else:
+            value = to_data(json_decoder(str(json_string)))
 
-            cause = Except.wrap(cause)
-            try:
-                if cause.message.find("is not JSON serializable"):
-                    # WORK HARDER
-                    val = toString(val)
-                    return val
-            except Exception as f:
-                logger.warning(
-                    "Can not expand " + "|".join(ops) + " in template: {{template_|json}}",
-                    template_=template,
-                    cause=cause,
-                )
-            return "[template expansion error: (" + str(cause.message) + ")]"
+        return value
 
-    return _variable_pattern.sub(replacer, template)
+    except Exception as cause:
+        if default is not Null:
+            return default
+        # THE DESCRIPTION IS ONLY MADE IF THE ERROR IS SHOWN
+        raise JsonDecodeError(json_string, cause, trace=None if raise_fast else get_stacktrace(1)) from None
 
 
 def get_if_type(value, json_type):
@@ -312,5 +343,17 @@ def is_json_type(value, json_type):
     return False
 
 
-from mo_json.decoder import json_decoder
-from mo_json.encoder import json_encoder, pypy_json_encode
+from mo_json.decoder import (
+    CAN_NOT_DECODE_JSON,
+    JsonDecodeError,
+    StringMemo,
+    binary_decoder,
+    bytes2hex,
+    json_decoder,
+    leaves_binary_decoder,
+    leaves_binary_hook,
+    leaves_decoder,
+    leaves_hook,
+    shared_memo,
+)
+from mo_json.encoder import json_encoder, pretty_json, pypy_json_encode
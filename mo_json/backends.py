@@ -0,0 +1,198 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# THE C-LEVEL ENCODER AND DECODER BEHIND value2json() AND json2value()
+#
+# THE FASTEST INSTALLED BACKEND IS USED; THE STANDARD LIBRARY IS USED, FOR
+# THAT ONE CALL, WHEN THE BACKEND CAN NOT HANDLE THE VALUE
+#
+#     use_backend(STDLIB)   # FORCE THE STANDARD LIBRARY
+#     use_backend()         # BACK TO THE FASTEST INSTALLED
+#
+import json
+
+from mo_future import utf8_json_encoder
+from mo_imports import delay_import
+
+from mo_json.binary import utf8_text
+from mo_json.tracer import STDLIB_FALLBACK, traced
+
+logger = delay_import("mo_logs.logger")
+
+STDLIB = "stdlib"
+ORJSON = "orjson"
+UJSON = "ujson"
+
+PREFERRED = [ORJSON, UJSON, STDLIB]  # FASTEST FIRST
+
+# INTEGERS BEYOND THE 64-BIT RANGE ARE TURNED INTO float BY THE FAST BACKENDS
+_LONG_DIGITS = b"0" * 20  # 2**64 HAS 20 DIGITS
+_LONG_NEGATIVE = b"-" + b"0" * 19  # -2**63 HAS 19 DIGITS
+_EXPONENT = b"0e"
+_SMALL = b"0.0000"  # repr() WRITES FLOATS UNDER 1e-4 WITH AN EXPONENT
+_DIGITS_TO_ZERO = bytes.maketrans(b"0123456789", b"0" * 10)
+_CHUNK = 1 << 16
+_OVERLAP = len(_LONG_DIGITS)  # SO A RUN OF DIGITS ACROSS TWO CHUNKS IS STILL FOUND
+
+
+class Backend:
+    __slots__ = ["name", "encode", "decode"]
+
+    def __init__(self, name, encode, decode):
+        """
+        :param name: NAME USED WITH use_backend()
+        :param encode: FUNCTION FROM SCRUBBED VALUE TO str, WITH SORTED KEYS, NO WHITESPACE, AND NO ASCII ESCAPING
+        :param decode: FUNCTION FROM JSON str (OR UTF-8 BINARY) TO VALUE; IT IS NOT GIVEN DOCUMENTS WITH LONG RUNS OF DIGITS
+        """
+        self.name = name
+        self.encode = encode
+        self.decode = decode
+
+
+_backends = {}
+_current = None
+
+
+def register_backend(name, encode, decode):
+    """
+    ADD (OR REPLACE) A BACKEND; IT IS USED ONLY AFTER use_backend(name)
+    """
+    _backends[name] = Backend(name, encode, decode)
+
+
+def available_backends():
+    """
+    :return: NAMES OF THE INSTALLED BACKENDS
+    """
+    return list(_backends)
+
+
+def use_backend(name=None):
+    """
+    :param name: BACKEND TO USE; None FOR THE FASTEST INSTALLED
+    :return: NAME OF THE BACKEND THAT WAS IN USE
+    """
+    global _current
+    if name is None:
+        name = next(n for n in PREFERRED if n in _backends)
+    backend = _backends.get(name)
+    if not backend:
+        logger.error(
+            "Expecting backend to be one of {backends}, not {name|quote}", backends=available_backends(), name=name,
+        )
+    previous = _current.name if _current else None
+    _current = backend
+    return previous
+
+
+def current_backend():
+    return _current.name
+
+
+def encode(value):
+    """
+    :param value: SCRUBBED VALUE
+    :return: JSON str
+    """
+    backend = _current
+    if backend.encode is utf8_json_encoder:
+        return utf8_json_encoder(value)
+    try:
+        return backend.encode(value)
+    except Exception:
+        # BIG INTEGERS, LONE SURROGATES, DEEP NESTING, ...
+        return traced(STDLIB_FALLBACK, value.__class__, utf8_json_encoder, value)
+
+
+def decode(json_string):
+    """
+    :param json_string: JSON str, OR UTF-8 bytes, bytearray OR memoryview (GIVEN TO THE BACKEND AS-IS, NOT COPIED TO TEXT)
+    :return: THE VALUE
+    """
+    backend = _current
+    if backend.decode is _stdlib_decode:
+        return _stdlib_decode(json_string)
+    if _has_long_digits(json_string):
+        # EXACT BIG INTEGERS
+        return traced(STDLIB_FALLBACK, json_string.__class__, _stdlib_decode, json_string)
+    try:
+        return backend.decode(json_string)
+    except Exception:
+        # NaN, Infinity, LONE SURROGATES, ... (THE STANDARD LIBRARY ALSO REPORTS THE LINE AND COLUMN OF REAL ERRORS)
+        return traced(STDLIB_FALLBACK, json_string.__class__, _stdlib_decode, json_string)
+
+
+def _stdlib_decode(json_string):
+    return json.loads(utf8_text(json_string))
+
+
+def _has_long_digits(json_string):
+    """
+    FIND ANY NUMBER THAT MAY BE OUTSIDE THE 64-BIT RANGE, AT C SPEED (FALSE POSITIVES, LIKE LONG DIGIT STRINGS, ONLY COST SPEED)
+    BIG DOCUMENTS ARE CHECKED IN CHUNKS, SO ONLY ONE CHUNK IS COPIED AT A TIME
+    """
+    size = len(json_string)
+    start = 0
+    while True:
+        chunk = json_string[start : start + _CHUNK + _OVERLAP]
+        if chunk.__class__ is str:
+            chunk = chunk.encode("utf8", "surrogatepass")
+        elif chunk.__class__ is memoryview:
+            chunk = chunk.tobytes()
+        shape = chunk.translate(_DIGITS_TO_ZERO)
+        if shape.find(_LONG_DIGITS) != -1 or shape.find(_LONG_NEGATIVE) != -1:
+            return True
+        if start + _CHUNK + _OVERLAP >= size:
+            return False
+        start += _CHUNK
+
+
+def _has_exponent(json_bytes):
+    """
+    FIND ANY DIGIT FOLLOWED BY "e", OR A NUMBER THE STANDARD LIBRARY WOULD WRITE WITH
+    AN EXPONENT, LIKE 0.00001 (FALSE POSITIVES, LIKE HEX IN STRINGS, ONLY COST SPEED)
+    """
+    return json_bytes.find(_SMALL) != -1 or json_bytes.translate(_DIGITS_TO_ZERO).find(_EXPONENT) != -1
+
+
+register_backend(STDLIB, utf8_json_encoder, _stdlib_decode)
+
+try:
+    import orjson
+
+    _orjson_dumps = orjson.dumps
+    _OPT_SORT_KEYS = orjson.OPT_SORT_KEYS
+
+    def _orjson_encode(value):
+        output = _orjson_dumps(value, option=_OPT_SORT_KEYS)
+        if _has_exponent(output):
+            # THE STANDARD LIBRARY SPELLS 1e-05, 1e-07 AND 1.5e+300 DIFFERENTLY
+            return utf8_json_encoder(value)
+        return output.decode("utf8")
+
+    register_backend(ORJSON, _orjson_encode, orjson.loads)
+except ImportError:
+    pass
+
+try:
+    import ujson
+
+    _ujson_dumps = ujson.dumps
+
+    def _ujson_encode(value):
+        output = _ujson_dumps(value, ensure_ascii=False, sort_keys=True, escape_forward_slashes=False)
+        if _has_exponent(output.encode("utf8")):
+            return utf8_json_encoder(value)
+        return output
+
+    register_backend(UJSON, _ujson_encode, ujson.loads)
+except ImportError:
+    pass
+
+use_backend()
@@ -0,0 +1,87 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from mo_imports import delay_import
+
+logger = delay_import("mo_logs.logger")
+value2json = delay_import("mo_json.value2json")
+
+NDJSON = "ndjson"
+ARRAY = "array"
+
+_formats = {
+    # (prefix, separator, suffix)
+    NDJSON: (b"", b"", b"\n"),
+    ARRAY: (b"[", b",", b"]"),
+}
+
+
+class Batch:
+    """
+    ONE READY-TO-SEND BODY OF ENCODED DOCUMENTS
+    """
+
+    __slots__ = ["data", "count", "too_big"]
+
+    def __init__(self, data, count, too_big=False):
+        self.data = data  # UTF-8 BYTES
+        self.count = count  # NUMBER OF DOCUMENTS IN data
+        self.too_big = too_big  # True IF THIS IS A SINGLE DOCUMENT THAT EXCEEDS max_bytes
+
+    def __len__(self):
+        return len(self.data)
+
+    def __repr__(self):
+        return f"Batch(count={self.count}, size={len(self.data)}, too_big={self.too_big})"
+
+
+def batch_json(values, max_bytes, max_count=None, format=NDJSON):
+    """
+    ENCODE EACH VALUE EXACTLY ONCE, AND GROUP THEM INTO BODIES OF AT MOST max_bytes AND max_count
+    :param values: ITERABLE OF VALUES TO ENCODE
+    :param max_bytes: MAXIMUM NUMBER OF BYTES IN A BATCH
+    :param max_count: MAXIMUM NUMBER OF DOCUMENTS IN A BATCH (None FOR NO LIMIT)
+    :param format: "ndjson" FOR LINE-DELIMITED DOCUMENTS, "array" FOR A JSON ARRAY
+    :return: GENERATOR OF Batch; A DOCUMENT TOO BIG FOR ANY BATCH IS YIELDED ALONE, WITH too_big=True
+    """
+    try:
+        prefix, separator, suffix = _formats[format]
+    except KeyError:
+        logger.error("Expecting format to be one of {formats}", formats=list(_formats.keys()))
+    if max_count is not None and max_count < 1:
+        logger.error("Expecting max_count to be at least 1")
+
+    # FOR NDJSON THE suffix IS PAID BY EVERY DOCUMENT; FOR ARRAY IT IS PAID ONCE
+    per_doc = len(separator) + (len(suffix) if format == NDJSON else 0)
+    per_batch = len(prefix) + (0 if format == NDJSON else len(suffix)) - len(separator)
+
+    pending = []
+    pending_size = per_batch
+    for value in values:
+        doc = value2json(value).encode("utf8")
+        doc_size = len(doc) + per_doc
+        if per_batch + doc_size > max_bytes:
+            yield Batch(_join([doc], format), 1, too_big=True)
+            continue
+        if pending and (pending_size + doc_size > max_bytes or len(pending) == max_count):
+            yield Batch(_join(pending, format), len(pending))
+            pending = []
+            pending_size = per_batch
+        pending.append(doc)
+        pending_size += doc_size
+
+    if pending:
+        yield Batch(_join(pending, format), len(pending))
+
+
+def _join(docs, format):
+    prefix, separator, suffix = _formats[format]
+    if format == NDJSON:
+        return suffix.join(docs) + suffix
+    return prefix + separator.join(docs) + suffix
@@ -0,0 +1,112 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# BINARY VALUES (bytes, bytearray, memoryview) IN JSON
+#
+# WITH BINARY_BASE64, OR BINARY_BASE85, BINARY IS EMITTED AS A TAGGED VALUE
+#
+#     {"$base64": "aGVsbG8="}
+#
+# WHICH json2value(..., binary=True) TURNS BACK INTO bytes
+#
+import base64
+import binascii
+from codecs import latin_1_decode, utf_8_decode
+
+from mo_imports import delay_import
+
+logger = delay_import("mo_logs.logger")
+
+BINARY_TEXT = "text"  # LATIN-1 TEXT (DOES NOT ROUND TRIP)
+BINARY_BASE64 = "base64"
+BINARY_BASE85 = "base85"
+
+BASE64_KEY = "$base64"
+BASE85_KEY = "$base85"
+
+binary_types = (bytes, bytearray, memoryview)
+
+
+def binary2text(value):
+    """
+    :return: value AS LATIN-1 TEXT, ONE CHARACTER PER BYTE
+    """
+    return latin_1_decode(_contiguous(value))[0]
+
+
+def binary2base64(value):
+    """
+    :return: TAGGED VALUE; THE BUFFER IS READ IN PLACE, NOT COPIED
+    """
+    return {BASE64_KEY: binascii.b2a_base64(_contiguous(value), newline=False).decode("ascii")}
+
+
+def binary2base85(value):
+    """
+    :return: TAGGED VALUE, SMALLER THAN BASE64, BUT SLOWER TO MAKE (memoryview IS COPIED BY base64.b85encode)
+    """
+    return {BASE85_KEY: base64.b85encode(_contiguous(value)).decode("ascii")}
+
+
+def binary_converter(binary_policy=BINARY_TEXT):
+    """
+    :param binary_policy: ONE OF BINARY_TEXT, BINARY_BASE64, BINARY_BASE85
+    :return: FUNCTION THAT CONVERTS ONE BINARY VALUE
+    """
+    try:
+        return _converters[binary_policy]
+    except KeyError:
+        logger.error(
+            "Expecting binary_policy to be one of {policies}, not {policy|quote}",
+            policies=list(_converters),
+            policy=binary_policy,
+        )
+
+
+def decode_binary(value):
+    """
+    object_hook FOR THE JSON DECODER: TURN TAGGED VALUES BACK INTO bytes
+    """
+    if len(value) == 1:
+        if BASE64_KEY in value:
+            return binascii.a2b_base64(value[BASE64_KEY])
+        elif BASE85_KEY in value:
+            return base64.b85decode(value[BASE85_KEY])
+    return value
+
+
+def utf8_buffer(value):
+    """
+    :return: BINARY value AS BYTES THAT CAN BE READ IN PLACE (ONLY STRIDED memoryview IS COPIED)
+    """
+    value = _contiguous(value)
+    if value.__class__ is memoryview and value.format != "B":
+        return value.cast("B")
+    return value
+
+
+def utf8_text(value):
+    """
+    :return: value AS str; UTF-8 BINARY IS DECODED STRAIGHT FROM THE BUFFER
+    """
+    if value.__class__ is str:
+        return value
+    elif value.__class__ in binary_types:
+        return utf_8_decode(value, "strict", True)[0]
+    return str(value)
+
+
+def _contiguous(value):
+    if value.__class__ is memoryview and not value.contiguous:
+        # ONLY STRIDED VIEWS ARE COPIED
+        return value.tobytes()
+    return value
+
+
+_converters = {BINARY_TEXT: binary2text, BINARY_BASE64: binary2base64, BINARY_BASE85: binary2base85}
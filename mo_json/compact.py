@@ -0,0 +1,113 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# SMALLER JSON FOR THE WIRE
+#
+#     json = value2json(records, compact=Compact(significant_digits=6, columns=True))
+#     records = from_columns(json2value(json))
+#
+from mo_dots import from_data, to_data
+from mo_imports import delay_import
+
+from mo_json.scrubber import Scrubber, _scrub_float
+
+logger = delay_import("mo_logs.logger")
+
+KEYS = "keys"
+ROWS = "rows"
+
+
+class Compact:
+    """
+    ENCODE PROFILE THAT TRADES FIDELITY FOR SIZE
+    """
+
+    __slots__ = ["drop_empty", "significant_digits", "columns"]
+
+    def __init__(self, drop_empty=True, significant_digits=None, columns=False):
+        """
+        :param drop_empty: True TO DROP PROPERTIES THAT ARE EMPTY OBJECTS OR EMPTY ARRAYS (NULLS ARE ALWAYS DROPPED)
+        :param significant_digits: ROUND FLOATS TO THIS MANY SIGNIFICANT DIGITS
+        :param columns: True TO EMIT A LIST OF RECORDS AS {"keys": [...], "rows": [[...], ...]}
+        """
+        self.drop_empty = drop_empty
+        self.significant_digits = significant_digits
+        self.columns = columns
+
+
+class CompactScrubber(Scrubber):
+    """
+    SCRUB AND COMPACT IN THE SAME PASS
+    """
+
+    def __init__(self, compact, **kwargs):
+        """
+        :param compact: Compact PROFILE
+        :param kwargs: PASSED TO Scrubber
+        """
+        Scrubber.__init__(self, **kwargs)
+        self.compact = compact
+        digits = compact.significant_digits
+        if digits:
+            # ONLY float IS ROUNDED; TIMES AND DURATIONS KEEP THEIR PRECISION
+            round_float = _float_rounder(digits)
+            self.scrubbers[float] = lambda value, is_done, stack: round_float(value)
+            self.fast_float = round_float
+
+    def scrub(self, value):
+        output = Scrubber.scrub(self, value)
+        if self.compact.columns and output.__class__ is list and all(r.__class__ is dict for r in output):
+            return to_columns(output)
+        return output
+
+    def _scrub_data(self, value, is_done, stack):
+        if not self.compact.drop_empty:
+            return Scrubber._scrub_data(self, value, is_done, stack)
+        if self.in_place and value.__class__ is dict:
+            return self._scrub_data_in_place(value, is_done, stack, drop_empty=True)
+        output = {}
+        for k, v in value.items():
+            if not isinstance(k, str):
+                logger.error("keys must be strings")
+            v = self._scrub(v, is_done, stack)
+            if v is None or (v.__class__ in (dict, list) and not v):
+                continue
+            output[k] = v
+        return output
+
+
+def _float_rounder(digits):
+    template = f"%.{digits}g"
+
+    def round_float(value):
+        return _scrub_float(float(template % value))
+
+    return round_float
+
+
+def to_columns(records):
+    """
+    :param records: LIST OF dict
+    :return: {"keys": [...], "rows": [[...], ...]} WITH KEYS IN FIRST-SEEN ORDER
+    """
+    keys = list(dict.fromkeys(k for r in records for k in r))
+    return {KEYS: keys, ROWS: [[r.get(k) for k in keys] for r in records]}
+
+
+def from_columns(value):
+    """
+    RESTORE THE LIST OF RECORDS FROM THE COLUMN FORM; ANY OTHER VALUE IS RETURNED AS-IS
+    :param value: DECODED JSON
+    :return: LIST OF RECORDS (null CELLS ARE NOT EMITTED)
+    """
+    raw = from_data(value)
+    if raw.__class__ is not dict or raw.keys() != {KEYS, ROWS}:
+        return value
+    keys = raw[KEYS]
+    return to_data([{k: v for k, v in zip(keys, row) if v is not None} for row in raw[ROWS]])
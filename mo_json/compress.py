@@ -0,0 +1,162 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# COMPRESS NDJSON WHILE IT IS BEING ENCODED
+#
+# GzipWriter CUTS THE OUTPUT INTO BLOCKS, AND COMPRESSES EACH BLOCK AS ITS OWN
+# GZIP MEMBER ON A THREAD POOL (zlib RELEASES THE GIL). CONCATENATED MEMBERS ARE
+# A STANDARD .gz FILE, READABLE BY ANY TOOL.
+#
+import os
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from mo_imports import delay_import
+
+value2json = delay_import("mo_json.value2json")
+logger = delay_import("mo_logs.logger")
+
+BLOCK_SIZE = 1024 * 1024  # UNCOMPRESSED BYTES PER GZIP MEMBER
+GZIP_WBITS = 16 + zlib.MAX_WBITS  # ASK zlib FOR THE GZIP HEADER AND TRAILER
+
+
+class _NdjsonWriter:
+    """
+    ENCODE VALUES AS NDJSON, AND WRITE THE BYTES TO THE FILE (SUBCLASSES COMPRESS THEM FIRST)
+    """
+
+    def __init__(self, file):
+        if isinstance(file, (str, os.PathLike)):
+            self.file = open(file, "wb")
+            self.close_file = True
+        else:
+            self.file = file
+            self.close_file = False
+
+    def write(self, value):
+        self.write_bytes(value2json(value).encode("utf8") + b"\n")
+
+    def extend(self, values):
+        for value in values:
+            self.write(value)
+
+    def write_bytes(self, data):
+        self.file.write(data)
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        if self.close_file:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class GzipWriter(_NdjsonWriter):
+    """
+    WRITE NDJSON AS A MULTI-MEMBER GZIP FILE, COMPRESSING BLOCKS IN PARALLEL
+    """
+
+    def __init__(self, file, level=6, block_size=BLOCK_SIZE, threads=None):
+        """
+        :param file: BINARY FILE-LIKE OBJECT, OR A PATH
+        :param level: zlib COMPRESSION LEVEL (1-9)
+        :param block_size: UNCOMPRESSED BYTES PER GZIP MEMBER
+        :param threads: NUMBER OF COMPRESSING THREADS (DEFAULT IS THE CPU COUNT)
+        """
+        _NdjsonWriter.__init__(self, file)
+        self.level = level
+        self.block_size = block_size
+        self.threads = threads or os.cpu_count() or 1
+        self.pool = ThreadPoolExecutor(max_workers=self.threads)
+        self.pending = deque()  # FUTURES, IN FILE ORDER
+        self.block = []
+        self.block_length = 0
+        self.members = 0
+
+    def write_bytes(self, data):
+        self.block.append(data)
+        self.block_length += len(data)
+        if self.block_length >= self.block_size:
+            self._submit()
+
+    def _submit(self):
+        if not self.block:
+            return
+        data = b"".join(self.block)
+        self.block = []
+        self.block_length = 0
+        self.pending.append(self.pool.submit(gzip_member, data, self.level))
+        self.members += 1
+        # LIMIT THE NUMBER OF BLOCKS IN MEMORY
+        while len(self.pending) > 2 * self.threads:
+            self.file.write(self.pending.popleft().result())
+
+    def flush(self):
+        self._submit()
+        while self.pending:
+            self.file.write(self.pending.popleft().result())
+        self.file.flush()
+
+    def close(self):
+        try:
+            if not self.members and not self.block:
+                # AN EMPTY FILE IS NOT VALID GZIP, SO WRITE ONE EMPTY MEMBER
+                self.file.write(gzip_member(b"", self.level))
+            self.flush()
+        finally:
+            self.pool.shutdown()
+            _NdjsonWriter.close(self)
+
+
+class ZstdWriter(_NdjsonWriter):
+    """
+    WRITE NDJSON AS A ZSTANDARD FILE (REQUIRES THE zstandard PACKAGE, WHICH COMPRESSES WITH ITS OWN THREADS)
+    """
+
+    def __init__(self, file, level=3, threads=None):
+        """
+        :param file: BINARY FILE-LIKE OBJECT, OR A PATH
+        :param level: zstd COMPRESSION LEVEL
+        :param threads: NUMBER OF COMPRESSING THREADS (DEFAULT IS THE CPU COUNT)
+        """
+        try:
+            import zstandard
+        except Exception as cause:
+            logger.error("`pip install zstandard` to enable this feature", cause=cause)
+        _NdjsonWriter.__init__(self, file)
+        compressor = zstandard.ZstdCompressor(level=level, threads=threads or os.cpu_count() or 1)
+        self.stream = compressor.stream_writer(self.file, closefd=False)
+
+    def write_bytes(self, data):
+        self.stream.write(data)
+
+    def flush(self):
+        self.stream.flush()
+        self.file.flush()
+
+    def close(self):
+        try:
+            self.stream.close()
+        finally:
+            _NdjsonWriter.close(self)
+
+
+def gzip_member(data, level=6):
+    """
+    RETURN data AS ONE COMPLETE GZIP MEMBER
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    return compressor.compress(data) + compressor.flush()
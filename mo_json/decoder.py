@@ -9,4 +9,266 @@
 #
 import json
 
-json_decoder = json.loads
+from mo_dots import split_field, to_data
+from mo_future import utcnow
+from mo_imports import delay_import
+from mo_logs import strings
+from mo_logs.exceptions import ERROR, Except, _parse_traceback
+
+from mo_json.backends import decode
+from mo_json.binary import decode_binary, utf8_text
+from mo_json.guard import LimitExceeded
+
+logger = delay_import("mo_logs.logger")
+
+
+def leaves_hook(pairs):
+    """
+    object_pairs_hook THAT EXPANDS DOT-DELIMITED KEYS INTO NESTED OBJECTS, AND DROPS NULLS, WHILE PARSING
+    SAME RESULT AS leaves_to_data(), BUT EACH OBJECT IS VISITED ONCE, WHEN IT IS MADE
+    """
+    output = {}
+    for key, value in pairs:
+        if "." in key:
+            path = split_field(key)
+            if not path:
+                if not output:
+                    output = value
+                continue
+            key = path.pop()
+        elif key:
+            path = None
+        else:
+            logger.error("key is empty string.  Probably a bad idea")
+
+        if output.__class__ is not dict:
+            output = {}
+        parent = output
+        if path:
+            for step in path:
+                child = parent.get(step)
+                if child.__class__ is not dict:
+                    child = parent[step] = {}
+                parent = child
+
+        if value is None:
+            parent.pop(key, None)
+        else:
+            parent[key] = value
+    return output
+
+
+def leaves_binary_hook(pairs):
+    output = leaves_hook(pairs)
+    if output.__class__ is dict:
+        return decode_binary(output)
+    return output
+
+
+class StringMemo:
+    """
+    BOUNDED MEMO THAT MAKES EQUAL KEYS, AND EQUAL SHORT STRING VALUES, THE SAME str OBJECT
+    SO MILLIONS OF DECODED RECORDS SHARE ONE COPY OF EACH PROPERTY NAME, STATUS CODE, COUNTRY, ...
+    SAFE TO SHARE BETWEEN THREADS; AT WORST, A STRING IS KEPT TWICE
+    """
+
+    __slots__ = ["max_size", "max_length", "memo", "decoders"]
+
+    def __init__(self, max_size=10_000, max_length=32):
+        """
+        :param max_size: FORGET EVERYTHING WHEN THIS MANY STRINGS ARE KEPT, SO UNIQUE VALUES (LIKE IDS) DO NOT GROW IT FOREVER
+        :param max_length: LONGER STRING VALUES ARE NOT KEPT (KEYS ALWAYS ARE)
+        """
+        self.max_size = max_size
+        self.max_length = max_length
+        self.memo = {}
+        self.decoders = {}
+
+    def hook(self, pairs):
+        """
+        object_pairs_hook THAT BUILDS THE dict FROM THE REMEMBERED STRINGS
+        STRINGS IN ARRAYS ARE REPLACED TOO, SO ONLY A TOP-LEVEL ARRAY OF STRINGS IS MISSED
+        """
+        memo = self.memo
+        if len(memo) > self.max_size:
+            memo.clear()
+        max_length = self.max_length
+        remember = memo.setdefault
+        output = {}
+        for key, value in pairs:
+            key = remember(key, key)
+            _class = value.__class__
+            if _class is str:
+                if len(value) <= max_length:
+                    value = remember(value, value)
+            elif _class is list:
+                for i, v in enumerate(value):
+                    if v.__class__ is str and len(v) <= max_length:
+                        value[i] = remember(v, v)
+            output[key] = value
+        return output
+
+    def hook_for(self, leaves=False, binary=False):
+        """
+        :return: object_pairs_hook THAT REMEMBERS STRINGS, AND THEN DOES WHAT leaves AND binary ASK FOR
+        """
+        hook = self.hook
+        if leaves:
+            after = leaves_binary_hook if binary else leaves_hook
+            return lambda pairs: after(hook(pairs).items())
+        elif binary:
+            return lambda pairs: decode_binary(hook(pairs))
+        return hook
+
+    def decoder(self, leaves=False, binary=False):
+        """
+        :return: FUNCTION FROM JSON str TO VALUE, WITH THE REMEMBERED STRINGS
+        """
+        key = leaves, binary
+        output = self.decoders.get(key)
+        if output is None:
+            output = self.decoders[key] = json.JSONDecoder(object_pairs_hook=self.hook_for(leaves, binary)).decode
+        return output
+
+
+class JsonDecodeError(Except):
+    """
+    RAISED BY json2value() FOR BAD JSON
+    CHEAP TO MAKE, SO A FLOOD OF BAD MESSAGES DOES NOT COST MUCH: THE LINE, COLUMN, SAMPLE, HEX DUMP AND CAUSE
+    ARE ONLY WORKED OUT WHEN THEY ARE READ (LIKE WHEN THE ERROR IS LOGGED)
+    """
+
+    def __init__(self, json, problem, trace=None):
+        """
+        :param json: THE JSON THAT FAILED (str OR UTF-8 BINARY)
+        :param problem: THE EXCEPTION FROM THE DECODER
+        :param trace: STACK TRACE (None FOR NONE)
+        """
+        Exception.__init__(self)
+        self.severity = ERROR
+        self.timestamp = utcnow()
+        if json.__class__ is memoryview:
+            # THE CALLER MAY RELEASE THE VIEW BEFORE THE MESSAGE IS MADE; ONLY BAD JSON PAYS FOR THE COPY
+            json = json.tobytes()
+        self.json = json
+        self.problem = problem
+        self.trace = trace or []
+
+    @property
+    def offset(self):
+        """
+        :return: CHARACTER (OR, FOR NOT-UTF-8, BYTE) OFFSET OF THE PROBLEM, None IF NOT KNOWN
+        """
+        problem = self.problem
+        if isinstance(problem, UnicodeDecodeError):
+            return problem.start
+        return getattr(problem, "pos", None)
+
+    def __getattr__(self, name):
+        # ONLY CALLED FOR WHAT IS NOT MADE YET
+        if name == "cause":
+            value = _wrap_problem(self.problem)
+        elif name in ("template", "params", "line", "column"):
+            self._describe()
+            return self.__dict__[name]
+        else:
+            raise AttributeError(name)
+        self.__dict__[name] = value
+        return value
+
+    def _describe(self):
+        json, problem, offset = self.json, self.problem, self.offset
+        line = column = None
+        if isinstance(problem, UnicodeDecodeError):
+            line, column = _byte_location(json, offset)
+            template = CAN_NOT_DECODE_JSON + ": not UTF-8 at line {{line}}, column {{column}}"
+            params = {"line": line, "column": column}
+        elif isinstance(problem, LimitExceeded):
+            # THE DOCUMENT WAS NOT DECODED, SO THERE IS NO POSITION TO SHOW
+            template, params = CAN_NOT_DECODE_JSON + ": {{reason}}", {"reason": str(problem)}
+        else:
+            text = utf8_text(json)
+            if not text.strip():
+                template, params = "JSON string is only whitespace", {}
+            elif offset is not None:
+                line, column = _text_location(text, offset)
+                sample, pointer = _sample(text, offset)
+                template = CAN_NOT_DECODE_JSON + " at line {{line}}, column {{column}}:\n\t{{sample}}\n\t{{pointer}}\n"
+                params = {"line": line, "column": column, "sample": sample, "pointer": pointer}
+            else:
+                base_str = strings.limit(text, 1000).encode("utf8")
+                char_str = " " + "  ".join((chr(c) if c >= 32 else ".") for c in base_str)
+                template = CAN_NOT_DECODE_JSON + ":\n{{char_str}}\n{{hexx_str}}\n"
+                params = {"char_str": char_str, "hexx_str": bytes2hex(base_str, " ")}
+        self.__dict__.update(template=template, params=to_data(params), line=line, column=column)
+
+
+CAN_NOT_DECODE_JSON = "Can not decode JSON"
+
+
+def _wrap_problem(problem):
+    """
+    SAME AS Except.wrap(), BUT THE TRACE IS ONLY WHERE THE problem WAS RAISED, NOT WHERE IT IS SHOWN
+    """
+    if problem is None or isinstance(problem, Except):
+        return problem
+    tb = problem.__traceback__
+    message = getattr(problem, "message", None) or problem
+    return Except(
+        severity=ERROR,
+        template=f"{problem.__class__.__name__}: {message}",
+        trace=_parse_traceback(tb) if tb is not None else [],
+        cause=_wrap_problem(problem.__cause__),
+    )
+
+
+def _text_location(text, offset):
+    """
+    :return: (LINE, COLUMN) OF THE CHARACTER AT offset, BOTH COUNTING FROM 1, WITHOUT SPLITTING THE TEXT
+    """
+    line_start = text.rfind("\n", 0, offset) + 1
+    return text.count("\n", 0, line_start) + 1, offset - line_start + 1
+
+
+def _sample(text, offset):
+    """
+    :return: (SAMPLE, POINTER) SHOWING THE CHARACTER AT offset, IN ITS LINE
+    """
+    line_start = text.rfind("\n", 0, offset) + 1
+    line_end = text.find("\n", offset, offset + 64)
+    if line_end == -1:
+        line_end = offset + 64
+    line = text[line_start:line_end].replace("\t", " ")
+    column = offset - line_start
+    if column > 20:
+        sample = "..." + line[column - 20 :]
+        pointer = "   " + (" " * 20) + "^"
+    else:
+        sample = line
+        pointer = (" " * column) + "^"
+    if len(sample) > 43:
+        sample = sample[:43] + "..."
+    return sample, pointer
+
+
+def _byte_location(json_bytes, offset):
+    """
+    :return: (LINE, COLUMN) OF THE CHARACTER AT BYTE offset, BOTH COUNTING FROM 1
+    """
+    if json_bytes.__class__ is memoryview:
+        json_bytes = json_bytes.tobytes()  # ONLY WHEN REPORTING AN ERROR
+    line_start = json_bytes.rfind(b"\n", 0, offset) + 1
+    line = json_bytes.count(b"\n", 0, line_start) + 1
+    column = len(json_bytes[line_start:offset].decode("utf8", "replace")) + 1
+    return line, column
+
+
+def bytes2hex(value, separator=" "):
+    return separator.join(f"{x:02X}" for x in value)
+
+
+json_decoder = decode
+binary_decoder = json.JSONDecoder(object_hook=decode_binary).decode
+leaves_decoder = json.JSONDecoder(object_pairs_hook=leaves_hook).decode
+leaves_binary_decoder = json.JSONDecoder(object_pairs_hook=leaves_binary_hook).decode
+shared_memo = StringMemo()  # USED BY json2value(..., intern=True)
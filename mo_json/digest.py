@@ -0,0 +1,209 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import hashlib
+
+from mo_dots import Data, DataObject, from_data, null_types, utils
+from mo_imports import delay_import
+
+from mo_json.scrubber import Scrubber, _keep_whitespace
+from mo_json.utils import quote
+
+logger = delay_import("mo_logs.logger")
+
+DEFAULT_ALGORITHM = "sha256"
+FLUSH_SIZE = 64 * 1024  # CHARACTERS TO COLLECT BEFORE FEEDING THE HASH
+
+
+def json_hash(value, algorithm=DEFAULT_ALGORITHM):
+    """
+    HASH THE CANONICAL JSON (SORTED KEYS, NO WHITESPACE) OF value WITHOUT BUILDING THE WHOLE STRING
+    THE RESULT IS THE SAME AS HASHING value2json(value).encode("utf8")
+    :param value: THE VALUE TO HASH
+    :param algorithm: ANY NAME ACCEPTED BY hashlib.new()
+    :return: HEX DIGEST
+    """
+    return _default_digester.digest(value, hashlib.new(algorithm)).hexdigest()
+
+
+def distinct_json(values, algorithm=DEFAULT_ALGORITHM):
+    """
+    YIELD EACH DISTINCT VALUE ONCE, COMPARING THE CANONICAL JSON OF EACH
+    ONLY THE DIGESTS ARE KEPT IN MEMORY
+    :param values: ITERABLE OF VALUES
+    :param algorithm: ANY NAME ACCEPTED BY hashlib.new()
+    :return: GENERATOR OF VALUES, IN ORIGINAL ORDER
+    """
+    seen = set()
+    digester = _default_digester
+    for value in values:
+        key = digester.digest(value, hashlib.new(algorithm)).digest()
+        if key in seen:
+            continue
+        seen.add(key)
+        yield value
+
+
+class Digester:
+    """
+    WALK A STRUCTURE USING THE Scrubber TYPE RULES, FEEDING CANONICAL JSON INTO A HASH
+    """
+
+    def __init__(self, scrub_text=_keep_whitespace):
+        self.scrubber = Scrubber(scrub_text=scrub_text)
+        self.scrub_text = scrub_text
+        # EACH WRITER APPENDS TO acc, OR RETURNS False IF THE VALUE SCRUBS TO NOTHING
+        self.writers = {
+            **{t: _write_null for t in null_types},
+            str: self._write_text,
+            bool: _write_bool,
+            **{t: self._write_many for t in utils._many_types},
+            **{t: self._write_data for t in utils._data_types},
+            Data: self._write_wrapped,
+            DataObject: self._write_wrapped,
+        }
+
+    def digest(self, value, hasher):
+        acc = _Accumulator(hasher)
+        if not self._write(value, acc):
+            acc.append("null")
+        acc.flush()
+        return hasher
+
+    def _write(self, value, acc):
+        type_ = value.__class__
+        writer = self.writers.get(type_)
+        if writer is None:
+            if type_ in self.scrubber.scrubbers:
+                # COPY, NEVER CHANGE, THE dict OTHER THREADS ARE READING
+                writer = self._scrubbed_writer(type_)
+                self.writers = {**self.writers, type_: writer}
+            else:
+                writer = self._write_slow
+        return writer(value, acc)
+
+    def _scrubbed_writer(self, type_):
+        scrub = self.scrubber.scrubbers[type_]
+
+        def writer(value, acc):
+            return _write_primitive(scrub(value, None, []), acc)
+
+        return writer
+
+    def _write_text(self, value, acc):
+        value = self.scrub_text(value)
+        if value is None:
+            return False
+        acc.append(quote(value))
+        return True
+
+    def _write_wrapped(self, value, acc):
+        return self._write(from_data(value), acc)
+
+    def _write_slow(self, value, acc):
+        # __json__, __data__, AND OTHER EXOTIC TYPES ARE HASHED AFTER A REAL SCRUB
+        return self._write(self.scrubber.scrub(value), acc)
+
+    def _write_many(self, value, acc):
+        sep = "["
+        for v in value:
+            acc.mark()
+            acc.append(sep)
+            sep = ","
+            if not self._write(v, acc):
+                acc.append("null")
+        if sep == "[":
+            acc.append("[")
+        acc.append("]")
+        return True
+
+    def _write_data(self, value, acc):
+        for k in value.keys():
+            if not isinstance(k, str):
+                logger.error("keys must be strings")
+        sep = "{"
+        for k in sorted(value.keys()):
+            mark = acc.mark()
+            acc.append(sep)
+            acc.append(quote(k))
+            acc.append(":")
+            if self._write(value[k], acc):
+                sep = ","
+            else:
+                # MISSING VALUES ARE NOT EMITTED
+                acc.rollback(mark)
+        if sep == "{":
+            acc.append("{")
+        acc.append("}")
+        return True
+
+
+class _Accumulator:
+    """
+    COLLECT SMALL STRINGS, FEED THEM TO THE HASH IN BIG BLOCKS
+    """
+
+    __slots__ = ["hasher", "acc", "size"]
+
+    def __init__(self, hasher):
+        self.hasher = hasher
+        self.acc = []
+        self.size = 0
+
+    def append(self, text):
+        self.acc.append(text)
+        self.size += len(text)
+
+    def mark(self):
+        # A SAFE PLACE TO FLUSH: NOTHING BEFORE THIS WILL BE ROLLED BACK
+        if self.size > FLUSH_SIZE:
+            self.flush()
+        return len(self.acc), self.size
+
+    def rollback(self, mark):
+        length, self.size = mark
+        del self.acc[length:]
+
+    def flush(self):
+        self.hasher.update("".join(self.acc).encode("utf8", "surrogatepass"))
+        self.acc = []
+        self.size = 0
+
+
+def _write_null(value, acc):
+    return False
+
+
+def _write_bool(value, acc):
+    acc.append("true" if value else "false")
+    return True
+
+
+def _write_primitive(value, acc):
+    """
+    WRITE AN ALREADY-SCRUBBED PRIMITIVE
+    """
+    if value is None:
+        return False
+    elif value is True:
+        acc.append("true")
+    elif value is False:
+        acc.append("false")
+    elif value.__class__ is float:
+        acc.append(float.__repr__(value))
+    elif value.__class__ is int:
+        acc.append(int.__repr__(value))
+    elif value.__class__ is str:
+        acc.append(quote(value))
+    else:
+        acc.append(str(value))
+    return True
+
+
+_default_digester = Digester()
@@ -8,7 +8,7 @@
 # Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
 #
 import json
-import time
+import threading
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 from math import floor
@@ -22,7 +22,6 @@ from mo_future import (
     long,
     sort_using_key,
     text,
-    utf8_json_encoder,
     xrange,
     StringIO,
 )
@@ -31,7 +30,12 @@ from mo_times import Timer
 from mo_times.dates import Date
 from mo_times.durations import Duration
 
-from mo_json.scrubber import Scrubber
+from mo_json import backends
+from mo_json.binary import binary2text, binary_types
+from mo_json.scrubber import shared_scrubber
+from mo_json.temporal import datetime2unix
+from mo_json.tracer import PRETTY_FALLBACK, traced
+from mo_json.truncate import truncated_json
 from mo_json.utils import float2json, quote
 
 json_decoder = json.JSONDecoder().decode
@@ -73,14 +77,14 @@ class UnicodeBuilder:
 
 append = UnicodeBuilder.append
 
-_dealing_with_problem = False
+# PER THREAD, SO CONCURRENT CALLS DO NOT SEE EACH OTHER'S PROBLEMS
+_problem = threading.local()
 
 
 def pypy_json_encode(value, pretty=False):
     """
     pypy DOES NOT OPTIMIZE GENERATOR CODE WELL
     """
-    global _dealing_with_problem
     if pretty:
         return pretty_json(value)
 
@@ -93,24 +97,24 @@ def pypy_json_encode(value, pretty=False):
         # THE PRETTY JSON WILL PROVIDE MORE DETAIL ABOUT THE SERIALIZATION CONCERNS
         from mo_logs import Log
 
-        if _dealing_with_problem:
+        if getattr(_problem, "dealing", False):
             Log.error("Serialization of JSON problems", e)
         else:
             Log.warning("Serialization of JSON problems", e)
-        _dealing_with_problem = True
+        _problem.dealing = True
         try:
-            return pretty_json(value)
+            return traced(PRETTY_FALLBACK, value.__class__, pretty_json, value)
         except Exception as f:
             Log.error("problem serializing object", f)
         finally:
-            _dealing_with_problem = False
+            _problem.dealing = False
 
 
 class cPythonJSONEncoder:
     def __init__(self, sort_keys=True):
         object.__init__(self)
 
-        self.encoder = utf8_json_encoder
+        self.encoder = backends.encode
 
     def encode(self, value, pretty=False):
         if pretty:
@@ -145,8 +149,9 @@ def _value2json(value, _buffer):
             return
 
         type = value.__class__
-        if type is binary_type:
-            append(_buffer, quote(value.decode("utf8")))
+        if type in binary_types:
+            # SAME AS THE Scrubber DEFAULT
+            append(_buffer, quote(binary2text(value)))
         elif type is text:
             append(_buffer, quote(value))
         elif type is dict:
@@ -165,12 +170,8 @@ def _value2json(value, _buffer):
             append(_buffer, float2json(value))
         elif type in (set, list, tuple, FlatList):
             _list2json(value, _buffer)
-        elif type is date:
-            append(_buffer, float2json(time.mktime(value.timetuple())))
-        elif type is datetime:
-            append(_buffer, float2json(time.mktime(value.timetuple())))
-        elif type is Date:
-            append(_buffer, float2json(value.unix))
+        elif type in (date, datetime, Date):
+            append(_buffer, float2json(datetime2unix(value)))
         elif type is timedelta:
             append(_buffer, float2json(value.total_seconds()))
         elif type is Duration:
@@ -252,8 +253,14 @@ ARRAY_MIN_ITEMS = 20  # DO NOT ATTEMPT ARRAY FORMATTING IF TOO FEW ITEMS
 INDENT = "    "
 
 
-def pretty_json(value):
-    scrub = Scrubber().scrub
+def pretty_json(value, budget=None):
+    """
+    :param value: THE VALUE TO TURN INTO JSON
+    :param budget: OPTIONAL Budget TO LIMIT THE WORK DONE ON HUGE VALUES
+    """
+    if budget:
+        value = json_decoder(truncated_json(value, budget))
+    scrub = shared_scrubber().scrub
     return _pretty_json(value, scrub)
 
 
@@ -450,18 +457,6 @@ def value_compare(a, b):
         return 0
 
 
-def datetime2milli(d, type):
-    try:
-        if type == datetime:
-            diff = d - datetime(1970, 1, 1)
-        else:
-            diff = d - date(1970, 1, 1)
-
-        return long(diff.total_seconds()) * long(1000) + long(diff.microseconds / 1000)
-    except Exception as e:
-        problem_serializing(d, e)
-
-
 def unicode_key(key):
     """
     CONVERT PROPERTY VALUE TO QUOTED NAME OF SAME
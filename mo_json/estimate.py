@@ -0,0 +1,160 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from mo_dots import Data, DataObject, from_data, null_types, utils
+from mo_imports import delay_import
+
+from mo_json.scrubber import Scrubber, _keep_whitespace, trim_whitespace
+from mo_json.utils import ESCAPE, ESCAPE_DCT
+
+NULL_SIZE = len("null")
+TRUE_SIZE = len("true")
+FALSE_SIZE = len("false")
+QUOTES_SIZE = len('""')
+BRACKETS_SIZE = len("[]")
+
+logger = delay_import("mo_logs.logger")
+
+# EXTRA BYTES ADDED BY ESCAPING EACH CHARACTER
+_escape_overhead = {c: len(e) - 1 for c, e in ESCAPE_DCT.items()}
+
+
+def estimate_json_size(value, keep_whitespace=True):
+    """
+    RETURN THE NUMBER OF UTF-8 BYTES value2json(value) WILL EMIT, WITHOUT ENCODING
+    :param value: THE VALUE TO MEASURE
+    :param keep_whitespace: False TO strip() THE WHITESPACE IN THE VALUES (SAME AS value2json)
+    :return: BYTE COUNT
+    """
+    if keep_whitespace:
+        estimator = _default_estimator
+    else:
+        estimator = SizeEstimator(scrub_text=trim_whitespace)
+    return estimator.size(value)
+
+
+def text_size(value):
+    """
+    RETURN THE UTF-8 BYTE COUNT OF THE QUOTED JSON STRING, WITHOUT ESCAPING IT
+    """
+    if value.isascii():
+        size = len(value) + QUOTES_SIZE
+    else:
+        size = len(value.encode("utf8", "surrogatepass")) + QUOTES_SIZE
+    if ESCAPE.search(value) is None:
+        return size
+    return size + sum(_escape_overhead[c] for c in ESCAPE.findall(value))
+
+
+class SizeEstimator:
+    """
+    WALK A STRUCTURE USING THE Scrubber TYPE RULES, COUNTING BYTES INSTEAD OF BUILDING JSON
+    """
+
+    def __init__(self, scrub_text=_keep_whitespace, scrubber=None):
+        self.scrubber = scrubber or Scrubber(scrub_text=scrub_text)
+        self.scrub_text = scrub_text
+        # EACH SIZER RETURNS A BYTE COUNT, OR None IF THE VALUE SCRUBS TO NOTHING
+        self.sizers = {
+            **{t: _null_size for t in null_types},
+            str: self._text_size,
+            bool: _bool_size,
+            **{t: self._many_size for t in utils._many_types},
+            **{t: self._data_size for t in utils._data_types},
+            Data: self._wrapped_size,
+            DataObject: self._wrapped_size,
+        }
+
+    def size(self, value):
+        size = self._size(value)
+        if size is None:
+            return NULL_SIZE
+        return size
+
+    def _size(self, value):
+        type_ = value.__class__
+        sizer = self.sizers.get(type_)
+        if sizer is None:
+            # CACHE THE DECISION FOR THIS TYPE (COPY, NEVER CHANGE, THE dict OTHER THREADS ARE READING)
+            if type_ in self.scrubber.scrubbers:
+                sizer = self._scrubbed_sizer(type_)
+                self.sizers = {**self.sizers, type_: sizer}
+            else:
+                sizer = self._slow_size
+        return sizer(value)
+
+    def _scrubbed_sizer(self, type_):
+        scrub = self.scrubber.scrubbers[type_]
+
+        def sizer(value):
+            return _primitive_size(scrub(value, None, []))
+
+        return sizer
+
+    def _text_size(self, value):
+        value = self.scrub_text(value)
+        if value is None:
+            return None
+        return text_size(value)
+
+    def _wrapped_size(self, value):
+        return self._size(from_data(value))
+
+    def _slow_size(self, value):
+        # __json__, __data__, AND OTHER EXOTIC TYPES ARE MEASURED AFTER A REAL SCRUB
+        return self._size(self.scrubber.scrub(value))
+
+    def _many_size(self, value):
+        size = BRACKETS_SIZE - 1
+        for v in value:
+            v_size = self._size(v)
+            size += 1 + (NULL_SIZE if v_size is None else v_size)
+        return max(size, BRACKETS_SIZE)
+
+    def _data_size(self, value):
+        size = BRACKETS_SIZE - 1
+        for k, v in value.items():
+            if not isinstance(k, str):
+                logger.error("keys must be strings")
+            v_size = self._size(v)
+            if v_size is None:
+                continue
+            # COMMA (OR OPEN BRACE), QUOTED KEY, COLON, VALUE
+            size += 1 + text_size(k) + 1 + v_size
+        return max(size, BRACKETS_SIZE)
+
+
+def _null_size(value):
+    return None
+
+
+def _bool_size(value):
+    return TRUE_SIZE if value else FALSE_SIZE
+
+
+def _primitive_size(value):
+    """
+    SIZE OF AN ALREADY-SCRUBBED PRIMITIVE
+    """
+    if value is None:
+        return None
+    elif value is True:
+        return TRUE_SIZE
+    elif value is False:
+        return FALSE_SIZE
+    elif value.__class__ is float:
+        return len(float.__repr__(value))
+    elif value.__class__ is int:
+        return len(int.__repr__(value))
+    elif value.__class__ is str:
+        return text_size(value)
+    return len(str(value))
+
+
+_default_estimator = SizeEstimator()
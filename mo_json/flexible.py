@@ -0,0 +1,70 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# json2value(..., flexible=True) WITHOUT hjson, WHEN POSSIBLE
+#
+# MOST FLEXIBLE JSON IS PLAIN JSON WITH // # /* */ COMMENTS AND TRAILING
+# COMMAS.  THOSE ARE REMOVED WITH A REGEX (STRINGS ARE MATCHED WHOLE, SO
+# THEY ARE KEPT AS THEY ARE), AND THE RESULT GOES TO THE C DECODER.  ONLY
+# TEXT THAT IS STILL NOT JSON (UNQUOTED KEYS AND VALUES, ''' STRINGS, ...)
+# IS SENT TO THE MUCH SLOWER hjson
+#
+import re
+
+from mo_imports import delay_import
+
+hjson2value = delay_import("hjson.loads")
+
+# AN UNTERMINATED STRING RUNS TO THE END OF THE LINE, SO NO QUOTE IS SCANNED TWICE
+_string = r'"[^"\\\n]*(?:\\.[^"\\\n]*)*"?'
+# EACH MATCH KEEPS (IN GROUP 1) A RUN OF TEXT AND WHOLE STRINGS, THEN REMOVES ONE COMMENT
+_comments = re.compile(r'([^"/#]*(?:(?:' + _string + r'|/(?![/*]))[^"/#]*)*)(?://[^\n]*|#[^\n]*|/\*[\s\S]*?(?:\*/|\Z))?').sub
+_line_comments = re.compile(r'([^"/#]*(?:(?:' + _string + r'|/(?!/))[^"/#]*)*)(?:(?://|#)[^\n]*)?').sub
+# EACH MATCH KEEPS A RUN OF TEXT AND WHOLE STRINGS, THEN REMOVES ONE COMMA THAT IS BEFORE A CLOSING BRACKET
+_trailing_commas = re.compile(r'([^",]*(?:(?:' + _string + r'|,(?!\s*[\]}]))[^",]*)*),?').sub
+_has_trailing_comma = re.compile(r",\s*[\]}]").search
+
+
+def strip_comments(text):
+    """
+    :param text: JSON, WITH COMMENTS AND TRAILING COMMAS
+    :return: THE SAME, WITHOUT THE COMMENTS AND TRAILING COMMAS
+    """
+    if "/" in text or "#" in text:
+        text = _comments(r"\1", text)
+    if _has_trailing_comma(text):
+        text = _trailing_commas(r"\1", text)
+    return text
+
+
+def remove_line_comment(line):
+    """
+    :return: THE line WITHOUT ITS # OR // COMMENT
+    """
+    return _line_comments(r"\1", line)
+
+
+def flexible_decode(text, decoder, **kwargs):
+    """
+    :param text: FLEXIBLE JSON
+    :param decoder: THE (FAST) FUNCTION FOR PLAIN JSON
+    :param kwargs: FOR hjson.loads(), IF IT IS NEEDED
+    :return: THE DECODED VALUE
+    """
+    try:
+        return decoder(text)
+    except Exception:
+        pass
+    stripped = strip_comments(text)
+    if stripped != text:
+        try:
+            return decoder(stripped)
+        except Exception:
+            pass
+    return hjson2value(text, **kwargs)
@@ -0,0 +1,443 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# MessagePack AND CBOR, IN PURE PYTHON
+#
+# VALUES ARE FIRST CLEANED BY THE Scrubber, SO Data, FlatList, Date, Duration,
+# Decimal AND __data__ OBJECTS BECOME THE SAME PRIMITIVES value2json() EMITS.
+# BINARY (bytes, bytearray, memoryview) IS KEPT, AND WRITTEN AS NATIVE BINARY.
+#
+from struct import Struct, error as StructError
+
+from mo_dots import to_data
+from mo_imports import delay_import
+
+from mo_json.binary import _contiguous, binary_types
+from mo_json.scrubber import Scrubber, _keep_whitespace, trim_whitespace
+from mo_json.temporal import UNIX
+
+logger = delay_import("mo_logs.logger")
+
+_u8 = Struct(">B")
+_u16 = Struct(">H")
+_u32 = Struct(">I")
+_u64 = Struct(">Q")
+_i8 = Struct(">b")
+_i16 = Struct(">h")
+_i32 = Struct(">i")
+_i64 = Struct(">q")
+_f16 = Struct(">e")
+_f32 = Struct(">f")
+_f64 = Struct(">d")
+
+
+def value2msgpack(value, keep_whitespace=True, time_format=UNIX):
+    """
+    :param value: THE VALUE TO ENCODE
+    :param keep_whitespace: False TO strip() THE WHITESPACE IN THE VALUES
+    :param time_format: HOW TIMES ARE EMITTED: UNIX (SECONDS), MILLI OR ISO
+    :return: MessagePack bytes
+    """
+    out = bytearray()
+    _msgpack_write(_scrubber(keep_whitespace, time_format).scrub(value), out)
+    return bytes(out)
+
+
+def msgpack2value(data):
+    """
+    :param data: MessagePack bytes (OR ANY BYTES-LIKE OBJECT)
+    :return: Python value
+    """
+    view = memoryview(data)
+    try:
+        value, end = _msgpack_read(view, 0)
+    except (IndexError, StructError) as cause:
+        logger.error("MessagePack is truncated", cause=cause)
+    if end != len(view):
+        logger.error("Expecting end of MessagePack at {end}", end=end)
+    return to_data(value)
+
+
+def value2cbor(value, keep_whitespace=True, time_format=UNIX):
+    """
+    :param value: THE VALUE TO ENCODE
+    :param keep_whitespace: False TO strip() THE WHITESPACE IN THE VALUES
+    :param time_format: HOW TIMES ARE EMITTED: UNIX (SECONDS), MILLI OR ISO
+    :return: CBOR bytes (RFC 8949)
+    """
+    out = bytearray()
+    _cbor_write(_scrubber(keep_whitespace, time_format).scrub(value), out)
+    return bytes(out)
+
+
+def cbor2value(data):
+    """
+    :param data: CBOR bytes (OR ANY BYTES-LIKE OBJECT)
+    :return: Python value
+    """
+    view = memoryview(data)
+    try:
+        value, end = _cbor_read(view, 0)
+    except (IndexError, StructError) as cause:
+        logger.error("CBOR is truncated", cause=cause)
+    if end != len(view):
+        logger.error("Expecting end of CBOR at {end}", end=end)
+    return to_data(value)
+
+
+def _scrubber(keep_whitespace, time_format):
+    if keep_whitespace and time_format == UNIX:
+        return _default_scrubber
+    return _binary_scrubber(keep_whitespace, time_format)
+
+
+def _binary_scrubber(keep_whitespace, time_format):
+    scrubber = Scrubber(scrub_text=_keep_whitespace if keep_whitespace else trim_whitespace, time_format=time_format)
+    for t in binary_types:
+        scrubber.scrubbers[t] = lambda value, is_done, stack: value
+    return scrubber
+
+
+def _msgpack_write(value, out):
+    _class = value.__class__
+    if _class is str:
+        data = value.encode("utf8")
+        size = len(data)
+        if size < 32:
+            out.append(0xA0 | size)
+        elif size < 0x100:
+            out += b"\xd9" + _u8.pack(size)
+        elif size < 0x10000:
+            out += b"\xda" + _u16.pack(size)
+        else:
+            out += b"\xdb" + _u32.pack(size)
+        out += data
+    elif _class is int:
+        if 0 <= value < 0x80:
+            out.append(value)
+        elif -32 <= value < 0:
+            out.append(value & 0xFF)
+        elif value > 0:
+            if value < 0x100:
+                out += b"\xcc" + _u8.pack(value)
+            elif value < 0x10000:
+                out += b"\xcd" + _u16.pack(value)
+            elif value < 0x100000000:
+                out += b"\xce" + _u32.pack(value)
+            elif value < 0x10000000000000000:
+                out += b"\xcf" + _u64.pack(value)
+            else:
+                logger.error("MessagePack can not hold {value}", value=value)
+        elif value >= -0x80:
+            out += b"\xd0" + _i8.pack(value)
+        elif value >= -0x8000:
+            out += b"\xd1" + _i16.pack(value)
+        elif value >= -0x80000000:
+            out += b"\xd2" + _i32.pack(value)
+        elif value >= -0x8000000000000000:
+            out += b"\xd3" + _i64.pack(value)
+        else:
+            logger.error("MessagePack can not hold {value}", value=value)
+    elif _class is float:
+        out += b"\xcb" + _f64.pack(value)
+    elif _class is dict:
+        size = len(value)
+        if size < 16:
+            out.append(0x80 | size)
+        elif size < 0x10000:
+            out += b"\xde" + _u16.pack(size)
+        else:
+            out += b"\xdf" + _u32.pack(size)
+        for k, v in value.items():
+            _msgpack_write(k, out)
+            _msgpack_write(v, out)
+    elif _class is list:
+        size = len(value)
+        if size < 16:
+            out.append(0x90 | size)
+        elif size < 0x10000:
+            out += b"\xdc" + _u16.pack(size)
+        else:
+            out += b"\xdd" + _u32.pack(size)
+        for v in value:
+            _msgpack_write(v, out)
+    elif value is None:
+        out.append(0xC0)
+    elif value is True:
+        out.append(0xC3)
+    elif value is False:
+        out.append(0xC2)
+    elif _class in binary_types:
+        value = _contiguous(value)
+        size = value.nbytes if value.__class__ is memoryview else len(value)
+        if size < 0x100:
+            out += b"\xc4" + _u8.pack(size)
+        elif size < 0x10000:
+            out += b"\xc5" + _u16.pack(size)
+        else:
+            out += b"\xc6" + _u32.pack(size)
+        out += value
+    else:
+        logger.error("Can not pack {type}", type=_class.__name__)
+
+
+def _msgpack_read(data, i):
+    code = data[i]
+    i += 1
+    if code < 0x80:
+        return code, i
+    elif code >= 0xE0:
+        return code - 0x100, i
+    elif code < 0x90:
+        return _msgpack_map(data, i, code & 0x0F)
+    elif code < 0xA0:
+        return _msgpack_array(data, i, code & 0x0F)
+    elif code < 0xC0:
+        return _text(data, i, code & 0x1F)
+
+    reader = _msgpack_readers.get(code)
+    if reader is None:
+        logger.error("MessagePack type 0x{code} is not supported", code=format(code, "02x"))
+    return reader(data, i)
+
+
+def _msgpack_map(data, i, size):
+    output = {}
+    for _ in range(size):
+        k, i = _msgpack_read(data, i)
+        output[k], i = _msgpack_read(data, i)
+    return output, i
+
+
+def _msgpack_array(data, i, size):
+    output = []
+    for _ in range(size):
+        v, i = _msgpack_read(data, i)
+        output.append(v)
+    return output, i
+
+
+def _number(struct):
+    size = struct.size
+
+    def read(data, i):
+        return struct.unpack_from(data, i)[0], i + size
+
+    return read
+
+
+def _sized(struct, make):
+    size = struct.size
+
+    def read(data, i):
+        length = struct.unpack_from(data, i)[0]
+        i += size
+        return make(data, i, length)
+
+    return read
+
+
+def _text(data, i, length):
+    end = i + length
+    if end > len(data):
+        raise IndexError("text is truncated")
+    return str(data[i:end], "utf8"), end
+
+
+def _bytes(data, i, length):
+    end = i + length
+    if end > len(data):
+        raise IndexError("binary is truncated")
+    return data[i:end].tobytes(), end
+
+
+_msgpack_readers = {
+    0xC0: lambda data, i: (None, i),
+    0xC2: lambda data, i: (False, i),
+    0xC3: lambda data, i: (True, i),
+    0xC4: _sized(_u8, _bytes),
+    0xC5: _sized(_u16, _bytes),
+    0xC6: _sized(_u32, _bytes),
+    0xCA: _number(_f32),
+    0xCB: _number(_f64),
+    0xCC: _number(_u8),
+    0xCD: _number(_u16),
+    0xCE: _number(_u32),
+    0xCF: _number(_u64),
+    0xD0: _number(_i8),
+    0xD1: _number(_i16),
+    0xD2: _number(_i32),
+    0xD3: _number(_i64),
+    0xD9: _sized(_u8, _text),
+    0xDA: _sized(_u16, _text),
+    0xDB: _sized(_u32, _text),
+    0xDC: _sized(_u16, _msgpack_array),
+    0xDD: _sized(_u32, _msgpack_array),
+    0xDE: _sized(_u16, _msgpack_map),
+    0xDF: _sized(_u32, _msgpack_map),
+}
+
+
+# CBOR MAJOR TYPES
+UNSIGNED, NEGATIVE, BYTES, TEXT, ARRAY, MAP, TAG, SIMPLE = range(8)
+BIGNUM, NEGATIVE_BIGNUM = 2, 3  # TAGS
+INDEFINITE = 31
+BREAK = 0xFF
+
+
+def _cbor_head(major, length, out):
+    major <<= 5
+    if length < 24:
+        out.append(major | length)
+    elif length < 0x100:
+        out.append(major | 24)
+        out.append(length)
+    elif length < 0x10000:
+        out.append(major | 25)
+        out += _u16.pack(length)
+    elif length < 0x100000000:
+        out.append(major | 26)
+        out += _u32.pack(length)
+    else:
+        out.append(major | 27)
+        out += _u64.pack(length)
+
+
+def _cbor_write(value, out):
+    _class = value.__class__
+    if _class is str:
+        data = value.encode("utf8")
+        _cbor_head(TEXT, len(data), out)
+        out += data
+    elif _class is int:
+        if value >= 0:
+            major, magnitude = UNSIGNED, value
+        else:
+            major, magnitude = NEGATIVE, -1 - value
+        if magnitude < 0x10000000000000000:
+            _cbor_head(major, magnitude, out)
+        else:
+            data = magnitude.to_bytes((magnitude.bit_length() + 7) // 8, "big")
+            _cbor_head(TAG, BIGNUM if major == UNSIGNED else NEGATIVE_BIGNUM, out)
+            _cbor_head(BYTES, len(data), out)
+            out += data
+    elif _class is float:
+        out += b"\xfb" + _f64.pack(value)
+    elif _class is dict:
+        _cbor_head(MAP, len(value), out)
+        for k, v in value.items():
+            _cbor_write(k, out)
+            _cbor_write(v, out)
+    elif _class is list:
+        _cbor_head(ARRAY, len(value), out)
+        for v in value:
+            _cbor_write(v, out)
+    elif value is None:
+        out.append(0xF6)
+    elif value is True:
+        out.append(0xF5)
+    elif value is False:
+        out.append(0xF4)
+    elif _class in binary_types:
+        value = _contiguous(value)
+        _cbor_head(BYTES, value.nbytes if value.__class__ is memoryview else len(value), out)
+        out += value
+    else:
+        logger.error("Can not pack {type}", type=_class.__name__)
+
+
+def _cbor_argument(data, i, info):
+    """
+    RETURN (argument, NEXT POSITION) FOR THE additional info OF AN ITEM HEAD
+    """
+    if info < 24:
+        return info, i
+    elif info == 24:
+        return data[i], i + 1
+    elif info == 25:
+        return _u16.unpack_from(data, i)[0], i + 2
+    elif info == 26:
+        return _u32.unpack_from(data, i)[0], i + 4
+    elif info == 27:
+        return _u64.unpack_from(data, i)[0], i + 8
+    elif info == INDEFINITE:
+        return None, i
+    logger.error("Bad CBOR additional info {info}", info=info)
+
+
+def _cbor_read(data, i):
+    head = data[i]
+    i += 1
+    major = head >> 5
+    info = head & 0x1F
+
+    if major == SIMPLE:
+        if info == 20:
+            return False, i
+        elif info == 21:
+            return True, i
+        elif info in (22, 23):
+            return None, i
+        elif info == 25:
+            return _f16.unpack_from(data, i)[0], i + 2
+        elif info == 26:
+            return _f32.unpack_from(data, i)[0], i + 4
+        elif info == 27:
+            return _f64.unpack_from(data, i)[0], i + 8
+        logger.error("CBOR simple value {info} is not supported", info=info)
+
+    arg, i = _cbor_argument(data, i, info)
+    if major == UNSIGNED:
+        return arg, i
+    elif major == NEGATIVE:
+        return -1 - arg, i
+    elif major in (BYTES, TEXT):
+        if arg is None:
+            # INDEFINITE LENGTH: CONCATENATE THE CHUNKS
+            chunks = []
+            while data[i] != BREAK:
+                chunk, i = _cbor_read(data, i)
+                chunks.append(chunk)
+            return ("" if major == TEXT else b"").join(chunks), i + 1
+        if major == TEXT:
+            return _text(data, i, arg)
+        return _bytes(data, i, arg)
+    elif major == ARRAY:
+        output = []
+        if arg is None:
+            while data[i] != BREAK:
+                v, i = _cbor_read(data, i)
+                output.append(v)
+            return output, i + 1
+        for _ in range(arg):
+            v, i = _cbor_read(data, i)
+            output.append(v)
+        return output, i
+    elif major == MAP:
+        output = {}
+        if arg is None:
+            while data[i] != BREAK:
+                k, i = _cbor_read(data, i)
+                output[k], i = _cbor_read(data, i)
+            return output, i + 1
+        for _ in range(arg):
+            k, i = _cbor_read(data, i)
+            output[k], i = _cbor_read(data, i)
+        return output, i
+    else:  # TAG
+        value, i = _cbor_read(data, i)
+        if arg == BIGNUM:
+            return int.from_bytes(value, "big"), i
+        elif arg == NEGATIVE_BIGNUM:
+            return -1 - int.from_bytes(value, "big"), i
+        # OTHER TAGS (LIKE EPOCH TIME) ARE JUST THEIR VALUE
+        return value, i
+
+
+_default_scrubber = _binary_scrubber(True, UNIX)
@@ -0,0 +1,122 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# REJECT HOSTILE JSON (DEEP NESTING, HUGE STRINGS, HUGE ARRAYS) BEFORE IT REACHES THE DECODER
+#
+#     json2value(payload, limits=Limits(max_depth=32, max_bytes=1_000_000))
+#
+# THE TEXT IS SCANNED IN BULK, WITH bytes METHODS, NEVER ONE CHARACTER AT A TIME
+#
+from array import array
+from itertools import accumulate
+
+
+class Limits:
+    """
+    THE MOST A JSON DOCUMENT MAY HAVE, CHECKED BEFORE IT IS DECODED (None FOR NO LIMIT)
+    """
+
+    __slots__ = ["max_bytes", "max_depth", "max_string", "max_elements"]
+
+    def __init__(self, max_bytes=None, max_depth=None, max_string=None, max_elements=None):
+        """
+        :param max_bytes: MAXIMUM SIZE OF THE DOCUMENT, IN UTF-8 BYTES
+        :param max_depth: MAXIMUM NESTING OF OBJECTS AND ARRAYS
+        :param max_string: MAXIMUM SIZE OF ONE STRING (OR PROPERTY NAME), IN UTF-8 BYTES, AS WRITTEN IN THE JSON
+        :param max_elements: MAXIMUM NUMBER OF ARRAY ELEMENTS AND OBJECT PROPERTIES, IN THE WHOLE DOCUMENT (AN EMPTY [] OR {} COUNTS AS ONE)
+        """
+        self.max_bytes = max_bytes
+        self.max_depth = max_depth
+        self.max_string = max_string
+        self.max_elements = max_elements
+
+
+class LimitExceeded(ValueError):
+    """
+    RAISED WHEN A DOCUMENT IS OVER ONE OF ITS Limits
+    """
+
+    def __init__(self, limit, maximum, message):
+        """
+        :param limit: NAME OF THE Limits PROPERTY THAT WAS EXCEEDED (eg "max_depth")
+        :param maximum: THE VALUE OF THAT PROPERTY
+        :param message: WHAT WAS FOUND
+        """
+        ValueError.__init__(self, message)
+        self.limit = limit
+        self.maximum = maximum
+
+
+_QUOTE, _COMMA, _BACKSLASH, _OPEN = b'"', b",", b"\\", b"[{"
+# EVERY BYTE EXCEPT THE BRACKETS
+_NOT_BRACKET = bytes(b for b in range(256) if b not in b"[]{}")
+# OPEN BRACKETS BECOME +1, CLOSE BRACKETS BECOME -1 (AS SIGNED BYTES)
+_BRACKET_STEP = bytes.maketrans(b"[{]}", b"\x01\x01\xff\xff")
+_CHUNK = 64 * 1024
+
+
+def check_limits(json, limits):
+    """
+    RAISE LimitExceeded IF json IS OVER THE limits
+    BAD JSON IS NOT REPORTED HERE; THAT IS LEFT FOR THE DECODER
+    :param json: str, OR UTF-8 BINARY
+    :param limits: Limits
+    """
+    if json.__class__ is str:
+        json = json.encode("utf8", "surrogatepass")
+    elif json.__class__ is memoryview:
+        json = json.tobytes()
+    elif json.__class__ is not bytes and json.__class__ is not bytearray:
+        json = str(json).encode("utf8", "surrogatepass")
+
+    max_bytes = limits.max_bytes
+    if max_bytes is not None and len(json) > max_bytes:
+        raise LimitExceeded("max_bytes", max_bytes, f"JSON is {len(json)} bytes, more than the limit of {max_bytes}")
+
+    max_depth, max_string, max_elements = limits.max_depth, limits.max_string, limits.max_elements
+    if max_depth is None and max_string is None and max_elements is None:
+        return
+
+    if _BACKSLASH in json:
+        # BLANK OUT THE ESCAPES (SAME LENGTH), SO EVERY QUOTE LEFT STARTS OR ENDS A STRING
+        json = json.replace(b"\\\\", b"__").replace(b'\\"', b"__")
+    # THE EVEN PARTS ARE THE STRUCTURE, THE ODD PARTS ARE THE STRINGS
+    parts = json.split(_QUOTE)
+    if max_string is not None:
+        longest = max(map(len, parts[1::2]), default=0)
+        if longest > max_string:
+            raise LimitExceeded(
+                "max_string", max_string, f"JSON has a string of {longest} bytes, more than the limit of {max_string}"
+            )
+    structure = b"".join(parts[0::2])
+    del parts
+
+    if max_elements is not None:
+        # EACH OPEN BRACKET STARTS ONE ELEMENT, EACH COMMA STARTS ANOTHER
+        elements = structure.count(_COMMA) + structure.count(_OPEN[:1]) + structure.count(_OPEN[1:])
+        if elements > max_elements:
+            raise LimitExceeded(
+                "max_elements", max_elements, f"JSON has {elements} elements, more than the limit of {max_elements}"
+            )
+
+    if max_depth is not None:
+        brackets = structure.translate(None, _NOT_BRACKET)
+        del structure
+        if len(brackets) <= max_depth:
+            return
+        # THE DEPTH IS THE HIGHEST RUNNING TOTAL OF +1 FOR EACH OPEN, AND -1 FOR EACH CLOSE
+        # SUMMED IN CHUNKS, SO A HOSTILE "[[[[..." IS REJECTED AFTER THE FIRST ONE
+        steps = array("b", brackets.translate(_BRACKET_STEP))
+        total = 0
+        for start in range(0, len(steps), _CHUNK):
+            chunk = steps[start : start + _CHUNK]
+            depth = max(accumulate(chunk, initial=total))
+            if depth > max_depth:
+                raise LimitExceeded("max_depth", max_depth, f"JSON is nested more than {max_depth} deep")
+            total += sum(chunk)
@@ -0,0 +1,416 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# READ A FEW FIELDS OUT OF A HUGE JSON DOCUMENT WITHOUT DECODING ALL OF IT
+#
+#     doc = json2value(huge, lazy=True)
+#     doc.meta.version     # SCANS ONLY UNTIL "meta" IS FOUND, THEN DECODES ONLY meta
+#
+import re
+from threading import Lock
+
+from mo_dots import Data, FlatList, Null, NullType, split_field, to_data
+from mo_imports import delay_import
+
+from mo_json.backends import decode
+from mo_json.binary import utf8_text
+
+logger = delay_import("mo_logs.logger")
+
+LAZY_SIZE = 64 * 1024  # SMALLER OBJECTS AND ARRAYS ARE DECODED WHOLE, NOT PROXIED
+_NOT_CACHED = object()  # NOT None, WHICH CAN BE A DECODED VALUE
+
+
+class _Syntax:
+    """
+    THE PATTERNS FOR ONE KIND OF INPUT (str OR UTF-8 BINARY)
+    """
+
+    def __init__(self, convert):
+        string = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+        other = r'[^"\[\]{}]*'
+        self.next = re.compile(convert(r"[ \t\n\r]*(.)"), re.S).match
+        self.string = re.compile(convert(string)).match
+        self.primitive = re.compile(convert(r"[^,\]}\s]+")).match
+        # EVERYTHING UP TO, AND INCLUDING, THE NEXT BRACKET THAT IS NOT IN A STRING
+        self.bracket = re.compile(convert(other + "(?:" + string + other + r")*([\[\]{}])")).match
+        self.open = convert("[{")
+        self.whitespace = convert(" \t\n\r")
+        self.quote, self.colon, self.comma, self.close_object, self.close_array = (convert(c) for c in '":,}]')
+
+
+_text = _Syntax(str)
+_binary = _Syntax(lambda s: s.encode("utf8"))
+
+
+def lazy_value(json):
+    """
+    :param json: str, OR UTF-8 BINARY THAT CAN BE READ IN PLACE
+    :return: A LAZY PROXY FOR A LARGE OBJECT OR ARRAY; SMALL DOCUMENTS ARE DECODED AS USUAL
+    """
+    syntax = _text if json.__class__ is str else _binary
+    found = syntax.next(json)
+    end = len(json)
+    while end and json[end - 1 : end] in syntax.whitespace:
+        end -= 1
+    if found is None or end < LAZY_SIZE or found.group(1) not in syntax.open:
+        return to_data(decode(json))
+    return _proxy(json, syntax, found.start(1), end)
+
+
+def _proxy(json, syntax, start, end):
+    c = json[start : start + 1]
+    if c == syntax.open[1:]:
+        return LazyObject(json, syntax, start, end)
+    return LazyList(json, syntax, start, end)
+
+
+def _jump_to_end(json, syntax, index, c, limit=None):
+    """
+    SAME AS stream.Parser.jump_to_end(), BUT EVERYTHING BETWEEN TWO BRACKETS IS SKIPPED WITH ONE REGEX MATCH
+    :param index: WHERE THE VALUE STARTS
+    :param c: THE FIRST CHARACTER OF THE VALUE
+    :param limit: GIVE UP ON OBJECTS AND ARRAYS THAT DO NOT END BEFORE limit
+    :return: INDEX JUST PAST THE VALUE (None IF PAST limit)
+    """
+    if c in syntax.open:
+        bracket = syntax.bracket
+        open = syntax.open
+        end = limit or len(json)
+        depth = 0
+        while True:
+            found = bracket(json, index, end)
+            if found is None:
+                if limit:
+                    return None
+                logger.error("Expecting a closing bracket for the value at {index}", index=index)
+            index = found.end()
+            if found.group(1) in open:
+                depth += 1
+            else:
+                depth -= 1
+                if not depth:
+                    return index
+    elif c == syntax.quote:
+        found = syntax.string(json, index)
+    else:
+        found = syntax.primitive(json, index)
+    if found is None:
+        logger.error("Expecting a JSON value at {index}", index=index)
+    return found.end()
+
+
+class _Lazy:
+    """
+    THE SPAN OF AN UNDECODED OBJECT OR ARRAY, AND AS MUCH OF ITS MEMBER INDEX AS WAS NEEDED SO FAR
+    """
+
+    __slots__ = ["_json", "_syntax", "_start", "_end", "_members", "_cursor", "_pending", "_done", "_values", "_lock"]
+
+    def __init__(self, json, syntax, start, end):
+        self._json = json
+        self._syntax = syntax
+        self._start = start
+        self._end = end  # None UNTIL SOMETHING NEEDS IT
+        self._members = {}  # MAP FROM MEMBER (NAME OR POSITION) TO THE (start, end) OF ITS VALUE
+        self._cursor = start + 1  # WHERE THE SCAN FOR MORE MEMBERS CONTINUES
+        self._pending = None  # THE LAST MEMBER, IF IT IS BIG AND ITS END IS NOT FOUND YET
+        self._done = False
+        self._values = {}
+        self._lock = Lock()
+
+    def _next(self, index):
+        """
+        :return: (CHARACTER, INDEX) OF THE NEXT NON-WHITESPACE CHARACTER
+        """
+        found = self._syntax.next(self._json, index, self._end or len(self._json))
+        if found is None:
+            logger.error("Unexpected end of JSON at {index}", index=index)
+        return found.group(1), found.start(1)
+
+    def _scan(self, wanted=None):
+        """
+        INDEX MORE MEMBERS, STOPPING AFTER wanted (OR AT THE END)
+        THE END OF A BIG wanted VALUE IS NOT LOOKED FOR UNTIL A LATER MEMBER IS NEEDED
+        """
+        with self._lock:
+            json = self._json
+            syntax = self._syntax
+            members = self._members
+            if self._pending is not None:
+                member = self._pending
+                start = members[member][0]
+                end = _jump_to_end(json, syntax, start, json[start : start + 1])
+                members[member] = (start, end)
+                child = self._values.get(member)
+                if isinstance(child, _Lazy):
+                    child._end = end
+                self._cursor = end
+                self._pending = None
+            while not self._done:
+                found = self._next_member(self._cursor)
+                if found is None:
+                    self._done = True
+                    break
+                member, start, c = found
+                if member in members:
+                    # A REPEATED PROPERTY NAME: THE FIRST ONE IS KEPT, SO READS DO NOT DEPEND ON HOW FAR THE SCAN WENT
+                    self._cursor = _jump_to_end(json, syntax, start, c)
+                    continue
+                if member == wanted and c in syntax.open:
+                    end = _jump_to_end(json, syntax, start, c, start + LAZY_SIZE)
+                    if end is None:
+                        members[member] = (start, None)
+                        self._pending = member
+                        break
+                else:
+                    end = _jump_to_end(json, syntax, start, c)
+                members[member] = (start, end)
+                self._cursor = end
+                if member == wanted:
+                    break
+
+    def _value(self, member, span):
+        """
+        :return: THE DECODED VALUE OF THE span, CACHED UNDER member
+        """
+        output = self._values.get(member, _NOT_CACHED)
+        if output is not _NOT_CACHED:
+            return output
+        start, end = span
+        if end is None or end - start >= LAZY_SIZE and self._json[start : start + 1] in self._syntax.open:
+            output = _proxy(self._json, self._syntax, start, end)
+        else:
+            try:
+                output = to_data(decode(self._json[start:end]))
+            except Exception as cause:
+                logger.error("Can not decode JSON at {index}", index=start, cause=cause)
+        return self._values.setdefault(member, output)
+
+    def _decode_all(self):
+        start = self._start
+        if self._end is None:
+            self._end = _jump_to_end(self._json, self._syntax, start, self._json[start : start + 1])
+        try:
+            return decode(self._json[start : self._end])
+        except Exception as cause:
+            logger.error("Can not decode JSON at {index}", index=start, cause=cause)
+
+    def __data__(self):
+        """
+        :return: THE WHOLE VALUE, DECODED
+        """
+        return self._decode_all()
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if isinstance(other, _Lazy):
+            other = other._decode_all()
+        return to_data(self._decode_all()) == other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __setitem__(self, key, value):
+        logger.error(
+            "{type} is read-only; decode without lazy=True for a value that can change", type=self.__class__.__name__,
+        )
+
+    def __bool__(self):
+        return True
+
+    def __str__(self):
+        return str(self._decode_all())
+
+    def __repr__(self):
+        if self._end is None:
+            return f"{self.__class__.__name__}(not decoded)"
+        return f"{self.__class__.__name__}({self._end - self._start} characters, not decoded)"
+
+
+class LazyObject(_Lazy):
+    """
+    READS LIKE Data, BUT A PROPERTY IS FOUND, AND DECODED, ONLY WHEN IT IS ASKED FOR
+    IF A PROPERTY NAME IS REPEATED, THE FIRST VALUE IS USED (FULL DECODING KEEPS THE LAST), SO
+    FINDING A PROPERTY NEVER NEEDS THE REST OF THE OBJECT
+    """
+
+    __slots__ = []
+
+    def _next_member(self, index):
+        """
+        :return: (NAME, START, FIRST CHARACTER) OF THE NEXT PROPERTY VALUE, OR None AT THE END
+        """
+        syntax = self._syntax
+        json = self._json
+        c, index = self._next(index)
+        if c == syntax.comma:
+            c, index = self._next(index + 1)
+        if c == syntax.close_object:
+            return None
+        if c != syntax.quote:
+            logger.error("Expecting a property name at {index}", index=index)
+        key_end = _jump_to_end(json, syntax, index, c)
+        key = utf8_text(json[index + 1 : key_end - 1])
+        if "\\" in key:
+            key = decode(json[index:key_end])
+        c, index = self._next(key_end)
+        if c != syntax.colon:
+            logger.error("Expecting colon at {index}", index=index)
+        c, start = self._next(index + 1)
+        return key, start, c
+
+    def _get(self, name):
+        span = self._members.get(name)
+        if span is None:
+            if self._done:
+                return Null
+            self._scan(name)
+            span = self._members.get(name)
+            if span is None:
+                return Null
+        return self._value(name, span)
+
+    def __getitem__(self, key):
+        if key == ".":
+            return self
+        if "." not in key:
+            return self._get(key)
+        value = self
+        for step in split_field(key):
+            if value.__class__ is LazyObject:
+                value = value._get(step)
+            else:
+                value = to_data(value).get(step)
+        return value
+
+    def __getattr__(self, key):
+        if key.startswith("__"):
+            raise AttributeError(key)
+        return self._get(key)
+
+    def get(self, key, default=Null):
+        output = self[key]
+        if _is_missing(output):
+            return default
+        return output
+
+    def __contains__(self, key):
+        return not _is_missing(self[key])
+
+    def keys(self):
+        self._scan()
+        return set(self._members.keys())
+
+    def values(self):
+        return to_data([v for _, v in self.items()])
+
+    def items(self):
+        self._scan()
+        return [(k, self._value(k, span)) for k, span in list(self._members.items())]
+
+    def __iter__(self):
+        return iter(self.items())
+
+    def __len__(self):
+        self._scan()
+        return len(self._members)
+
+
+class LazyList(_Lazy):
+    """
+    READS LIKE FlatList, BUT AN ELEMENT IS FOUND, AND DECODED, ONLY WHEN IT IS ASKED FOR
+    """
+
+    __slots__ = []
+
+    def _next_member(self, index):
+        """
+        :return: (POSITION, START, FIRST CHARACTER) OF THE NEXT ELEMENT, OR None AT THE END
+        """
+        syntax = self._syntax
+        c, start = self._next(index)
+        if c == syntax.comma:
+            c, start = self._next(start + 1)
+        if c == syntax.close_array:
+            return None
+        return len(self._members), start, c
+
+    def _element(self, index):
+        span = self._members.get(index)
+        if span is None:
+            if self._done:
+                return Null
+            self._scan(index)
+            span = self._members.get(index)
+            if span is None:
+                return Null
+        return self._value(index, span)
+
+    def __getitem__(self, index):
+        if index.__class__ is int:
+            if index < 0:
+                self._scan()
+                index += len(self._members)
+                if index < 0:
+                    return Null
+            return self._element(index)
+        elif index.__class__ is slice:
+            self._scan()
+            return to_data([self._element(i) for i in range(*index.indices(len(self._members)))])
+        return self.get(index)
+
+    def __getattr__(self, key):
+        if key.startswith("__"):
+            raise AttributeError(key)
+        return self.get(key)
+
+    def get(self, key):
+        """
+        SAME AS FlatList.get(): THE key OF EVERY ELEMENT
+        """
+        output = []
+        for v in self:
+            if v.__class__ in (LazyObject, Data):
+                v = v[key]
+            elif v.__class__ in (LazyList, FlatList):
+                v = v.get(key)
+            else:
+                continue
+            if v.__class__ in (LazyList, FlatList):
+                output.extend(v)
+            elif not _is_missing(v):
+                output.append(v)
+        return to_data(output)
+
+    def __iter__(self):
+        members = self._members
+        index = 0
+        while True:
+            if index not in members and not self._done:
+                self._scan(index)
+            span = members.get(index)
+            if span is None:
+                return
+            yield self._value(index, span)
+            index += 1
+
+    def __len__(self):
+        self._scan()
+        return len(self._members)
+
+    def __bool__(self):
+        if not self._members and not self._done:
+            self._scan(0)
+        return bool(self._members)
+
+
+def _is_missing(value):
+    return value is None or value.__class__ is NullType
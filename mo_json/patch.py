@@ -0,0 +1,231 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from copy import deepcopy
+
+from mo_dots import from_data, is_data, is_many, is_missing
+from mo_imports import delay_import
+
+logger = delay_import("mo_logs.logger")
+
+ADD = "add"
+REMOVE = "remove"
+REPLACE = "replace"
+MOVE = "move"
+COPY = "copy"
+TEST = "test"
+
+
+def json_diff(a, b):
+    """
+    RETURN RFC 6902 PATCH (A LIST OF OPERATIONS) THAT TURNS a INTO b
+    MISSING VALUES (None, Null, "") ARE TREATED AS ABSENT PROPERTIES
+    IDENTICAL SUBTREES ARE SKIPPED BY IDENTITY, EQUAL ONES AFTER A TYPE-AWARE COMPARE (True == 1, BUT NOT IN JSON)
+    :param a: THE ORIGINAL DOCUMENT (PLAIN OR Data)
+    :param b: THE NEW DOCUMENT (PLAIN OR Data)
+    :return: list OF OPERATIONS, READY FOR value2json()
+    """
+    output = []
+    _diff(from_data(a), from_data(b), "", output)
+    return output
+
+
+def _diff(a, b, path, output):
+    if a is b:
+        return
+    a, b = from_data(a), from_data(b)
+    if is_data(a) and is_data(b):
+        if a == b and _same(a, b):
+            # CHEAP C-LEVEL COMPARE FIRST; ONLY EQUAL SUBTREES ARE WALKED TO CHECK THE TYPES
+            return
+        for k, av in a.items():
+            if _absent(av):
+                continue
+            bv = b.get(k)
+            if _absent(bv):
+                output.append({"op": REMOVE, "path": path + "/" + _escape(k)})
+            else:
+                _diff(av, bv, path + "/" + _escape(k), output)
+        for k, bv in b.items():
+            if not _absent(bv) and _absent(a.get(k)):
+                output.append({"op": ADD, "path": path + "/" + _escape(k), "value": bv})
+    elif _is_list(a) and _is_list(b):
+        if a == b and _same(a, b):
+            return
+        _diff_list(a, b, path, output)
+    elif _same(a, b):
+        return
+    else:
+        output.append({"op": REPLACE, "path": path, "value": b})
+
+
+def _diff_list(a, b, path, output):
+    """
+    LINEAR-TIME MATCHING: TRIM THE COMMON PREFIX AND SUFFIX, PAIR THE MIDDLE
+    """
+    len_a, len_b = len(a), len(b)
+    start = 0
+    end = min(len_a, len_b)
+    while start < end and _same(a[start], b[start]):
+        start += 1
+    suffix = 0
+    while suffix < end - start and _same(a[len_a - 1 - suffix], b[len_b - 1 - suffix]):
+        suffix += 1
+
+    a_end = len_a - suffix
+    b_end = len_b - suffix
+    common = min(a_end, b_end) - start
+    for i in range(start, start + common):
+        _diff(a[i], b[i], path + "/" + str(i), output)
+
+    # REMOVE EXTRA OLD ELEMENTS, OR INSERT EXTRA NEW ONES
+    index = start + common
+    for _ in range(a_end - index):
+        output.append({"op": REMOVE, "path": path + "/" + str(index)})
+    for i in range(index, b_end):
+        output.append({"op": ADD, "path": path + "/" + str(i), "value": b[i]})
+
+
+def _absent(value):
+    # value2json() DOES NOT EMIT MISSING PROPERTIES, SO NEITHER DOES THE DIFF
+    return value is None or (is_missing(value) and not is_many(value))
+
+
+def _same(a, b):
+    """
+    EQUAL, WITH THE SAME TYPES ALL THE WAY DOWN (True == 1 AND False == 0, BUT THEY ARE DIFFERENT JSON)
+    """
+    if a is b:
+        return True
+    if a.__class__ is not b.__class__:
+        return False
+    if a.__class__ is dict:
+        return a.keys() == b.keys() and all(_same(v, b[k]) for k, v in a.items())
+    if a.__class__ in (list, tuple):
+        return len(a) == len(b) and all(map(_same, a, b))
+    return a == b
+
+
+def _is_list(value):
+    return value.__class__ in (list, tuple)
+
+
+def json_patch(doc, patch):
+    """
+    APPLY RFC 6902 patch TO doc, IN PLACE
+    AN OPERATION WITHOUT path IS ON THE ROOT, WHICH IS WHAT value2json() MAKES OF path=""
+    :param doc: THE DOCUMENT (PLAIN OR Data) TO CHANGE
+    :param patch: list OF OPERATIONS
+    :return: THE PATCHED DOCUMENT (A NEW OBJECT ONLY IF THE ROOT WAS REPLACED)
+    """
+    root = from_data(doc)
+    for op in from_data(patch):
+        op = from_data(op)
+        name = op.get("op")
+        # value2json() DROPS THE EMPTY ROOT PATH, SO A MISSING path IS THE ROOT
+        path = op.get("path") or ""
+        if name == ADD:
+            root = _add(root, path, deepcopy(from_data(op.get("value"))))
+        elif name == REMOVE:
+            root, _ = _remove(root, path)
+        elif name == REPLACE:
+            root, _ = _remove(root, path)
+            root = _add(root, path, deepcopy(from_data(op.get("value"))))
+        elif name == MOVE:
+            root, value = _remove(root, op["from"])
+            root = _add(root, path, value)
+        elif name == COPY:
+            root = _add(root, path, deepcopy(_get(root, op["from"])))
+        elif name == TEST:
+            if _get(root, path) != from_data(op.get("value")):
+                logger.error("Test failed at {path}", path=path)
+        else:
+            logger.error("Unknown patch operation {op|quote}", op=name)
+
+    if root is from_data(doc):
+        return doc
+    return root
+
+
+def _split(path):
+    if path == "":
+        return []
+    if not path.startswith("/"):
+        logger.error("Expecting JSON pointer, not {path|quote}", path=path)
+    return [_unescape(p) for p in path[1:].split("/")]
+
+
+def _parent(root, path):
+    steps = _split(path)
+    if not steps:
+        return None, None
+    parent = root
+    for step in steps[:-1]:
+        parent = _step(parent, step)
+    return parent, steps[-1]
+
+
+def _step(container, step):
+    try:
+        if isinstance(container, list):
+            return from_data(container[_index(step)])
+        return from_data(container[step])
+    except Exception as cause:
+        logger.error("Path step {step|quote} not found", step=step, cause=cause)
+
+
+def _get(root, path):
+    value = root
+    for step in _split(path):
+        value = _step(value, step)
+    return value
+
+
+def _add(root, path, value):
+    parent, last = _parent(root, path)
+    if last is None:
+        return value
+    if isinstance(parent, list):
+        if last == "-":
+            parent.append(value)
+        else:
+            index = _index(last)
+            if index > len(parent):
+                logger.error("Index {index} out of range", index=index)
+            parent.insert(index, value)
+    else:
+        parent[last] = value
+    return root
+
+
+def _remove(root, path):
+    parent, last = _parent(root, path)
+    if last is None:
+        return None, root
+    try:
+        if isinstance(parent, list):
+            return root, parent.pop(_index(last))
+        return root, parent.pop(last)
+    except Exception as cause:
+        logger.error("Can not remove {path|quote}", path=path, cause=cause)
+
+
+def _index(step):
+    try:
+        return int(step)
+    except Exception as cause:
+        logger.error("Expecting array index, not {step|quote}", step=step, cause=cause)
+
+
+def _escape(key):
+    return key.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(step):
+    return step.replace("~1", "/").replace("~0", "~")
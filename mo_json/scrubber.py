@@ -1,6 +1,8 @@
 import json
 import math
-from datetime import timedelta, timezone
+import operator
+from datetime import timedelta
+from functools import lru_cache
 
 from mo_dots import null_types, from_data, exists, utils, DataObject
 from mo_future import integer_types, is_text
@@ -9,12 +11,16 @@ from mo_logs import Except
 from mo_math import is_number
 from mo_times import Duration
 
+from mo_json import tracer as tracing
+from mo_json.binary import BINARY_TEXT, binary_converter, binary_types
+from mo_json.temporal import DATE_EPOCH, DATETIME_EPOCH, ISO, UNIX, convert_times, datetime2unix, time_converter
 from mo_json.types import *
 
 FIND_LOOPS = True  # FIND LOOPS IN DATA STRUCTURES
-DATETIME_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
-DATE_EPOCH = date(1970, 1, 1)
 
+DECIMAL_INT = "int"  # int IF INTEGRAL, OTHERWISE float
+DECIMAL_FLOAT = "float"  # ALWAYS float
+DECIMAL_STRING = "string"  # EXACT DIGITS, AS A JSON STRING
 
 logger = delay_import("mo_logs.logger")
 json_decoder = json.JSONDecoder().decode
@@ -22,12 +28,50 @@ _get = object.__getattribute__
 
 
 def _scrub_number(value):
-    d = float(value)
-    i_d = int(d)
-    if float(i_d) == d:
+    """
+    RETURN int IF value IS INTEGRAL, OTHERWISE float (None FOR NaN AND INFINITY)
+    """
+    if value.__class__ is int:
+        return value
+    elif hasattr(value, "__index__"):
+        # int SUBCLASSES AND numpy INTEGERS: KEEP EVERY DIGIT
+        return operator.index(value)
+    return _scrub_float(float(value))
+
+
+def _scrub_float(value):
+    if not math.isfinite(value):
+        return None
+    i_d = int(value)
+    if i_d == value:
         return i_d
-    else:
-        return d
+    return value
+
+
+def _decimal_int(value):
+    if not value.is_finite():
+        return None
+    if value == value.to_integral_value():
+        # EXACT, EVEN BEYOND 2**53
+        return int(value)
+    return float(value)
+
+
+def _decimal_float(value):
+    if not value.is_finite():
+        return None
+    return float(value)
+
+
+def _decimal_string(value):
+    if not value.is_finite():
+        return None
+    return str(value)
+
+
+_decimal_policies = {DECIMAL_INT: _decimal_int, DECIMAL_FLOAT: _decimal_float, DECIMAL_STRING: _decimal_string}
+_int_types = {int}
+_number_types = {int, float}
 
 
 def _keep_whitespace(value):
@@ -45,49 +89,78 @@ def trim_whitespace(value):
         return None
 
 
-def datetime2unix(value):
-    try:
-        if value == None:
-            return None
-        elif isinstance(value, datetime):
-            if value.tzinfo:
-                diff = value - DATETIME_EPOCH
-            else:
-                diff = value - DATETIME_EPOCH.replace(tzinfo=None)
-            return diff.total_seconds()
-        elif isinstance(value, date):
-            diff = value - DATE_EPOCH
-            return diff.total_seconds()
-        else:
+class Scrubber:
+    """
+    CONVERT VALUES TO THE TYPES THE C ENCODER ACCEPTS
+    A Scrubber KEEPS NO STATE BETWEEN CALLS, SO ONE INSTANCE CAN BE SHARED BY MANY THREADS
+    """
+
+    def __init__(
+        self,
+        scrub_text=_keep_whitespace,
+        scrub_number=_scrub_number,
+        time_format=UNIX,
+        decimal_policy=DECIMAL_INT,
+        binary_policy=BINARY_TEXT,
+        in_place=False,
+    ):
+        """
+        :param scrub_text: FUNCTION TO CLEAN STRINGS (RETURN None TO REMOVE)
+        :param scrub_number: FUNCTION TO CLEAN NUMBERS
+        :param time_format: HOW TIMES ARE EMITTED: UNIX (SECONDS), MILLI OR ISO (SEE mo_json.temporal)
+        :param decimal_policy: HOW Decimal IS EMITTED: DECIMAL_INT, DECIMAL_FLOAT OR DECIMAL_STRING
+        :param binary_policy: HOW bytes, bytearray AND memoryview ARE EMITTED: BINARY_TEXT, BINARY_BASE64 OR BINARY_BASE85
+        :param in_place: True TO SCRUB dict AND list INSIDE THE GIVEN CONTAINERS (THE CALLER'S DATA IS CHANGED)
+        """
+        scrub_decimal = _decimal_policies.get(decimal_policy)
+        if not scrub_decimal:
             logger.error(
-                "Can not convert {{value}} of type {{type}}", value=value, type=value.__class__,
+                "Expecting decimal_policy to be one of {policies}, not {policy|quote}",
+                policies=list(_decimal_policies),
+                policy=decimal_policy,
             )
-    except Exception as e:
-        logger.error("Can not convert {value}", value=value, cause=e)
-
-
-class Scrubber:
-    def __init__(self, scrub_text=_keep_whitespace, scrub_number=_scrub_number):
+        # LISTS OF PLAIN NUMBERS ARE SCRUBBED IN ONE PASS, UNLESS THE NUMBER RULES ARE CUSTOM
+        self.fast_numbers = scrub_number is _scrub_number
+        self.fast_float = _scrub_float
+        self.in_place = in_place
         self.scrub_text = lambda value, is_done, stack: scrub_text(value)
         self.scrub_number = lambda value, is_done, stack: scrub_number(value)
+        self.time_format = time_format
+        to_binary = binary_converter(binary_policy)
+        scrub_binary = lambda value, is_done, stack: to_binary(value)
+        to_time = time_converter(time_format)
+        if time_format == ISO:
+            self.scrub_time = lambda value, is_done, stack: to_time(value)
+        else:
+
+            def scrub_time(value, is_done, stack):
+                number = to_time(value)
+                # numpy NaT IS A MISSING TIME
+                return None if number is None else scrub_number(number)
+
+            self.scrub_time = scrub_time
+        if self.fast_numbers:
+            scrub_float = lambda value, is_done, stack: _scrub_float(value)
+        else:
+            scrub_float = lambda value, is_done, stack: None if math.isnan(value) or math.isinf(value) else scrub_number(
+                value
+            )
 
         self.scrubbers = {
             **{t: lambda value, is_done, stack: None for t in null_types},
             str: self.scrub_text,
-            float: lambda value, is_done, stack: None
-            if math.isnan(value) or math.isinf(value)
-            else scrub_number(value),
+            float: scrub_float,
             **{t: self.scrub_number for t in integer_types},
             **{t: self._scrub_many for t in utils._many_types},
             **{t: self._scrub_data for t in utils._data_types},
             bool: lambda value, is_done, stack: value,
-            date: lambda value, is_done, stack: scrub_number(datetime2unix(value)),
-            datetime: lambda value, is_done, stack: scrub_number(datetime2unix(value)),
+            date: self.scrub_time,
+            datetime: self.scrub_time,
             timedelta: lambda value, is_done, stack: scrub_number(value.total_seconds()),
-            Date: lambda value, is_done, stack: scrub_number(value.unix),
+            Date: self.scrub_time,
             Duration: lambda value, is_done, stack: scrub_number(value.seconds),
-            bytes: lambda value, is_done, stack: value.decode("latin1"),
-            Decimal: lambda value, is_done, stack: scrub_number(value),
+            **{t: scrub_binary for t in binary_types},
+            Decimal: lambda value, is_done, stack: scrub_decimal(value),
             type: lambda value, is_done, stack: value.__name__,
         }
 
@@ -112,35 +185,51 @@ class Scrubber:
         if scrubber:
             return scrubber(value, is_done, stack)
 
+        tracer = tracing.active
+        if tracer is None:
+            return self._scrub_slow(value, is_done, stack)[1]
+        return tracer.trace(type_, self._scrub_slow, value, is_done, stack)
+
+    def _scrub_slow(self, value, is_done, stack):
+        """
+        FOR TYPES WITHOUT A REGISTERED SCRUBBER
+        :return: (BRANCH TAKEN, SCRUBBED VALUE)
+        """
         if isinstance(value, str):
-            return str(value)
+            return tracing.STR_SUBCLASS, str(value)
         elif hasattr(value, "__json__"):
-            return self._scrub_json(value, is_done, stack)
+            return tracing.JSON_METHOD, self._scrub_json(value, is_done, stack)
         elif hasattr(value, "__data__"):
-            return self._scrub(value.__data__(), is_done, stack)
+            return tracing.DATA_METHOD, self._scrub(value.__data__(), is_done, stack)
         elif isinstance(value, Exception):
-            return self._scrub(Except.wrap(value), is_done, stack)
+            return tracing.EXCEPTION, self._scrub(Except.wrap(value), is_done, stack)
         elif is_number(value):
-            return self.scrub_number(value, is_done, stack)
+            return tracing.NUMBER, self.scrub_number(value, is_done, stack)
         elif value.__class__.__name__ == "bool_":
-            return False if value == False else True
+            return tracing.NUMPY, False if value == False else True
+        elif value.__class__.__name__ == "datetime64":
+            return tracing.NUMPY, self.scrub_time(value, is_done, stack)
+        elif value.__class__.__name__ == "ndarray" and value.dtype.kind == "M":
+            return tracing.NUMPY, self._scrub_many(convert_times(value, self.time_format), is_done, stack)
         elif (
             hasattr(value, "co_code")
             and getattr(value, "co_code")
             or hasattr(value, "f_locals")
             and getattr(value, "f_locals")
         ):
-            return None
+            return tracing.CODE, None
         elif hasattr(value, "__call__"):
-            return str(repr(value))
+            return tracing.CALLABLE, str(repr(value))
         else:
             # FINALLY, WRAP IN OBJECT AND ATTEMPT TO SERIALIZE
-            return self._scrub_data(DataObject(value), is_done, stack)
+            return tracing.DATA_OBJECT, self._scrub_data(DataObject(value), is_done, stack)
 
     def _scrub_data(self, value, is_done, stack):
         """
         REMOVE/REPLACE VALUES THAT CAN NOT BE JSON-IZED
         """
+        if self.in_place and value.__class__ is dict:
+            return self._scrub_data_in_place(value, is_done, stack)
         output = {}
         for k, v in value.items():
             if not isinstance(k, str):
@@ -150,13 +239,62 @@ class Scrubber:
                 output[k] = v
         return output
 
+    def _scrub_data_in_place(self, value, is_done, stack, drop_empty=False):
+        """
+        SCRUB THE PROPERTIES OF value INSIDE value, AND RETURN IT
+        """
+        missing = []
+        for k, v in value.items():
+            if not isinstance(k, str):
+                logger.error("keys must be strings")
+            s = self._scrub(v, is_done, stack)
+            if s is None or (drop_empty and s.__class__ in (dict, list) and not s):
+                missing.append(k)
+            elif s is not v:
+                # SAME KEY, SO THE dict DOES NOT CHANGE SIZE WHILE ITERATING
+                value[k] = s
+        for k in missing:
+            del value[k]
+        return value
+
     def _scrub_many(self, value, is_done, stack):
+        if self.in_place:
+            raw = from_data(value)  # FlatList IS NOT UNWRAPPED BY _scrub()
+            if raw.__class__ is list:
+                return self._scrub_many_in_place(raw, is_done, stack)
+        if self.fast_numbers and value.__class__ in (list, tuple):
+            types = set(map(type, value))
+            if types <= _int_types:
+                return list(value)
+            elif types <= _number_types:
+                fast_float = self.fast_float
+                return [v if v.__class__ is int else fast_float(v) for v in value]
         output = []
         for v in value:
             v = self._scrub(v, is_done, stack)
             output.append(v)
         return output  # if output else None
 
+    def _scrub_many_in_place(self, value, is_done, stack):
+        """
+        SCRUB THE ITEMS OF value INSIDE value, AND RETURN IT
+        """
+        if self.fast_numbers:
+            types = set(map(type, value))
+            if types <= _int_types:
+                return value
+            elif types <= _number_types:
+                fast_float = self.fast_float
+                for i, v in enumerate(value):
+                    if v.__class__ is float:
+                        value[i] = fast_float(v)
+                return value
+        for i, v in enumerate(value):
+            s = self._scrub(v, is_done, stack)
+            if s is not v:
+                value[i] = s
+        return value
+
     def _scrub_json(self, value, is_done, stack):
         try:
             j = value.__json__()
@@ -167,3 +305,19 @@ class Scrubber:
             return self._scrub(data, is_done, stack)
         except Exception as cause:
             logger.error("problem with calling __json__()", cause)
+
+
+@lru_cache(maxsize=64)
+def shared_scrubber(
+    scrub_text=_keep_whitespace, time_format=UNIX, decimal_policy=DECIMAL_INT, binary_policy=BINARY_TEXT, in_place=False,
+):
+    """
+    :return: ONE Scrubber FOR THESE RULES, SHARED BY ALL CALLERS (AND THREADS), INSTEAD OF BUILDING ONE PER CALL
+    """
+    return Scrubber(
+        scrub_text=scrub_text,
+        time_format=time_format,
+        decimal_policy=decimal_policy,
+        binary_policy=binary_policy,
+        in_place=in_place,
+    )
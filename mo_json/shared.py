@@ -0,0 +1,135 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# HAND LARGE DOCUMENTS TO OTHER PROCESSES WITHOUT PICKLING THE JSON
+#
+#     handle = value2shared(big_document)   # IN THE PRODUCER
+#     queue.put(handle)                     # ONLY THE NAME AND SIZE ARE PICKLED
+#     doc = shared2value(queue.get())       # IN THE CONSUMER; THE BLOCK IS FREED
+#
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+from mo_imports import delay_import
+
+value2json = delay_import("mo_json.value2json")
+json2value = delay_import("mo_json.json2value")
+
+CHUNK_SIZE = 1024 * 1024  # CHARACTERS ENCODED AT A TIME
+
+
+class SharedJson:
+    """
+    CHEAP-TO-PICKLE HANDLE TO UTF-8 JSON IN A SharedMemory BLOCK
+    """
+
+    __slots__ = ["name", "size"]
+
+    def __init__(self, name, size):
+        self.name = name  # NAME OF THE SharedMemory BLOCK
+        self.size = size  # NUMBER OF JSON BYTES IN THE BLOCK
+
+    def __getstate__(self):
+        return self.name, self.size
+
+    def __setstate__(self, state):
+        self.name, self.size = state
+
+    def release(self):
+        """
+        FREE THE BLOCK WITHOUT READING IT
+        """
+        shm = SharedMemory(name=self.name)
+        shm.close()
+        shm.unlink()
+
+    def __repr__(self):
+        return f"SharedJson(name={self.name!r}, size={self.size})"
+
+
+def value2shared(value, name=None):
+    """
+    ENCODE value INTO A NEW SharedMemory BLOCK
+    THE JSON IS MADE AS ONE str FIRST. ASCII JSON IS THEN ENCODED CHUNK BY CHUNK STRAIGHT INTO THE BLOCK,
+    BUT OTHER JSON IS ENCODED WHOLE BEFORE THE BLOCK IS MADE (ITS SIZE IS NOT KNOWN UNTIL THEN), SO THE
+    PEAK IS ABOUT TWO TO THREE TIMES THE JSON SIZE
+    THE CONSUMER OWNS THE BLOCK: IT MUST CALL shared2value() OR release() TO FREE IT
+    :param value: THE VALUE TO TURN INTO JSON
+    :param name: OPTIONAL NAME FOR THE BLOCK
+    :return: SharedJson HANDLE
+    """
+    size, chunks = utf8_chunks(value2json(value))
+    shm = SharedMemory(name=name, create=True, size=max(size, 1))
+    try:
+        write_chunks(chunks, shm.buf)
+        handle = SharedJson(shm.name, size)
+    except Exception:
+        shm.close()
+        shm.unlink()
+        raise
+    shm.close()
+    # OWNERSHIP MOVES TO THE CONSUMER; DO NOT LET THIS PROCESS FREE THE BLOCK ON EXIT
+    _untrack(shm)
+    return handle
+
+
+def shared2value(handle, leaves=False, keep=False):
+    """
+    DECODE THE JSON STRAIGHT FROM A memoryview OF THE SharedMemory BLOCK
+    :param handle: SharedJson FROM value2shared()
+    :param leaves: ASSUME JSON KEYS ARE DOT-DELIMITED
+    :param keep: True TO LEAVE THE BLOCK FOR ANOTHER READER
+    :return: Python value
+    """
+    shm = SharedMemory(name=handle.name)
+    try:
+        view = shm.buf[: handle.size]
+        try:
+            return json2value(view, leaves=leaves)
+        finally:
+            view.release()
+    finally:
+        shm.close()
+        if keep:
+            _untrack(shm)
+        else:
+            shm.unlink()
+
+
+def utf8_chunks(text):
+    """
+    ENCODE text TO UTF-8 ONE CHUNK AT A TIME, ENCODING EACH CHUNK ONLY ONCE
+    ASCII CHUNKS ARE ENCODED AS THEY ARE READ; OTHER TEXT IS ALL ENCODED AND HELD, TO COUNT ITS BYTES
+    :return: (NUMBER OF BYTES, ITERABLE OF bytes CHUNKS)
+    """
+    if text.isascii():
+        # THE SIZE IS KNOWN WITHOUT ENCODING, SO THE CHUNKS ARE ENCODED AS THEY ARE WRITTEN
+        return len(text), (text[i : i + CHUNK_SIZE].encode("ascii") for i in range(0, len(text), CHUNK_SIZE))
+    chunks = [text[i : i + CHUNK_SIZE].encode("utf8") for i in range(0, len(text), CHUNK_SIZE)]
+    return sum(len(c) for c in chunks), chunks
+
+
+def write_chunks(chunks, buffer):
+    """
+    WRITE THE bytes chunks INTO buffer, ONE AFTER THE OTHER
+    :return: NUMBER OF BYTES WRITTEN
+    """
+    position = 0
+    for chunk in chunks:
+        end = position + len(chunk)
+        buffer[position:end] = chunk
+        position = end
+    return position
+
+
+def _untrack(shm):
+    try:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
@@ -0,0 +1,147 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# THE {{name|formatter}} PLACEHOLDERS EXPANDED BY json2value(..., params=...)
+#
+# A TEMPLATE IS PARSED ONCE INTO LITERAL TEXT AND PLACEHOLDERS WITH THEIR
+# FORMATTER FUNCTIONS ALREADY FOUND, SO EXPANDING IT AGAIN, WITH OTHER params,
+# IS ONLY A JOIN.  FORMATTER ARGUMENTS MUST BE LITERALS; NOTHING IS EVALUATED
+#
+#     compile_template('{"a": {{a}}, "b": {{b|quote}}}').expand(({"a": 1, "b": "x"},))
+#
+import ast
+import re
+from functools import lru_cache
+
+from mo_dots import is_sequence
+from mo_imports import delay_import
+from mo_logs.strings import FORMATTERS, toString
+
+logger = delay_import("mo_logs.logger")
+
+_variable_pattern = re.compile(r"\{\{([\w_\.]+(\|[^\}^\|]+)*)\}\}")
+
+
+@lru_cache(maxsize=256)
+def compile_template(template):
+    """
+    :param template: TEXT WITH {{path|formatter|formatter(literal, ...)}} PLACEHOLDERS
+    :return: A Template, SHARED BY ALL CALLERS WITH THE SAME TEXT
+    """
+    literals = []
+    placeholders = []
+    start = 0
+    for found in _variable_pattern.finditer(template):
+        literals.append(template[start : found.start()])
+        placeholders.append(_Placeholder(found.group(1)))
+        start = found.end()
+    literals.append(template[start:])
+    return Template(template, literals, placeholders)
+
+
+class Template:
+    """
+    LITERAL TEXT, WITH ONE PLACEHOLDER BETWEEN EACH PAIR OF LITERALS
+    """
+
+    __slots__ = ["template", "literals", "placeholders"]
+
+    def __init__(self, template, literals, placeholders):
+        self.template = template
+        self.literals = literals
+        self.placeholders = placeholders
+
+    def expand(self, seq):
+        """
+        :param seq: TUPLE OF OBJECTS IN PATH ORDER INTO THE DATA TREE; seq[-1] IS THE CURRENT CONTEXT
+        :return: THE TEXT, WITH EVERY PLACEHOLDER REPLACED
+        """
+        literals = self.literals
+        if len(literals) == 1:
+            return literals[0]
+        output = [literals[0]]
+        for placeholder, literal in zip(self.placeholders, literals[1:]):
+            output.append(placeholder.expand(seq, self.template))
+            output.append(literal)
+        return "".join(output)
+
+
+class _Placeholder:
+    """
+    ONE {{path|formatter...}}, WITH THE PATH SPLIT, AND THE FORMATTERS FOUND
+    """
+
+    __slots__ = ["code", "depth", "var", "number", "formatters", "problem"]
+
+    def __init__(self, code):
+        self.code = code
+        path, *names = code.split("|")
+        self.var = var = path.lstrip(".")
+        self.depth = max(1, len(path) - len(var))
+        try:
+            number = float(var)
+            self.number = int(number) if number == round(number, 0) else None
+        except (ValueError, OverflowError):
+            # NOT A NUMBER, OR ONE TOO BIG TO BE AN INDEX (inf, 1e400)
+            self.number = None
+        try:
+            self.formatters = [_formatter(name) for name in names]
+            self.problem = None
+        except Exception as cause:
+            # REPORTED EACH TIME THE TEMPLATE IS EXPANDED, AS BEFORE; ONLY THE MESSAGE IS KEPT,
+            # BECAUSE A SHARED EXCEPTION WOULD COLLECT A TRACEBACK FRAME ON EVERY RAISE
+            self.formatters = []
+            self.problem = str(cause)
+
+    def expand(self, seq, template):
+        try:
+            if self.problem:
+                raise Exception(self.problem)
+            val = seq[-min(len(seq), self.depth)]
+            var = self.var
+            if var:
+                if self.number is not None and is_sequence(val):
+                    val = val[self.number]
+                else:
+                    val = val[var]
+            for func, args, kwargs in self.formatters:
+                val = func(val, *args, **kwargs)
+            _class = val.__class__
+            if _class is str:
+                return val
+            elif _class is int:
+                return str(val)
+            return toString(val)
+        except Exception as cause:
+            logger.warning(
+                "Can not expand {code} in template: {template_|json}", code=self.code, template_=template, cause=cause,
+            )
+            return "[template expansion error: (" + str(cause) + ")]"
+
+
+def _formatter(text):
+    """
+    :param text: A FORMATTER NAME, OR A CALL LIKE left(3) OR round(digits=2)
+    :return: (FUNCTION, ARGS, KWARGS); ONLY LITERAL ARGUMENTS ARE ACCEPTED
+    """
+    name, paren, rest = text.partition("(")
+    name = name.strip()
+    func = FORMATTERS.get(name)
+    if not func:
+        raise Exception(f"Can not find formatter {name}")
+    if not paren:
+        return func, (), {}
+    call = ast.parse(name + "(" + rest, mode="eval").body
+    if not isinstance(call, ast.Call) or not isinstance(call.func, ast.Name):
+        raise Exception(f"Expecting formatter arguments, not {text}")
+    if any(k.arg is None for k in call.keywords):
+        raise Exception(f"Expecting formatter arguments, not {text}")
+    args = tuple(ast.literal_eval(a) for a in call.args)
+    kwargs = {k.arg: ast.literal_eval(k.value) for k in call.keywords}
+    return func, args, kwargs
@@ -0,0 +1,181 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# ONE PLACE TO TURN TIMES INTO JSON VALUES
+#
+# ALL CONVERSIONS ARE timedelta ARITHMETIC FROM THE EPOCH (NO struct_time, NO
+# LOCAL TIME). NAIVE datetime ARE ASSUMED TO BE UTC.
+#
+from datetime import date, datetime, timedelta, timezone
+
+from mo_imports import delay_import
+from mo_times import Date
+
+logger = delay_import("mo_logs.logger")
+
+UNIX = "unix"  # SECONDS SINCE EPOCH
+MILLI = "milli"  # MILLISECONDS SINCE EPOCH
+ISO = "iso"  # ISO-8601 STRING, IN UTC
+TIME_FORMATS = (UNIX, MILLI, ISO)
+
+DATETIME_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+NAIVE_EPOCH = datetime(1970, 1, 1)
+DATE_EPOCH = date(1970, 1, 1)
+
+
+def datetime2unix(value):
+    """
+    :param value: date, datetime, Date OR numpy.datetime64
+    :return: SECONDS SINCE EPOCH
+    """
+    return _convert(value, _unix, UNIX)
+
+
+def datetime2milli(value):
+    """
+    :param value: date, datetime, Date OR numpy.datetime64
+    :return: MILLISECONDS SINCE EPOCH
+    """
+    return _convert(value, _milli, MILLI)
+
+
+def datetime2iso(value):
+    """
+    :param value: date, datetime, Date OR numpy.datetime64
+    :return: ISO-8601 STRING (date IS JUST THE DAY, THE REST END WITH "Z")
+    """
+    return _convert(value, _iso, ISO)
+
+
+def time_converter(time_format=UNIX):
+    """
+    :param time_format: ONE OF UNIX, MILLI, ISO
+    :return: FUNCTION THAT CONVERTS ONE TIME VALUE
+    """
+    try:
+        return _converters[time_format]
+    except KeyError:
+        logger.error(
+            "Expecting time_format to be one of {formats}, not {time_format|quote}",
+            formats=TIME_FORMATS,
+            time_format=time_format,
+        )
+
+
+def convert_times(values, time_format=UNIX):
+    """
+    CONVERT MANY TIMES AT ONCE
+    :param values: LIST OF TIME VALUES, OR A numpy datetime64 ARRAY (CONVERTED AS A WHOLE)
+    :param time_format: ONE OF UNIX, MILLI, ISO
+    :return: list OF CONVERTED VALUES (None FOR MISSING TIMES)
+    """
+    converter = time_converter(time_format)
+    dtype = getattr(values, "dtype", None)
+    if dtype is not None and dtype.kind == "M":
+        return _convert_array(values, time_format)
+
+    # HOIST THE TYPE DISPATCH OUT OF THE LOOP
+    lookup = _lookups[time_format]
+    output = []
+    for value in values:
+        convert = lookup.get(value.__class__)
+        output.append(convert(value) if convert else converter(value))
+    return output
+
+
+def _convert(value, lookup, time_format):
+    convert = lookup.get(value.__class__)
+    if convert:
+        return convert(value)
+    try:
+        if value is None:
+            return None
+        elif isinstance(value, datetime):
+            return lookup[datetime](value)
+        elif isinstance(value, date):
+            return lookup[date](value)
+        elif isinstance(value, Date):
+            return lookup[Date](value)
+        elif value.__class__.__name__ == "datetime64":
+            return _convert_numpy(value, time_format)
+    except Exception as cause:
+        logger.error("Can not convert {value}", value=value, cause=cause)
+    logger.error("Can not convert {value} of type {type}", value=value, type=value.__class__)
+
+
+def _delta(value):
+    if value.tzinfo is None:
+        return value - NAIVE_EPOCH
+    return value - DATETIME_EPOCH
+
+
+def _datetime2unix(value):
+    return _delta(value).total_seconds()
+
+
+def _date2unix(value):
+    return float((value.toordinal() - EPOCH_ORDINAL) * 86400)
+
+
+def _datetime2milli(value):
+    diff = _delta(value)
+    return diff.days * 86_400_000 + diff.seconds * 1000 + diff.microseconds // 1000
+
+
+def _date2milli(value):
+    return (value.toordinal() - EPOCH_ORDINAL) * 86_400_000
+
+
+def _datetime2iso(value):
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat() + "Z"
+
+
+def _Date2iso(value):
+    return _datetime2iso(NAIVE_EPOCH + timedelta(seconds=value.unix))
+
+
+def _convert_numpy(value, time_format):
+    import numpy
+
+    if numpy.isnat(value):
+        return None
+    micros = int(value.astype("datetime64[us]").astype("int64"))
+    if time_format == UNIX:
+        return micros / 1_000_000
+    elif time_format == MILLI:
+        return micros // 1000
+    return _datetime2iso(NAIVE_EPOCH + timedelta(microseconds=micros))
+
+
+def _convert_array(values, time_format):
+    import numpy
+
+    missing = numpy.isnat(values).tolist()
+    micros = values.astype("datetime64[us]")
+    if time_format == ISO:
+        # SAME AS datetime.isoformat(): MICROSECONDS, LEFT OFF WHEN THEY ARE ZERO
+        output = [
+            (v[:-7] if v.endswith(".000000") else v) + "Z" for v in numpy.datetime_as_string(micros).tolist()
+        ]
+    elif time_format == MILLI:
+        output = (micros.astype("int64") // 1000).tolist()
+    else:
+        output = (micros.astype("int64") / 1_000_000).tolist()
+    return [None if m else v for m, v in zip(missing, output)]
+
+
+EPOCH_ORDINAL = DATE_EPOCH.toordinal()
+
+_unix = {datetime: _datetime2unix, date: _date2unix, Date: lambda value: value.unix}
+_milli = {datetime: _datetime2milli, date: _date2milli, Date: lambda value: value.milli}
+_iso = {datetime: _datetime2iso, date: date.isoformat, Date: _Date2iso}
+_lookups = {UNIX: _unix, MILLI: _milli, ISO: _iso}
+_converters = {UNIX: datetime2unix, MILLI: datetime2milli, ISO: datetime2iso}
@@ -0,0 +1,166 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# OPT-IN TRACER FOR THE SLOW PATHS OF THE ENCODERS
+#
+#     with SlowPathTracer() as tracer:
+#         run_the_workload()
+#     logger.info("{summary}", summary=tracer.summary())
+#
+# WHILE NO TRACER IS ACTIVE THE COST IS ONE GLOBAL LOOKUP, AND ONLY ON THE SLOW PATHS
+#
+import threading
+from time import perf_counter
+
+# BRANCHES OF Scrubber._scrub(), FOR TYPES WITHOUT A REGISTERED SCRUBBER
+STR_SUBCLASS = "str subclass"
+JSON_METHOD = "__json__"
+DATA_METHOD = "__data__"
+EXCEPTION = "exception"
+NUMBER = "number"
+NUMPY = "numpy"
+CODE = "code or frame"
+CALLABLE = "callable"
+DATA_OBJECT = "DataObject"
+
+# FALLBACKS OF THE ENCODERS AND DECODERS
+PYPY_FALLBACK = "pypy_json_encode"  # THE C ENCODER FAILED
+PRETTY_FALLBACK = "pretty_json"  # pypy_json_encode FAILED
+STDLIB_FALLBACK = "stdlib"  # THE FAST BACKEND COULD NOT HANDLE THE VALUE
+
+ADVICE = {
+    STR_SUBCLASS: "pass str(value), or register {type} in Scrubber.scrubbers",
+    JSON_METHOD: "__json__() output is decoded and scrubbed again; return data from __data__() instead",
+    DATA_METHOD: "register {type} in Scrubber.scrubbers to skip the hasattr() chain",
+    EXCEPTION: "convert {type} to a dict before encoding",
+    NUMBER: "register {type} in Scrubber.scrubbers",
+    NUMPY: "convert {type} with .tolist() before encoding",
+    CODE: "remove {type} from the data",
+    CALLABLE: "remove {type} from the data",
+    DATA_OBJECT: "add __data__() to {type}, or register it in Scrubber.scrubbers",
+    PYPY_FALLBACK: "the C encoder failed on {type}; check what the Scrubber emits for it",
+    PRETTY_FALLBACK: "{type} can not be encoded; fix the value",
+    STDLIB_FALLBACK: "the fast backend can not handle {type} (big integers, NaN, lone surrogates, ...)",
+}
+
+active = None  # THE SlowPathTracer IN USE, IF ANY
+
+
+class SlowPathTracer:
+    """
+    COUNT THE VALUES THAT REACH EACH SLOW BRANCH, BY TYPE, AND TIME A SAMPLE OF THEM
+    """
+
+    def __init__(self, every=100):
+        """
+        :param every: TIME ONE OF EVERY every HITS, PER THREAD (1 TO TIME THEM ALL); EVERY HIT IS COUNTED
+        """
+        self.every = max(1, int(every))
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.all_stats = []  # ONE _Stats PER THREAD, EACH CHANGED ONLY BY ITS OWN THREAD
+
+    def start(self):
+        global active
+        active = self
+        return self
+
+    def stop(self):
+        global active
+        if active is self:
+            active = None
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _stats(self):
+        stats = getattr(self.local, "stats", None)
+        if stats is None:
+            stats = self.local.stats = _Stats(self.every)
+            with self.lock:
+                self.all_stats.append(stats)
+        return stats
+
+    def trace(self, type_, function, *args):
+        """
+        :param type_: THE TYPE OF THE VALUE ON THE SLOW PATH
+        :param function: RETURNS (BRANCH, RESULT)
+        :return: RESULT
+        """
+        stats = self._stats()
+        stats.countdown -= 1
+        if stats.countdown > 0:
+            branch, result = function(*args)
+            key = branch, type_
+            stats.counts[key] = stats.counts.get(key, 0) + 1
+            return result
+
+        stats.countdown = self.every
+        start = perf_counter()
+        branch, result = function(*args)
+        duration = perf_counter() - start
+        key = branch, type_
+        stats.counts[key] = stats.counts.get(key, 0) + 1
+        timed, seconds = stats.timed.get(key, (0, 0.0))
+        stats.timed[key] = timed + 1, seconds + duration
+        return result
+
+    def summary(self):
+        """
+        :return: LIST OF {branch, type, count, timed, seconds, advice}, MOST EXPENSIVE FIRST
+                 seconds IS ESTIMATED FROM THE TIMED SAMPLE, AND INCLUDES NESTED VALUES
+        """
+        counts = {}
+        timed = {}
+        with self.lock:
+            all_stats = list(self.all_stats)
+        for stats in all_stats:
+            for key, count in list(stats.counts.items()):
+                counts[key] = counts.get(key, 0) + count
+            for key, (n, seconds) in list(stats.timed.items()):
+                t_n, t_seconds = timed.get(key, (0, 0.0))
+                timed[key] = t_n + n, t_seconds + seconds
+
+        output = []
+        for (branch, type_), count in counts.items():
+            n, seconds = timed.get((branch, type_), (0, 0.0))
+            type_name = f"{type_.__module__}.{type_.__qualname__}"
+            output.append({
+                "branch": branch,
+                "type": type_name,
+                "count": count,
+                "timed": n,
+                "seconds": seconds * count / n if n else None,
+                "advice": ADVICE[branch].format(type=type_name),
+            })
+        output.sort(key=lambda r: (-(r["seconds"] or 0), -r["count"]))
+        return output
+
+
+class _Stats:
+    __slots__ = ["countdown", "counts", "timed"]
+
+    def __init__(self, every):
+        self.countdown = every
+        self.counts = {}  # (BRANCH, TYPE) -> COUNT
+        self.timed = {}  # (BRANCH, TYPE) -> (COUNT, SECONDS)
+
+
+def traced(branch, type_, function, *args):
+    """
+    CALL function(*args), AND RECORD IT UNDER branch IF A TRACER IS ACTIVE
+    """
+    tracer = active
+    if tracer is None:
+        return function(*args)
+    return tracer.trace(type_, lambda: (branch, function(*args)))
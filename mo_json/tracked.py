@@ -0,0 +1,169 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# LONG-LIVED DOCUMENTS THAT ARE RE-ENCODED AFTER SMALL CHANGES
+#
+#     doc = TrackedDocument(state)
+#     doc["session.user"] = "kyle"   # MARKS session.user, AND ITS PARENTS, DIRTY
+#     value2json(doc)                # RE-ENCODES ONLY THE DIRTY PATH
+#
+from mo_dots import from_data, split_field, to_data
+from mo_imports import delay_import
+
+from mo_json.backends import encode
+from mo_json.scrubber import shared_scrubber
+from mo_json.utils import quote
+
+logger = delay_import("mo_logs.logger")
+
+
+class TrackedDocument:
+    """
+    WRAP A DOCUMENT, AND KEEP THE ENCODED JSON OF EVERY OBJECT IN IT
+    CHANGES MUST GO THROUGH THIS WRAPPER (OR BE REPORTED WITH touch()) SO THE STALE FRAGMENTS ARE DROPPED
+    LISTS ARE ENCODED AS A WHOLE; PATHS DO NOT GO INTO LISTS
+    """
+
+    __slots__ = ["value", "root", "scrubber"]
+
+    def __init__(self, value=None):
+        """
+        :param value: THE DOCUMENT (dict OR Data); IT IS NOT COPIED
+        """
+        value = from_data(value)
+        if value is None:
+            value = {}
+        self.value = value
+        self.root = _Node()
+        self.scrubber = shared_scrubber()
+
+    def __getitem__(self, path):
+        """
+        :param path: DOT-DELIMITED PATH
+        :return: THE VALUE AT path; CALL touch(path) AFTER CHANGING IT IN PLACE
+        """
+        value = self.value
+        for step in split_field(path):
+            value = from_data(value)
+            if value.__class__ is not dict:
+                return to_data(None)
+            value = value.get(step)
+        return to_data(value)
+
+    def __setitem__(self, path, value):
+        parent, node, last = self._dirty_parent(path)
+        if last is None:
+            self.value = from_data(value)
+            self.root = _Node()
+            return
+        value = from_data(value)
+        if value is None:
+            parent.pop(last, None)
+        else:
+            parent[last] = value
+        node.children.pop(last, None)
+
+    def __delitem__(self, path):
+        self[path] = None
+
+    def touch(self, path="."):
+        """
+        MARK path (AND EVERYTHING UNDER IT) DIRTY, AFTER IT WAS CHANGED IN PLACE
+        """
+        _, node, last = self._dirty_parent(path, create=False)
+        if last is None:
+            self.root = _Node()
+        elif node is not None:
+            node.children.pop(last, None)
+
+    def _dirty_parent(self, path, create=True):
+        """
+        :return: (PARENT dict, PARENT _Node, LAST STEP), WITH EVERY _Node ON THE PATH MARKED DIRTY
+        """
+        steps = split_field(path)
+        node = self.root
+        node.json = None
+        if not steps:
+            return None, None, None
+        parent = self.value
+        if parent.__class__ is not dict:
+            if not create:
+                return None, None, steps[-1]
+            parent = self.value = {}
+        for step in steps[:-1]:
+            child = from_data(parent.get(step))
+            if child.__class__ is not dict:
+                if not create:
+                    return None, None, steps[-1]
+                child = parent[step] = {}
+            parent = child
+            node = node.child(step)
+            node.json = None
+        return parent, node, steps[-1]
+
+    def to_json(self):
+        """
+        :return: THE SAME JSON AS value2json(), SPLICED FROM THE CACHED FRAGMENTS
+        """
+        return self._encode(self.value, self.root) or "null"
+
+    def _encode(self, value, node):
+        """
+        RETURN THE JSON FOR value, OR "" IF value IS MISSING
+        """
+        json = node.json
+        if json is not None:
+            return json
+        value = from_data(value)
+        if value.__class__ is dict:
+            children = node.children
+            parts = []
+            for k in sorted(value.keys()):
+                if not isinstance(k, str):
+                    logger.error("keys must be strings")
+                child = children.get(k)
+                if child is None:
+                    child = children[k] = _Node()
+                fragment = self._encode(value[k], child)
+                if fragment:
+                    parts.append(quote(k) + ":" + fragment)
+            if len(children) > len(value):
+                # FORGET REMOVED PROPERTIES
+                for k in [k for k in children if k not in value]:
+                    del children[k]
+            json = "{" + ",".join(parts) + "}"
+        else:
+            scrubbed = self.scrubber.scrub(value)
+            json = "" if scrubbed is None else encode(scrubbed)
+        node.json = json
+        return json
+
+    def __data__(self):
+        return self.value
+
+    def __repr__(self):
+        return f"TrackedDocument({self.to_json()})"
+
+
+class _Node:
+    """
+    CACHED JSON FOR ONE VALUE IN THE DOCUMENT, AND THE NODES OF ITS PROPERTIES
+    """
+
+    __slots__ = ["json", "children"]
+
+    def __init__(self):
+        self.json = None  # None MEANS DIRTY
+        self.children = {}
+
+    def child(self, name):
+        output = self.children.get(name)
+        if output is None:
+            output = self.children[name] = _Node()
+        return output
@@ -0,0 +1,234 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from mo_dots import Data, DataObject, from_data, null_types, utils
+from mo_future import sort_using_key
+from mo_math import is_number
+
+from mo_json.binary import BINARY_TEXT
+from mo_json.scrubber import DECIMAL_INT, _keep_whitespace, shared_scrubber, trim_whitespace
+from mo_json.temporal import UNIX
+from mo_json.utils import quote
+
+TRUNCATED = "..."
+SHORT_STRING = 40  # NOT WORTH CUTTING TO FIT max_bytes; THE MARKER IS ABOUT AS LONG
+
+
+class Budget:
+    """
+    LIMITS FOR ENCODING VALUES OF UNKNOWN SIZE, LIKE EXCEPTION PARAMETERS
+    """
+
+    __slots__ = ["max_bytes", "max_depth", "max_items", "max_string"]
+
+    def __init__(self, max_bytes=10_000, max_depth=10, max_items=100, max_string=1_000):
+        """
+        :param max_bytes: STOP WALKING ONCE THIS MANY CHARACTERS ARE EMITTED; THE LAST STRING IS CUT TO FIT
+                          (IT, AND THE CLOSING MARKERS, MAY ADD A FEW DOZEN MORE)
+        :param max_depth: CONTAINERS DEEPER THAN THIS ARE REPLACED WITH A MARKER
+        :param max_items: MAXIMUM NUMBER OF LIST ITEMS, OR OBJECT PROPERTIES, VISITED PER CONTAINER
+        :param max_string: STRINGS ARE CUT TO THIS MANY CHARACTERS
+        """
+        self.max_bytes = max_bytes
+        self.max_depth = max_depth
+        self.max_items = max_items
+        self.max_string = max_string
+
+
+DEFAULT_BUDGET = Budget()
+
+
+def truncated_json(
+    value,
+    budget=DEFAULT_BUDGET,
+    keep_whitespace=True,
+    time_format=UNIX,
+    decimal_policy=DECIMAL_INT,
+    binary_policy=BINARY_TEXT,
+):
+    """
+    ENCODE value AS VALID JSON, BUT STOP WALKING THE STRUCTURE WHEN THE budget IS SPENT
+    WHAT IS NOT EMITTED IS REPLACED WITH "..." MARKERS
+    :param value: THE VALUE TO TURN INTO JSON
+    :param budget: Budget WITH THE LIMITS
+    :param keep_whitespace: False TO strip() THE WHITESPACE IN THE VALUES
+    :param time_format: HOW TIMES ARE EMITTED: UNIX (SECONDS), MILLI OR ISO
+    :param decimal_policy: HOW Decimal IS EMITTED: DECIMAL_INT, DECIMAL_FLOAT OR DECIMAL_STRING
+    :param binary_policy: HOW BINARY IS EMITTED: BINARY_TEXT, BINARY_BASE64 OR BINARY_BASE85
+    :return: JSON STRING
+    """
+    scrub_text = _keep_whitespace if keep_whitespace else trim_whitespace
+    scrubber = shared_scrubber(
+        scrub_text=scrub_text, time_format=time_format, decimal_policy=decimal_policy, binary_policy=binary_policy,
+    )
+    encoder = _TruncatingEncoder(budget, scrub_text, scrubber)
+    output = encoder.encode(value, 0)
+    if output is None:
+        return "null"
+    return "".join(encoder.acc)
+
+
+class _TruncatingEncoder:
+    """
+    STATE FOR ONE CALL TO truncated_json()
+    """
+
+    __slots__ = ["budget", "scrubber", "scrub_text", "acc", "size"]
+
+    def __init__(self, budget, scrub_text, scrubber):
+        self.budget = budget
+        self.scrubber = scrubber
+        self.scrub_text = scrub_text
+        self.acc = []
+        self.size = 0
+
+    def emit(self, text):
+        self.acc.append(text)
+        self.size += len(text)
+
+    @property
+    def exhausted(self):
+        return self.size >= self.budget.max_bytes
+
+    def encode(self, value, depth):
+        """
+        APPEND THE JSON FOR value, RETURN None IF value IS MISSING (AND NOTHING WAS APPENDED)
+        """
+        while isinstance(value, (DataObject, Data)):
+            value = from_data(value)
+
+        type_ = value.__class__
+        if type_ in null_types:
+            return None
+        elif type_ is str:
+            return self._text(value)
+        elif type_ in utils._data_types:
+            return self._data(value, depth)
+        elif type_ in utils._many_types:
+            return self._many(value, depth)
+
+        scrub = self.scrubber.scrubbers.get(type_)
+        if scrub:
+            value = scrub(value, None, [])
+            if value.__class__ is dict:
+                # TAGGED VALUE, LIKE {"$base64": ...}
+                return self._data(value, depth)
+            return self._primitive(value)
+        elif hasattr(value, "__json__"):
+            return self.encode(self.scrubber.scrub(value), depth)
+        elif hasattr(value, "__data__"):
+            return self.encode(value.__data__(), depth)
+        elif (
+            isinstance(value, (str, Exception))
+            or is_number(value)
+            or hasattr(value, "__call__")
+            or hasattr(value, "co_code")
+            or hasattr(value, "f_locals")
+        ):
+            # THE Scrubber TURNS THESE INTO SMALL VALUES
+            return self.encode(self.scrubber.scrub(value), depth)
+        else:
+            # WALK THE OBJECT ATTRIBUTES, LIKE THE Scrubber DOES, BUT WITHIN BUDGET
+            return self._data(DataObject(value), depth)
+
+    def _primitive(self, value):
+        if value is None:
+            return None
+        elif value is True:
+            self.emit("true")
+        elif value is False:
+            self.emit("false")
+        elif value.__class__ is str:
+            return self._text(value)
+        elif value.__class__ is float:
+            self.emit(float.__repr__(value))
+        else:
+            self.emit(str(value))
+        return True
+
+    def _text(self, value):
+        budget = self.budget
+        max_string = min(budget.max_string, max(budget.max_bytes - self.size, SHORT_STRING))
+        if len(value) > max_string:
+            cut = self.scrub_text(value[:max_string]) or ""
+            self.emit(quote(f"{cut}{TRUNCATED} ({len(value) - max_string} more characters)"))
+            return True
+        value = self.scrub_text(value)
+        if value is None:
+            return None
+        self.emit(quote(value))
+        return True
+
+    def _many(self, value, depth):
+        if depth >= self.budget.max_depth:
+            self.emit(quote("[" + TRUNCATED + "]"))
+            return True
+        max_items = self.budget.max_items
+        sep = "["
+        count = 0
+        for v in value:
+            if count >= max_items or self.exhausted:
+                self.emit(sep)
+                self.emit(_more(value, count))
+                break
+            self.emit(sep)
+            sep = ","
+            count += 1
+            if self.encode(v, depth + 1) is None:
+                self.emit("null")
+        else:
+            if sep == "[":
+                self.emit("[")
+        self.emit("]")
+        return True
+
+    def _data(self, value, depth):
+        if depth >= self.budget.max_depth:
+            self.emit(quote("{" + TRUNCATED + "}"))
+            return True
+        max_items = self.budget.max_items
+        items = value.items()
+        if value.__class__ is not DataObject and len(value) <= max_items:
+            # SMALL ENOUGH TO MATCH THE SORTED KEYS OF value2json()
+            items = sort_using_key(items, lambda r: r[0])
+        sep = "{"
+        count = 0
+        for k, v in items:
+            if count >= max_items or self.exhausted:
+                self.emit(sep)
+                self.emit(quote(TRUNCATED))
+                self.emit(":")
+                self.emit(_more(value, count))
+                sep = ","
+                break
+            count += 1
+            if not isinstance(k, str):
+                k = str(k)
+            mark = len(self.acc)
+            size = self.size
+            self.emit(sep)
+            self.emit(quote(k))
+            self.emit(":")
+            if self.encode(v, depth + 1) is None:
+                # MISSING VALUES ARE NOT EMITTED
+                del self.acc[mark:]
+                self.size = size
+            else:
+                sep = ","
+        if sep == "{":
+            self.emit("{")
+        self.emit("}")
+        return True
+
+
+def _more(value, count):
+    try:
+        return quote(f"{TRUNCATED} ({len(value) - count} more)")
+    except Exception:
+        return quote(TRUNCATED)
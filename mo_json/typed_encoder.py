@@ -35,7 +35,7 @@ from mo_logs import Log
 from mo_times import Date, Duration
 
 from mo_json.encoder import COLON, COMMA, UnicodeBuilder, json_encoder
-from mo_json.scrubber import datetime2unix
+from mo_json.temporal import ISO, UNIX, datetime2iso, time_converter
 from mo_json.typed_object import TypedObject
 from mo_json.types import (
     BOOLEAN,
@@ -160,19 +160,25 @@ def _detype_value(value):
         return value
 
 
-def encode(value):
+def encode(value, time_format=UNIX):
+    """
+    :param value: THE DATA STRUCTURE TO ENCODE
+    :param time_format: HOW TIMES ARE EMITTED: UNIX (SECONDS), MILLI OR ISO (SEE mo_json.temporal)
+    :return: TYPED JSON
+    """
     buffer = UnicodeBuilder(1024)
-    typed_encode(value, sub_schema={}, path=[], net_new_properties=[], buffer=buffer)
+    typed_encode(value, sub_schema={}, path=[], net_new_properties=[], buffer=buffer, time_format=time_format)
     return buffer.build()
 
 
-def typed_encode(value, sub_schema, path, net_new_properties, buffer):
+def typed_encode(value, sub_schema, path, net_new_properties, buffer, time_format=UNIX):
     """
     :param value: THE DATA STRUCTURE TO ENCODE
     :param sub_schema: dict FROM PATH TO Column DESCRIBING THE TYPE
     :param path: list OF CURRENT PATH
     :param net_new_properties: list FOR ADDING NEW PROPERTIES NOT FOUND IN sub_schema
     :param buffer: UnicodeBuilder OBJECT
+    :param time_format: HOW TIMES ARE EMITTED: UNIX (SECONDS), MILLI OR ISO (SEE mo_json.temporal)
     :return:
     """
     try:
@@ -230,7 +236,7 @@ def typed_encode(value, sub_schema, path, net_new_properties, buffer):
                     append(buffer, QUOTED_ARRAY_KEY)
                     append(buffer, "[")
                     _dict2json(
-                        value, sub_schema[ARRAY_KEY], path + [ARRAY_KEY], net_new_properties, buffer,
+                        value, sub_schema[ARRAY_KEY], path + [ARRAY_KEY], net_new_properties, buffer, time_format,
                     )
                     append(buffer, "]" + COMMA)
                     append(buffer, QUOTED_EXISTS_KEY)
@@ -252,7 +258,7 @@ def typed_encode(value, sub_schema, path, net_new_properties, buffer):
                     net_new_properties.append(path + [EXISTS_KEY])
 
                 if value:
-                    _dict2json(value, sub_schema, path, net_new_properties, buffer)
+                    _dict2json(value, sub_schema, path, net_new_properties, buffer, time_format)
                 else:
                     append(buffer, "{")
                     append(buffer, QUOTED_EXISTS_KEY)
@@ -301,12 +307,12 @@ def typed_encode(value, sub_schema, path, net_new_properties, buffer):
                         append(buffer, "{")
                         append(buffer, QUOTED_ARRAY_KEY)
                         _list2json(
-                            value, sub_schema[ARRAY_KEY], path + [ARRAY_KEY], net_new_properties, buffer,
+                            value, sub_schema[ARRAY_KEY], path + [ARRAY_KEY], net_new_properties, buffer, time_format,
                         )
                         append(buffer, "}")
                     else:
                         # NO NEED TO NEST, SO DO NOT DO IT
-                        typed_encode(value[0], sub_schema, path, net_new_properties, buffer)
+                        typed_encode(value[0], sub_schema, path, net_new_properties, buffer, time_format)
                 else:
                     if ARRAY_KEY not in sub_schema:
                         sub_schema[ARRAY_KEY] = {}
@@ -314,20 +320,20 @@ def typed_encode(value, sub_schema, path, net_new_properties, buffer):
                     append(buffer, "{")
                     append(buffer, QUOTED_ARRAY_KEY)
                     _list2json(
-                        value, sub_schema[ARRAY_KEY], path + [ARRAY_KEY], net_new_properties, buffer,
+                        value, sub_schema[ARRAY_KEY], path + [ARRAY_KEY], net_new_properties, buffer, time_format,
                     )
                     append(buffer, "}")
             else:
                 # ALLOW PRIMITIVE MULTIVALUES
                 value = [v for v in value if v != None]
-                types = list(set(python_type_to_jx_type_key[v.__class__] for v in value))
+                types = list(set(_multivalue_type_key(v.__class__, time_format) for v in value))
                 if len(types) == 0:  # HANDLE LISTS WITH Nones IN THEM
                     append(buffer, "{")
                     append(buffer, QUOTED_ARRAY_KEY)
                     append(buffer, "[]}")
                 elif len(types) > 1:
                     _list2json(
-                        value, sub_schema, path + [ARRAY_KEY], net_new_properties, buffer,
+                        value, sub_schema, path + [ARRAY_KEY], net_new_properties, buffer, time_format,
                     )
                 else:
                     element_type = types[0]
@@ -338,33 +344,31 @@ def typed_encode(value, sub_schema, path, net_new_properties, buffer):
                     append(buffer, quote(element_type))
                     append(buffer, COLON)
                     _multivalue2json(
-                        value, sub_schema[element_type], path + [element_type], net_new_properties, buffer,
+                        value,
+                        sub_schema[element_type],
+                        path + [element_type],
+                        net_new_properties,
+                        buffer,
+                        time_format,
                     )
                     append(buffer, "}")
-        elif _type is date:
-            if NUMBER_KEY not in sub_schema:
-                sub_schema[NUMBER_KEY] = True
-                net_new_properties.append(path + [NUMBER_KEY])
-            append(buffer, "{")
-            append(buffer, QUOTED_NUMBER_KEY)
-            append(buffer, float2json(datetime2unix(value)))
-            append(buffer, "}")
-        elif _type is datetime:
-            if NUMBER_KEY not in sub_schema:
-                sub_schema[NUMBER_KEY] = True
-                net_new_properties.append(path + [NUMBER_KEY])
-            append(buffer, "{")
-            append(buffer, QUOTED_NUMBER_KEY)
-            append(buffer, float2json(datetime2unix(value)))
-            append(buffer, "}")
-        elif _type is Date:
-            if NUMBER_KEY not in sub_schema:
-                sub_schema[NUMBER_KEY] = True
-                net_new_properties.append(path + [NUMBER_KEY])
-            append(buffer, "{")
-            append(buffer, QUOTED_NUMBER_KEY)
-            append(buffer, float2json(value.unix))
-            append(buffer, "}")
+        elif _type in (date, datetime, Date):
+            if time_format == ISO:
+                if STRING_KEY not in sub_schema:
+                    sub_schema[STRING_KEY] = True
+                    net_new_properties.append(path + [STRING_KEY])
+                append(buffer, "{")
+                append(buffer, QUOTED_STRING_KEY)
+                append(buffer, quote(datetime2iso(value)))
+                append(buffer, "}")
+            else:
+                if NUMBER_KEY not in sub_schema:
+                    sub_schema[NUMBER_KEY] = True
+                    net_new_properties.append(path + [NUMBER_KEY])
+                append(buffer, "{")
+                append(buffer, QUOTED_NUMBER_KEY)
+                append(buffer, float2json(time_converter(time_format)(value)))
+                append(buffer, "}")
         elif _type is timedelta:
             if NUMBER_KEY not in sub_schema:
                 sub_schema[NUMBER_KEY] = True
@@ -384,7 +388,7 @@ def typed_encode(value, sub_schema, path, net_new_properties, buffer):
         elif _type is NullType:
             append(buffer, "null")
         elif hasattr(value, "__data__"):
-            typed_encode(value.__data__(), sub_schema, path, net_new_properties, buffer)
+            typed_encode(value.__data__(), sub_schema, path, net_new_properties, buffer, time_format)
         elif hasattr(value, "__iter__"):
             if ARRAY_KEY not in sub_schema:
                 sub_schema[ARRAY_KEY] = {}
@@ -393,7 +397,7 @@ def typed_encode(value, sub_schema, path, net_new_properties, buffer):
             append(buffer, "{")
             append(buffer, QUOTED_ARRAY_KEY)
             _iter2json(
-                value, sub_schema[ARRAY_KEY], path + [ARRAY_KEY], net_new_properties, buffer,
+                value, sub_schema[ARRAY_KEY], path + [ARRAY_KEY], net_new_properties, buffer, time_format,
             )
             append(buffer, "}")
         else:
@@ -406,7 +410,7 @@ def typed_encode(value, sub_schema, path, net_new_properties, buffer):
         Log.error(str(repr(value)) + " is not JSON serializable", cause=e)
 
 
-def _list2json(value, sub_schema, path, net_new_properties, buffer):
+def _list2json(value, sub_schema, path, net_new_properties, buffer, time_format):
     if not value:
         append(buffer, "[]")
     else:
@@ -414,35 +418,48 @@ def _list2json(value, sub_schema, path, net_new_properties, buffer):
         for v in value:
             append(buffer, sep)
             sep = COMMA
-            typed_encode(v, sub_schema, path, net_new_properties, buffer)
+            typed_encode(v, sub_schema, path, net_new_properties, buffer, time_format)
         append(buffer, "]")
         # append(buffer, COMMA)
         # append(buffer, QUOTED_EXISTS_KEY)
         # append(buffer, str(len(value)))
 
 
-def _multivalue2json(value, sub_schema, path, net_new_properties, buffer):
+def _multivalue_type_key(_type, time_format):
+    # ISO TIMES ARE STRINGS, SO A LIST OF THEM HAS THE SAME TYPE AS ONE OF THEM
+    if time_format == ISO and _type in (date, datetime, Date):
+        return STRING_KEY
+    return python_type_to_jx_type_key[_type]
+
+
+def _multivalue2json(value, sub_schema, path, net_new_properties, buffer, time_format):
     if not value:
         append(buffer, "[]")
     elif len(value) == 1:
-        append(buffer, json_encoder(value[0]))
+        append(buffer, _primitive2json(value[0], time_format))
     else:
         sep = "["
         for v in value:
             append(buffer, sep)
             sep = COMMA
-            append(buffer, json_encoder(v))
+            append(buffer, _primitive2json(v, time_format))
         append(buffer, "]")
 
 
-def _iter2json(value, sub_schema, path, net_new_properties, buffer):
+def _primitive2json(value, time_format):
+    if value.__class__ in (date, datetime, Date):
+        value = time_converter(time_format)(value)
+    return json_encoder(value)
+
+
+def _iter2json(value, sub_schema, path, net_new_properties, buffer, time_format):
     append(buffer, "[")
     sep = ""
     count = 0
     for v in value:
         append(buffer, sep)
         sep = COMMA
-        typed_encode(v, sub_schema, path, net_new_properties, buffer)
+        typed_encode(v, sub_schema, path, net_new_properties, buffer, time_format)
         count += 1
     append(buffer, "]")
     append(buffer, COMMA)
@@ -450,7 +467,7 @@ def _iter2json(value, sub_schema, path, net_new_properties, buffer):
     append(buffer, str(count))
 
 
-def _dict2json(value, sub_schema, path, net_new_properties, buffer):
+def _dict2json(value, sub_schema, path, net_new_properties, buffer, time_format):
     prefix = "{"
     for k, v in sort_using_key(value.items(), lambda r: r[0]):
         if v == None or v == "":
@@ -466,7 +483,7 @@ def _dict2json(value, sub_schema, path, net_new_properties, buffer):
             net_new_properties.append(path + [k])
         append(buffer, quote(encode_property(k)))
         append(buffer, COLON)
-        typed_encode(v, sub_schema[k], path + [k], net_new_properties, buffer)
+        typed_encode(v, sub_schema[k], path + [k], net_new_properties, buffer, time_format)
     if prefix is COMMA:
         append(buffer, COMMA)
         append(buffer, QUOTED_EXISTS_KEY)
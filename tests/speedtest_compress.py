@@ -0,0 +1,69 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# COMPARE NDJSON-THEN-GZIP WITH THE PARALLEL GzipWriter, FOR EACH THREAD COUNT
+#
+import gzip
+import os
+import time
+from io import BytesIO
+
+from mo_logs import Log
+
+from mo_json import value2json
+from mo_json.compress import GzipWriter
+from tests.speedtest_json import NESTED
+from tests.utils import list2tab
+
+NUM_DOCS = 100000
+
+
+def serial(docs):
+    text = "".join(value2json(d) + "\n" for d in docs)
+    return gzip.compress(text.encode("utf8"), compresslevel=6)
+
+
+def parallel(docs, threads):
+    output = BytesIO()
+    with GzipWriter(output, threads=threads) as writer:
+        writer.extend(docs)
+    return output.getvalue()
+
+
+def main():
+    try:
+        Log.start()
+        docs = [NESTED[0]] * NUM_DOCS
+        results = []
+
+        def run(description, method, threads):
+            start = time.time()
+            size = len(method())
+            duration = time.time() - start
+            results.append({
+                "description": description,
+                "threads": threads,
+                "time": round(duration, 3),
+                "docs_per_second": int(NUM_DOCS / duration),
+                "compressed_bytes": size,
+            })
+
+        run("encode, then gzip", lambda: serial(docs), 1)
+        threads = 1
+        while threads <= (os.cpu_count() or 1):
+            run("GzipWriter", lambda: parallel(docs, threads), threads)
+            threads *= 2
+
+        Log.note("\n{{summary}}", summary=list2tab(results))
+    finally:
+        Log.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# COMPARE json2value(..., flexible=True), WHICH STRIPS COMMENTS AND TRAILING
+# COMMAS FOR THE C DECODER, WITH hjson, ON JSON WRITTEN LIKE A CONFIG FILE,
+# AND ON PLAIN JSON
+#
+#     python -m tests.speedtest_flexible [KILOBYTES]
+#
+import sys
+import time
+
+import hjson
+from mo_logs import Log
+
+from mo_json import json2value, value2json
+from tests.utils import list2tab
+
+SECTION = """
+    // settings for service %d
+    "service_%d": {
+        "url": "http://example.com/api#v1",  # NOT A COMMENT IN THE STRING
+        "timeout": 30,
+        /* retry with
+           back-off */
+        "retries": [1, 2, 4, 8,],
+        "name": "say \\"hello\\"",
+    },
+"""
+
+
+def make_config(kilobytes):
+    size = len(SECTION) + 10
+    return "{" + "".join(SECTION % (i, i) for i in range(kilobytes * 1000 // size)) + "}"
+
+
+def main(kilobytes):
+    try:
+        Log.start()
+        config = make_config(kilobytes)
+        results = []
+        for doc_name, text in [("config", config), ("plain", value2json(hjson.loads(config)))]:
+            expected = None
+            for name, method in [("hjson", hjson.loads), ("flexible=True", lambda t: json2value(t, flexible=True))]:
+                start = time.time()
+                result = method(text)
+                duration = time.time() - start
+                if expected is None:
+                    expected = result
+                elif result != expected:
+                    Log.error("{{name}} does not match", name=name)
+                results.append({
+                    "document": doc_name,
+                    "method": name,
+                    "seconds": round(duration, 4),
+                    "MB/s": round(len(text) / duration / 1_000_000, 2),
+                })
+        Log.note("\n{{summary}}", summary=list2tab(results))
+    finally:
+        Log.stop()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
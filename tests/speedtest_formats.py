@@ -0,0 +1,60 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# COMPARE SIZE AND SPEED OF value2json() WITH THE PURE-PYTHON MessagePack AND CBOR ENCODERS
+#
+import time
+
+from mo_logs import Log
+
+from mo_json import cbor2value, json2value, msgpack2value, value2cbor, value2json, value2msgpack
+from tests import speedtest_json
+from tests.utils import list2tab
+
+FORMATS = [
+    ("json", lambda v: value2json(v).encode("utf8"), lambda b: json2value(b.decode("utf8"))),
+    ("msgpack", value2msgpack, msgpack2value),
+    ("cbor", value2cbor, cbor2value),
+]
+
+
+def main():
+    try:
+        Log.start()
+        results = []
+        for case in ["SIMPLE", "NESTED", "INTEGERS", "RECORDS"]:
+            data, count = getattr(speedtest_json, case)
+            count = max(1, count // 10)
+            for name, encode, decode in FORMATS:
+                start = time.time()
+                for _ in range(count):
+                    encoded = encode(data)
+                encode_time = time.time() - start
+
+                start = time.time()
+                for _ in range(count):
+                    decode(encoded)
+                decode_time = time.time() - start
+
+                results.append({
+                    "case": case,
+                    "format": name,
+                    "count": count,
+                    "bytes": len(encoded),
+                    "encode": round(encode_time, 3),
+                    "decode": round(decode_time, 3),
+                })
+
+        Log.note("\n{{summary}}", summary=list2tab(results))
+    finally:
+        Log.stop()
+
+
+if __name__ == "__main__":
+    main()
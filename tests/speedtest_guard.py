@@ -0,0 +1,116 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# COMPARE THE COST OF check_limits() WITH THE OLD PER-CHARACTER DEPTH CHECK,
+# AND WITH DECODING, FOR A NORMAL DOCUMENT AND FOR HOSTILE ONES
+#
+#     python -m tests.speedtest_guard [MEGABYTES]
+#
+import sys
+import time
+
+from mo_logs import Log
+
+from mo_json import value2json
+from mo_json.decoder import json_decoder
+from mo_json.guard import LimitExceeded, Limits, check_limits
+from tests.utils import list2tab
+
+LIMITS = Limits(max_depth=64, max_string=1_000_000, max_elements=100_000_000)
+
+
+def make_document(megabytes):
+    record = {"name": 'say "hello"', "tags": ["a", "b", None], "child": {"value": 1.5, "list": [{"x": 1}, {"y": [2]}]}}
+    size = len(value2json(record)) + 1
+    return value2json([record] * (megabytes * 1_000_000 // size))
+
+
+def per_character(json, limit=64):
+    # THE ORIGINAL check_depth(), WITH A LIST BIG ENOUGH FOR THE WHOLE DOCUMENT
+    l = len(json)
+    expecting = ["{"] * (l + 1)
+    e = -1
+    i = 0
+    while i < l:
+        c = json[i]
+        if c == '"':
+            i += 1
+            while True:
+                c = json[i]
+                if c == "\\" and json[i + 1] == '"':
+                    i += 2
+                    continue
+                i += 1
+                if c == '"':
+                    break
+        elif c == "{":
+            e += 1
+            expecting[e] = "}"
+            if e >= limit:
+                raise LimitExceeded("max_depth", limit, "too deep")
+            i += 1
+        elif c == "[":
+            e += 1
+            expecting[e] = "]"
+            if e >= limit:
+                raise LimitExceeded("max_depth", limit, "too deep")
+            i += 1
+        elif c in "]}":
+            e -= 1
+            i += 1
+        else:
+            i += 1
+
+
+def guard(json):
+    check_limits(json, LIMITS)
+
+
+def decode(json):
+    json_decoder(json)
+
+
+def timed(method, json):
+    start = time.time()
+    try:
+        method(json)
+        outcome = "accepted"
+    except LimitExceeded:
+        outcome = "rejected"
+    except Exception as cause:
+        outcome = cause.__class__.__name__
+    return outcome, time.time() - start
+
+
+def main(megabytes):
+    try:
+        Log.start()
+        documents = [
+            ("normal", make_document(megabytes)),
+            ("deep", "[" * (megabytes * 1_000_000)),
+            ("wide", "[" + "0," * (megabytes * 500_000) + "0]"),
+        ]
+        results = []
+        for doc_name, json in documents:
+            for name, method in [("per character", per_character), ("check_limits", guard), ("decode", decode)]:
+                outcome, duration = timed(method, json)
+                results.append({
+                    "document": doc_name,
+                    "method": name,
+                    "outcome": outcome,
+                    "seconds": round(duration, 3),
+                    "MB/s": round(len(json) / duration / 1_000_000, 1),
+                })
+        Log.note("\n{{summary}}", summary=list2tab(results))
+    finally:
+        Log.stop()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
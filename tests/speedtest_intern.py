@@ -0,0 +1,92 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# COMPARE THE MEMORY HELD BY DECODED NDJSON RECORDS, AND THE DECODE TIME,
+# WITH AND WITHOUT json2value(..., intern=True)
+#
+#     python -m tests.speedtest_intern [MEGABYTES]
+#
+import gc
+import random
+import sys
+import time
+import tracemalloc
+
+from mo_logs import Log
+
+from mo_json import StringMemo, json2value, use_backend, value2json
+from mo_json.backends import available_backends
+from tests.utils import list2tab
+
+
+def make_ndjson(megabytes, seed=1):
+    """
+    :return: LIST OF LINES THAT LOOK LIKE WEB SERVER LOGS: FEW KEYS, LOW-CARDINALITY VALUES, AND SOME UNIQUE IDS
+    """
+    rand = random.Random(seed)
+    lines = []
+    size = 0
+    while size < megabytes * 1_000_000:
+        line = value2json({
+            "timestamp": 1577836800 + len(lines),
+            "level": rand.choice(["INFO", "WARN", "ERROR", "DEBUG"]),
+            "status": rand.choice(["200", "201", "302", "404", "500"]),
+            "method": rand.choice(["GET", "POST", "PUT"]),
+            "host": "web-%02d.example.com" % rand.randint(1, 20),
+            "path": "/api/v1/items/%d" % rand.randint(1, 100_000),
+            "request_id": "%032x" % rand.getrandbits(128),
+            "user": {"id": rand.randint(1, 5000), "country": rand.choice(["US", "DE", "FR", "JP", "BR"])},
+            "tags": rand.sample(["a", "b", "c", "d", "e"], 2),
+            "duration_ms": round(rand.random() * 100, 3),
+        })
+        lines.append(line)
+        size += len(line) + 1
+    return lines
+
+
+def decode_all(lines, intern):
+    return [json2value(line, intern=intern) for line in lines]
+
+
+def main(megabytes):
+    try:
+        Log.start()
+        lines = make_ndjson(megabytes)
+        Log.note("{{num|comma}} lines", num=len(lines))
+        results = []
+        for backend in available_backends():
+            use_backend(backend)
+            for name, intern in [("plain", False), ("intern", True)]:
+                gc.collect()
+                start = time.perf_counter()
+                decode_all(lines, StringMemo() if intern else False)
+                duration = time.perf_counter() - start
+                gc.collect()
+
+                tracemalloc.start()
+                try:
+                    result = decode_all(lines, StringMemo() if intern else False)
+                    held = tracemalloc.get_traced_memory()[0]
+                finally:
+                    tracemalloc.stop()
+                del result
+                results.append({
+                    "backend": backend,
+                    "mode": name,
+                    "seconds": round(duration, 2),
+                    "held MB": round(held / 1_000_000),
+                })
+        use_backend()
+        Log.note("\n{{summary}}", summary=list2tab(results))
+    finally:
+        Log.stop()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -21,7 +21,8 @@ try:
 except Exception:
     pass
 
-from mo_json import scrub, typed_encoder
+from mo_json import Budget, Compact, scrub, typed_encoder, estimate_json_size, use_backend, value2json
+from mo_json.backends import available_backends
 from mo_json.encoder import cPythonJSONEncoder, json_encoder
 from mo_logs import Log
 from mo_dots import unwrap
@@ -56,8 +57,17 @@ NESTED = (
     25000,
 )
 HUGE = ([NESTED[0]] * 1000, 100)
+INTEGERS = (
+    [{"id": 2 ** 62 + i, "parent": i, "children": list(range(i, i + 50)), "score": i / 4} for i in range(100)],
+    1000,
+)
+
+RECORDS = (
+    [{"id": i, "name": f"name {i}", "value": i / 7, "note": None, "tags": []} for i in range(1000)],
+    20,
+)
 
-cases = ["EMPTY", "UNICODE", "SIMPLE", "NESTED", "HUGE"]
+cases = ["EMPTY", "UNICODE", "SIMPLE", "NESTED", "HUGE", "INTEGERS", "RECORDS"]
 
 
 def test_json(results, description, method, n):
@@ -72,11 +82,13 @@ def test_json(results, description, method, n):
 
             try:
                 example = method(data)
-                if case == "HUGE":
+                size = len(example) if isinstance(example, str) else None
+                if case in ("HUGE", "INTEGERS", "RECORDS"):
                     example = "<too big to show>"
             except Exception as e:
                 Log.warning("json encoding failure", cause=e)
                 example = "<CRASH>"
+                size = None
 
             t0 = time.time()
             try:
@@ -95,6 +107,7 @@ def test_json(results, description, method, n):
                 "num": n,
                 "count": count,
                 "length": len(output),
+                "size": size,
                 "result": example,
             }
             Log.note(
@@ -130,12 +143,26 @@ def main(num):
     try:
         Log.start()
         results = []
+        for backend in available_backends():
+            previous = use_backend(backend)
+            test_json(results, f"mo-json value2json ({backend})", value2json, num)
+            use_backend(previous)
+        test_json(
+            results,
+            "mo-json value2json (compact)",
+            lambda v: value2json(v, compact=Compact(significant_digits=6, columns=True)),
+            num,
+        )
+        test_json(
+            results, "mo-json value2json (10KB budget)", lambda v: value2json(v, budget=Budget(max_bytes=10_000)), num,
+        )
         test_json(results, "mo-json encoder", json_encoder, num)
         test_json(results, "mo-json encoder (again)", json_encoder, num)
         test_json(results, "scrub before json.dumps", cPythonJSONEncoder().encode, num)
         test_json(results, "override JSONEncoder.default()", EnhancedJSONEncoder().encode, num)
         test_json(results, "default json.dumps", json.dumps, num)  # WILL CRASH, CAN NOT HANDLE DIVERSITY OF TYPES
         test_json(results, "typed json", typed_encoder.encode, num)
+        test_json(results, "estimate size (no encoding)", estimate_json_size, num)
 
         # test_json(results, "scrubbed ujson", ujson.dumps, num)  # THIS PLAIN CRASHES
 
@@ -0,0 +1,76 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# COMPARE json2value(..., lazy=True) WITH FULL DECODING, FOR THE LATENCY AND
+# PEAK MEMORY OF READING A FEW FIELDS OUT OF A LARGE DOCUMENT
+#
+#     python -m tests.speedtest_lazy [MEGABYTES]
+#
+import sys
+import time
+import tracemalloc
+
+from mo_logs import Log
+
+from mo_json import json2value
+from tests import speedtest_leaves
+from tests.utils import list2tab
+
+READS = {
+    "first field": lambda doc: doc.meta.version,
+    "one record": lambda doc: doc.records[10]["user.id"],
+    "last field": lambda doc: doc.tail.count,
+}
+
+
+def make_document(megabytes):
+    records = speedtest_leaves.make_document(megabytes)
+    return '{"meta": {"version": 3}, "records": ' + records + ', "tail": {"count": 1}}'
+
+
+def measure(json, read, lazy):
+    start = time.perf_counter()
+    result = read(json2value(json, lazy=lazy))
+    duration = time.perf_counter() - start
+
+    # MEMORY IS MEASURED IN A SECOND RUN, SO tracemalloc DOES NOT SLOW THE FIRST
+    tracemalloc.start()
+    try:
+        read(json2value(json, lazy=lazy))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, duration, peak
+
+
+def main(megabytes):
+    try:
+        Log.start()
+        json = make_document(megabytes)
+        Log.note("document is {{size|comma}} characters", size=len(json))
+        results = []
+        for name, read in READS.items():
+            expected, full, full_peak = measure(json, read, False)
+            result, lazy, lazy_peak = measure(json, read, True)
+            if result != expected:
+                Log.error("lazy read of {{name}} does not match", name=name)
+            results.append({
+                "read": name,
+                "full seconds": round(full, 3),
+                "lazy seconds": round(lazy, 3),
+                "full peak MB": round(full_peak / 1_000_000, 1),
+                "lazy peak MB": round(lazy_peak / 1_000_000, 1),
+            })
+        Log.note("\n{{summary}}", summary=list2tab(results))
+    finally:
+        Log.stop()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
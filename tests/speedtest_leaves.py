@@ -0,0 +1,82 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# COMPARE json2value(..., leaves=True), WHICH EXPANDS THE DOTTED KEYS WHILE
+# PARSING, WITH THE OLD TWO PASSES: DECODE, THEN leaves_to_data()
+#
+#     python -m tests.speedtest_leaves [MEGABYTES]
+#
+import gc
+import sys
+import time
+
+from mo_dots import leaves_to_data, to_data
+from mo_logs import Log
+
+from mo_json import json2value, use_backend, value2json
+from mo_json.backends import available_backends
+from mo_json.decoder import json_decoder
+from tests.utils import list2tab
+
+
+def make_document(megabytes):
+    record = {
+        "event.name": "click",
+        "event.time": 1577836800.25,
+        "user.id": 12345,
+        "user.name": "kyle",
+        "user.tags": ["a", "b", None],
+        "http": {"request.method": "GET", "request.path": "/some/path", "status": 200},
+        "missing": None,
+    }
+    size = len(value2json(record)) + 1
+    return value2json([record] * (megabytes * 1_000_000 // size))
+
+
+def two_pass(json):
+    return to_data(leaves_to_data(json_decoder(json)))
+
+
+def one_pass(json):
+    return json2value(json, leaves=True)
+
+
+def main(megabytes):
+    try:
+        Log.start()
+        json = make_document(megabytes)
+        Log.note("document is {{size|comma}} characters", size=len(json))
+        expected = None
+        results = []
+        for backend in available_backends():
+            use_backend(backend)
+            for name, method in [("two passes", two_pass), ("while parsing", one_pass)]:
+                gc.collect()
+                start = time.time()
+                result = method(json)
+                duration = time.time() - start
+                if expected is None:
+                    expected = result
+                elif result != expected:
+                    Log.error("{{name}} with {{backend}} does not match", name=name, backend=backend)
+                results.append({
+                    "backend": backend,
+                    "method": name,
+                    "seconds": round(duration, 2),
+                    "MB/s": round(len(json) / duration / 1_000_000, 1),
+                })
+                del result
+        use_backend()
+        Log.note("\n{{summary}}", summary=list2tab(results))
+    finally:
+        Log.stop()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
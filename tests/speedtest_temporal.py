@@ -0,0 +1,52 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# COMPARE convert_times() WITH time.mktime(), AND WITH CONVERTING ONE VALUE AT A TIME
+#
+#     python -m tests.speedtest_temporal [THOUSANDS]
+#
+import sys
+import time
+from datetime import datetime, timedelta
+
+from mo_logs import Log
+
+from mo_json import ISO, MILLI, UNIX, convert_times
+from mo_json.temporal import time_converter
+from tests.utils import list2tab
+
+MOMENT = datetime(2020, 1, 2, 3, 4, 5, 678000)
+
+
+def main(thousands):
+    try:
+        Log.start()
+        values = [MOMENT + timedelta(seconds=i) for i in range(thousands * 1000)]
+        results = []
+        methods = [("time.mktime()", lambda vs: [time.mktime(v.timetuple()) for v in vs])]
+        for time_format in (UNIX, MILLI, ISO):
+            convert = time_converter(time_format)
+            methods.append((f"one at a time ({time_format})", lambda vs, c=convert: [c(v) for v in vs]))
+            methods.append((f"convert_times ({time_format})", lambda vs, f=time_format: convert_times(vs, f)))
+        for name, method in methods:
+            start = time.time()
+            method(values)
+            duration = time.time() - start
+            results.append({
+                "method": name,
+                "seconds": round(duration, 3),
+                "values/s": int(len(values) / duration),
+            })
+        Log.note("\n{{summary}}", summary=list2tab(results))
+    finally:
+        Log.stop()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -0,0 +1,86 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# THROUGHPUT OF THE ENCODERS, BY THREAD COUNT
+#
+# WITH THE GIL THE THROUGHPUT STAYS FLAT; ON A FREE-THREADED BUILD (3.13t) IT
+# SHOULD GROW WITH THE THREADS, UP TO THE NUMBER OF CORES
+#
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from mo_logs import Log
+
+from mo_json import estimate_json_size, json2value, json_hash, value2json
+from tests import speedtest_json
+from tests.utils import list2tab
+
+THREAD_COUNTS = [1, 2, 4, 8]
+TARGET_RUNTIME = 2  # SECONDS PER MEASUREMENT
+
+FUNCTIONS = [
+    ("value2json", value2json),
+    ("json2value", None),  # DECODES THE value2json() OF THE CASE
+    ("estimate_json_size", estimate_json_size),
+    ("json_hash", json_hash),
+]
+
+
+def throughput(function, data, threads):
+    """
+    :return: CALLS PER SECOND, WITH threads THREADS CALLING function(data) IN A LOOP
+    """
+    deadline = time.time() + TARGET_RUNTIME
+
+    def work(_):
+        count = 0
+        while time.time() < deadline:
+            function(data)
+            count += 1
+        return count
+
+    start = time.time()
+    with ThreadPoolExecutor(threads) as pool:
+        total = sum(pool.map(work, range(threads)))
+    return total / (time.time() - start)
+
+
+def main():
+    try:
+        Log.start()
+        gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+        Log.note("cores={{cores}} gil={{gil}}", cores=os.cpu_count(), gil=gil)
+        results = []
+        for case in ["SIMPLE", "NESTED", "RECORDS"]:
+            data, _ = getattr(speedtest_json, case)
+            for name, function in FUNCTIONS:
+                if function is None:
+                    function, data_ = json2value, value2json(data)
+                else:
+                    data_ = data
+                single = None
+                for threads in THREAD_COUNTS:
+                    rate = throughput(function, data_, threads)
+                    single = single or rate
+                    results.append({
+                        "case": case,
+                        "function": name,
+                        "threads": threads,
+                        "calls/sec": round(rate),
+                        "speedup": round(rate / single, 2),
+                    })
+        Log.note("\n{{summary}}", summary=list2tab(results))
+    finally:
+        Log.stop()
+
+
+if __name__ == "__main__":
+    main()
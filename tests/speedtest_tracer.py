@@ -0,0 +1,70 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# COMPARE ENCODING SLOW-PATH VALUES WITH NO TRACER, AND WITH A SlowPathTracer
+# TIMING ONE OF EVERY 100 HITS, AND EVERY HIT
+#
+#     python -m tests.speedtest_tracer [THOUSANDS]
+#
+import sys
+import time
+
+from mo_logs import Log
+
+from mo_json import SlowPathTracer, value2json
+from tests.utils import list2tab
+
+
+class WithData:
+    def __data__(self):
+        return {"a": 1}
+
+
+class NoTracer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+def best_of(value, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.time()
+        value2json(value)
+        duration = time.time() - start
+        best = duration if best is None else min(best, duration)
+    return best
+
+
+def main(thousands):
+    try:
+        Log.start()
+        value = [WithData() for _ in range(thousands * 1000)]
+        results = []
+        for name, tracer in [
+            ("no tracer", NoTracer),
+            ("SlowPathTracer()", SlowPathTracer),
+            ("SlowPathTracer(every=1)", lambda: SlowPathTracer(every=1)),
+        ]:
+            with tracer():
+                duration = best_of(value)
+            results.append({
+                "tracer": name,
+                "seconds": round(duration, 4),
+                "values/s": int(len(value) / duration),
+            })
+        Log.note("\n{{summary}}", summary=list2tab(results))
+    finally:
+        Log.stop()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
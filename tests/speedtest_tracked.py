@@ -0,0 +1,60 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+# COMPARE RE-ENCODING A WHOLE DOCUMENT AFTER EACH SMALL CHANGE WITH A
+# TrackedDocument, WHICH RE-ENCODES ONLY THE CHANGED PATH
+#
+#     python -m tests.speedtest_tracked [USERS]
+#
+import sys
+import time
+
+from mo_logs import Log
+
+from mo_json import TrackedDocument, value2json
+from tests.utils import list2tab
+
+CHANGES = 100
+
+
+def make_document(users):
+    return {f"user{i}": {"name": f"name {i}", "scores": list(range(20)), "meta": {"x": i}} for i in range(users)}
+
+
+def full(value):
+    for i in range(CHANGES):
+        value[f"user{i}"]["meta"]["x"] = -i
+        value2json(value)
+
+
+def tracked(value):
+    doc = TrackedDocument(value)
+    value2json(doc)
+    for i in range(CHANGES):
+        doc[f"user{i}.meta.x"] = -i
+        value2json(doc)
+
+
+def main(users):
+    try:
+        Log.start()
+        results = []
+        for name, method in [("whole document", full), ("TrackedDocument", tracked)]:
+            value = make_document(users)
+            start = time.time()
+            method(value)
+            duration = time.time() - start
+            results.append({"method": name, "changes": CHANGES, "seconds": round(duration, 3)})
+        Log.note("\n{{summary}}", summary=list2tab(results))
+    finally:
+        Log.stop()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,113 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from datetime import datetime
+from decimal import Decimal
+
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_json import json2value, use_backend, value2json
+from mo_json.backends import STDLIB, available_backends, current_backend
+from tests import speedtest_json, test_json
+
+# VALUES THE FAST BACKENDS TREAT DIFFERENTLY FROM THE STANDARD LIBRARY
+VALUES = [
+    {"big": 2 ** 64, "negative": -(2 ** 63) - 1, "max": 2 ** 64 - 1},
+    {"small": 1e-7, "large": 1.5e300, "third": 1 / 3, "hex": "3e5a1f"},
+    {"tiny": [1e-05, 1.5e-05, 9e-05, 9.9e-05, -1e-05, 0.0001]},
+    {"control": "\x00\x1f\x7f \"\\/", "unicode": "ąćż 😀", "É": 1, "é": 2, "z": 3},
+    {"surrogate": "\ud800"},
+    {"when": datetime(2020, 1, 2, 3, 4, 5), "money": Decimal("0.33")},
+    [[[[[[[[[[[[[[[[[[[[1]]]]]]]]]]]]]]]]]]]] * 3,
+]
+
+DOCUMENTS = [
+    "18446744073709551616",
+    "[-9223372036854775809, -9223372036854775808, 9999999999999999999, 1.5]",
+    "[18446744073709551615, 18446744073709551616]",
+    '{"a": NaN, "b": Infinity}',
+    '"\\ud800"',
+    "1e400",
+    '{"a": 1, "a": 2}',
+    '{"text": "0000000000000000000000"}',
+    " [1, 2.0, true, null, {\"k\": \"v\"}] ",
+]
+
+
+def deep(depth):
+    value = 1
+    for _ in range(depth):
+        value = [value]
+    return value
+
+
+class TestBackends(FuzzyTestCase):
+    def setUp(self):
+        self.backup = current_backend()
+
+    def tearDown(self):
+        use_backend(self.backup)
+
+    def test_stdlib_always_available(self):
+        self.assertIn(STDLIB, available_backends())
+
+    def test_unknown_backend(self):
+        with self.assertRaises(Exception):
+            use_backend("no such backend")
+
+    def test_encode_same_as_stdlib(self):
+        values = VALUES + [deep(300)]
+        values += [getattr(speedtest_json, case)[0] for case in speedtest_json.cases]
+        use_backend(STDLIB)
+        expected = [value2json(v) for v in values]
+        for name in available_backends():
+            use_backend(name)
+            for value, json in zip(values, expected):
+                self.assertEqual(value2json(value), json, name)
+
+    def test_decode_same_as_stdlib(self):
+        use_backend(STDLIB)
+        expected = [json2value(d) for d in DOCUMENTS]
+        for name in available_backends():
+            use_backend(name)
+            for doc, value in zip(DOCUMENTS, expected):
+                result = json2value(doc)
+                self.assertEqual(repr(result), repr(value), name)
+
+    def test_big_integers_stay_exact(self):
+        for name in available_backends():
+            use_backend(name)
+            result = json2value('{"id": 18446744073709551617}')
+            self.assertIs(result.id.__class__, int)
+            self.assertEqual(result.id, 18446744073709551617)
+
+    def test_errors_same_as_stdlib(self):
+        for name in available_backends():
+            use_backend(name)
+            try:
+                json2value('{"a": 1,\n "b": }')
+                self.fail("expecting error")
+            except Exception as cause:
+                self.assertIn("line 2", str(cause), name)
+
+
+class TestJSONWithStdlib(test_json.TestJSON):
+    """
+    THE WHOLE JSON SUITE, WITH THE STANDARD LIBRARY (THE OTHER RUN USES THE FASTEST INSTALLED BACKEND)
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        test_json.TestJSON.setUpClass()
+        cls.backend_backup = use_backend(STDLIB)
+
+    @classmethod
+    def tearDownClass(cls):
+        use_backend(cls.backend_backup)
+        test_json.TestJSON.tearDownClass()
@@ -0,0 +1,81 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_json import batch_json, json2value, value2json
+
+
+class TestBatch(FuzzyTestCase):
+    def test_ndjson_byte_limit(self):
+        docs = [{"a": i} for i in range(100)]
+        batches = list(batch_json(docs, max_bytes=50))
+
+        for b in batches:
+            self.assertLessEqual(len(b.data), 50)
+            self.assertFalse(b.too_big)
+        lines = [json2value(line.decode("utf8")) for b in batches for line in b.data.splitlines()]
+        self.assertEqual(lines, docs)
+        self.assertEqual(sum(b.count for b in batches), 100)
+
+    def test_array_byte_limit(self):
+        docs = [{"a": i} for i in range(100)]
+        batches = list(batch_json(docs, max_bytes=50, format="array"))
+
+        result = []
+        for b in batches:
+            self.assertLessEqual(len(b.data), 50)
+            result.extend(json2value(b.data.decode("utf8")))
+        self.assertEqual(result, docs)
+
+    def test_exact_fit(self):
+        # EACH DOC IS 7 BYTES, PLUS COMMAS AND BRACKETS
+        docs = [{"a": i} for i in range(4)]
+        batches = list(batch_json(docs, max_bytes=2 + 7 * 2 + 1, format="array"))
+        self.assertEqual([b.count for b in batches], [2, 2])
+        self.assertEqual(batches[0].data, b'[{"a":0},{"a":1}]')
+
+    def test_count_limit(self):
+        batches = list(batch_json(range(10), max_bytes=1000, max_count=3))
+        self.assertEqual([b.count for b in batches], [3, 3, 3, 1])
+        self.assertEqual(batches[-1].data, b"9\n")
+
+    def test_too_big(self):
+        docs = [1, "x" * 100, 2, 3]
+        batches = list(batch_json(docs, max_bytes=10))
+        self.assertEqual(
+            [(b.count, b.too_big) for b in batches], [(1, True), (3, False)],
+        )
+        self.assertEqual(batches[0].data, value2json("x" * 100).encode("utf8") + b"\n")
+        self.assertEqual(batches[1].data, b"1\n2\n3\n")
+
+    def test_utf8_bytes_counted(self):
+        batches = list(batch_json(["ąć", "ąć"], max_bytes=8))
+        self.assertEqual([b.count for b in batches], [1, 1])
+        self.assertEqual(len(batches[0].data), 7)
+
+    def test_encode_once(self):
+        calls = []
+
+        class Doc(object):
+            def __init__(self, a):
+                self.a = a
+
+            def __data__(self):
+                calls.append(self.a)
+                return {"a": self.a}
+
+        list(batch_json([Doc(i) for i in range(20)], max_bytes=30))
+        self.assertEqual(calls, list(range(20)))
+
+    def test_empty(self):
+        self.assertEqual(list(batch_json([], max_bytes=10)), [])
+
+    def test_bad_format(self):
+        self.assertRaises(Exception, lambda: list(batch_json([1], max_bytes=10, format="xml")))
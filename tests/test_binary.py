@@ -0,0 +1,71 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import tracemalloc
+
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_json import BINARY_BASE64, BINARY_BASE85, Budget, json2value, value2json
+from mo_json.binary import binary2base64
+
+BLOB = bytes(range(256)) * 4
+
+
+class TestBinary(FuzzyTestCase):
+    def test_default_is_latin1(self):
+        self.assertEqual(value2json(b"\x00\xff"), '"\\u0000\xff"')
+        self.assertEqual(value2json(bytearray(b"abc")), '"abc"')
+        self.assertEqual(value2json(memoryview(b"abc")), '"abc"')
+
+    def test_base64_round_trip(self):
+        data = {"thumbnail": BLOB, "proto": bytearray(BLOB), "view": memoryview(BLOB)[10:20]}
+        json = value2json(data, binary_policy=BINARY_BASE64)
+        self.assertEqual(json2value(json)["view"], {"$base64": "CgsMDQ4PEBESEw=="})
+        result = json2value(json, binary=True)
+        self.assertEqual(result.thumbnail, BLOB)
+        self.assertEqual(result.proto, BLOB)
+        self.assertEqual(result.view, BLOB[10:20])
+
+    def test_base85_round_trip(self):
+        json = value2json([BLOB], binary_policy=BINARY_BASE85)
+        self.assertIn("$base85", json)
+        self.assertEqual(json2value(json, binary=True), [BLOB])
+
+    def test_flexible(self):
+        result = json2value('{a: {"$base64": "AP8="}} // comment', flexible=True, binary=True)
+        self.assertEqual(result.a, b"\x00\xff")
+
+    def test_strided_memoryview(self):
+        view = memoryview(BLOB)[::2]
+        json = value2json(view, binary_policy=BINARY_BASE64)
+        self.assertEqual(json2value(json, binary=True), BLOB[::2])
+
+    def test_budget(self):
+        json = value2json({"a": BLOB[:100]}, binary_policy=BINARY_BASE64, budget=Budget())
+        self.assertEqual(json, value2json({"a": BLOB[:100]}, binary_policy=BINARY_BASE64))
+
+    def test_other_objects_untouched(self):
+        result = json2value('{"a": {"$base64": "AP8=", "b": 1}, "c": {"d": 2}}', binary=True)
+        self.assertEqual(result, {"a": {"$base64": "AP8=", "b": 1}, "c": {"d": 2}})
+
+    def test_unknown_policy(self):
+        with self.assertRaises(Exception):
+            value2json(b"", binary_policy="hex")
+
+    def test_memoryview_not_copied(self):
+        size = 10 * 1024 * 1024
+        view = memoryview(bytearray(size))
+        tracemalloc.start()
+        try:
+            binary2base64(view)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # BASE64 BYTES PLUS THE str ARE 2.67 * size; A COPY WOULD ADD ANOTHER size
+        self.assertLess(peak, 3 * size)
@@ -0,0 +1,79 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from datetime import datetime, timedelta
+
+from mo_dots import to_data
+from mo_testing.fuzzytestcase import FuzzyTestCase
+from mo_times import Date
+
+from mo_json import Budget, Compact, from_columns, json2value, value2json
+
+RECORDS = [
+    {"name": "a", "score": 1.23456789, "tags": [], "meta": {}},
+    {"name": "b", "score": 2.0, "extra": {"x": None}},
+    {"name": "c", "when": None, "tags": ["t"]},
+]
+
+
+class TestCompact(FuzzyTestCase):
+    def test_default_profile_drops_empty(self):
+        result = value2json({"a": {}, "b": [], "c": None, "d": {"e": {}}, "f": [None, {}], "g": 1}, compact=Compact())
+        self.assertEqual(result, '{"f":[null,{}],"g":1}')
+
+    def test_keep_empty(self):
+        result = value2json({"a": {}, "b": [], "c": None}, compact=Compact(drop_empty=False))
+        self.assertEqual(result, '{"a":{},"b":[]}')
+
+    def test_significant_digits(self):
+        data = {"pi": 3.14159265, "big": 123456789.0, "small": 0.000123456, "id": 12345678901, "nan": float("nan")}
+        result = value2json(data, compact=Compact(significant_digits=3))
+        self.assertEqual(result, '{"big":123000000,"id":12345678901,"pi":3.14,"small":0.000123}')
+
+    def test_significant_digits_in_lists(self):
+        result = value2json([1.23456, 2, 7.0], compact=Compact(significant_digits=2))
+        self.assertEqual(result, "[1.2,2,7]")
+
+    def test_significant_digits_keep_times(self):
+        when = datetime(2024, 3, 15, 12, 34, 56, 789000)
+        data = {"t": when, "d": Date(when), "span": timedelta(seconds=1234567.5), "x": 1.23456}
+        result = json2value(value2json(data, compact=Compact(significant_digits=3)))
+        self.assertEqual(result, {"t": 1710506096.789, "d": 1710506096.789, "span": 1234567.5, "x": 1.23})
+
+    def test_columns(self):
+        result = value2json(RECORDS, compact=Compact(significant_digits=3, columns=True))
+        self.assertEqual(
+            result, '{"keys":["name","score","tags"],"rows":[["a",1.23,null],["b",2,null],["c",null,["t"]]]}',
+        )
+
+    def test_columns_round_trip(self):
+        result = from_columns(json2value(value2json(RECORDS, compact=Compact(columns=True))))
+        self.assertEqual(
+            result, [{"name": "a", "score": 1.23456789}, {"name": "b", "score": 2}, {"name": "c", "tags": ["t"]}],
+        )
+
+    def test_columns_only_for_records(self):
+        self.assertEqual(value2json([1, {"a": 1}], compact=Compact(columns=True)), '[1,{"a":1}]')
+        self.assertEqual(value2json({"a": 1}, compact=Compact(columns=True)), '{"a":1}')
+
+    def test_from_columns_passes_other_values(self):
+        value = to_data({"keys": ["a"], "other": 1})
+        self.assertIs(from_columns(value), value)
+
+    def test_with_budget(self):
+        result = value2json(
+            {"a": {}, "b": list(range(10))}, compact=Compact(), budget=Budget(max_items=2)
+        )
+        self.assertEqual(result, '{"b":[0,1,"... (8 more)"]}')
+
+    def test_smaller(self):
+        records = [{"id": i, "value": i / 7, "note": None, "tags": []} for i in range(100)]
+        plain = value2json(records)
+        compact = value2json(records, compact=Compact(significant_digits=4, columns=True))
+        self.assertLess(len(compact), len(plain) / 2)
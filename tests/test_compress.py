@@ -0,0 +1,69 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import gzip
+import os
+import tempfile
+import unittest
+from io import BytesIO
+
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_json import json2value
+from mo_json.compress import GzipWriter, ZstdWriter, gzip_member
+
+try:
+    import zstandard
+except Exception:
+    zstandard = None
+
+
+def rows(n):
+    return [{"id": i, "name": "row " + str(i), "tags": ["a", "ą"]} for i in range(n)]
+
+
+class TestCompress(FuzzyTestCase):
+    def test_gzip(self):
+        output = BytesIO()
+        with GzipWriter(output, block_size=1000, threads=4) as writer:
+            writer.extend(rows(1000))
+        lines = gzip.decompress(output.getvalue()).decode("utf8").splitlines()
+        self.assertEqual([json2value(line) for line in lines], rows(1000))
+
+    def test_many_members(self):
+        output = BytesIO()
+        with GzipWriter(output, block_size=1000, threads=2) as writer:
+            writer.extend(rows(1000))
+        # EVERY MEMBER STARTS WITH THE GZIP MAGIC NUMBER
+        self.assertGreater(output.getvalue().count(b"\x1f\x8b\x08"), 10)
+
+    def test_path(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "test.ndjson.gz")
+            with GzipWriter(filename) as writer:
+                writer.extend(rows(10))
+            with gzip.open(filename, "rt", encoding="utf8") as file:
+                self.assertEqual([json2value(line) for line in file], rows(10))
+
+    def test_empty(self):
+        output = BytesIO()
+        GzipWriter(output).close()
+        self.assertEqual(gzip.decompress(output.getvalue()), b"")
+        self.assertEqual(output.getvalue()[:3], b"\x1f\x8b\x08")
+
+    def test_member(self):
+        self.assertEqual(gzip.decompress(gzip_member(b"hello")), b"hello")
+
+    @unittest.skipIf(zstandard is None, "zstandard not installed")
+    def test_zstd(self):
+        output = BytesIO()
+        with ZstdWriter(output) as writer:
+            writer.extend(rows(1000))
+        data = zstandard.ZstdDecompressor().decompressobj().decompress(output.getvalue())
+        self.assertEqual([json2value(line) for line in data.decode("utf8").splitlines()], rows(1000))
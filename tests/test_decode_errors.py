@@ -0,0 +1,93 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from mo_logs import Except
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_json import JsonDecodeError, json2value
+
+BAD = '{"a": 1,\n  "b" 2}'
+
+
+class TestDecodeErrors(FuzzyTestCase):
+    def test_location(self):
+        for value in [BAD, BAD.encode("utf8"), memoryview(BAD.encode("utf8"))]:
+            try:
+                json2value(value)
+                self.fail("expecting error")
+            except JsonDecodeError as cause:
+                self.assertEqual((cause.line, cause.column), (2, 7))
+                self.assertIn('Can not decode JSON at line 2, column 7:\n\t  "b" 2}\n\t      ^', cause.message)
+                self.assertIn("Expecting ':' delimiter", str(cause))
+
+    def test_description_is_lazy(self):
+        try:
+            json2value(BAD)
+            self.fail("expecting error")
+        except JsonDecodeError as cause:
+            self.assertNotIn("template", cause.__dict__)
+            self.assertNotIn("cause", cause.__dict__)
+            self.assertIn("Can not decode JSON", cause)
+            self.assertIn("template", cause.__dict__)
+
+    def test_cause_trace_is_where_it_failed(self):
+        try:
+            json2value(BAD)
+            self.fail("expecting error")
+        except JsonDecodeError as cause:
+            str(cause)  # RENDERED FIRST, AS WHEN LOGGED
+            files = [frame["file"] for frame in cause.cause.trace]
+            self.assertTrue(files)
+            self.assertFalse([f for f in files if "mo_logs" in f or "test_decode_errors" in f], files)
+
+    def test_long_line(self):
+        text = "[" + "1, " * 100_000 + "2 3]"
+        try:
+            json2value(text)
+            self.fail("expecting error")
+        except JsonDecodeError as cause:
+            self.assertEqual(cause.line, 1)
+            self.assertEqual(cause.column, len(text) - 1)
+            self.assertEqual(cause.params.sample, "...1, 1, 1, 1, 1, 1, 2 3]")
+
+    def test_whitespace(self):
+        try:
+            json2value("  \n ")
+            self.fail("expecting error")
+        except Exception as cause:
+            self.assertIn("JSON string is only whitespace", cause)
+
+    def test_not_utf8(self):
+        try:
+            json2value(b'["\xff"]', raise_fast=True)
+            self.fail("expecting error")
+        except JsonDecodeError as cause:
+            self.assertEqual((cause.line, cause.column), (1, 3))
+            self.assertIn("not UTF-8", cause.message)
+
+    def test_default(self):
+        self.assertIsNone(json2value(BAD, default=None))
+        self.assertEqual(json2value(BAD, default={}), {})
+        self.assertEqual(json2value("[1]", default=None), [1])
+
+    def test_raise_fast(self):
+        try:
+            json2value(BAD, raise_fast=True)
+            self.fail("expecting error")
+        except Except as cause:
+            self.assertIsInstance(cause, JsonDecodeError)
+            self.assertEqual(cause.trace, [])
+            self.assertIn("Can not decode JSON", cause)
+
+    def test_trace_by_default(self):
+        try:
+            json2value(BAD)
+            self.fail("expecting error")
+        except JsonDecodeError as cause:
+            self.assertTrue(any("test_decode_errors" in t["file"] for t in cause.trace))
@@ -0,0 +1,55 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import datetime
+import hashlib
+from decimal import Decimal
+
+from mo_dots import to_data
+from mo_testing.fuzzytestcase import FuzzyTestCase
+from mo_times import Date
+
+from mo_json import distinct_json, json_hash, value2json
+from tests import speedtest_json
+
+
+def expected_hash(value, algorithm="sha256"):
+    return hashlib.new(algorithm, value2json(value).encode("utf8")).hexdigest()
+
+
+class TestDigest(FuzzyTestCase):
+    def test_speedtest_cases(self):
+        for case in speedtest_json.cases:
+            data, _ = getattr(speedtest_json, case)
+            self.assertEqual(json_hash(data), expected_hash(data))
+
+    def test_key_order(self):
+        self.assertEqual(json_hash({"a": 1, "b": 2}), json_hash({"b": 2, "a": 1}))
+
+    def test_normalization(self):
+        # SAME AS THE Scrubber: INTEGER-VALUED FLOATS, DECIMALS AND DATES
+        self.assertEqual(json_hash({"a": 1.0}), json_hash({"a": 1}))
+        self.assertEqual(json_hash({"a": Decimal("2.5")}), json_hash({"a": 2.5}))
+        self.assertEqual(json_hash(Date("2024-03-15")), json_hash(1710460800))
+        self.assertEqual(json_hash(datetime.date(2024, 3, 15)), json_hash(1710460800))
+        self.assertEqual(json_hash({"a": None, "b": 1}), json_hash({"b": 1}))
+        self.assertEqual(json_hash(to_data({"a": [1, "x"]})), json_hash({"a": [1, "x"]}))
+
+    def test_different(self):
+        self.assertNotEqual(json_hash({"a": 1}), json_hash({"a": "1"}))
+        self.assertNotEqual(json_hash([1, 2]), json_hash([2, 1]))
+
+    def test_large(self):
+        data = {"rows": [{"k": i, "v": "text ą " * 10, "n": None} for i in range(10000)]}
+        self.assertEqual(json_hash(data), expected_hash(data))
+        self.assertEqual(json_hash(data, algorithm="md5"), expected_hash(data, "md5"))
+
+    def test_distinct(self):
+        records = [{"a": 1, "b": 2}, {"b": 2, "a": 1.0}, {"a": 2}, {"a": 1, "b": 2, "c": None}, {"a": 2}]
+        self.assertEqual(list(distinct_json(records)), [{"a": 1, "b": 2}, {"a": 2}])
@@ -0,0 +1,75 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import datetime
+import time
+from decimal import Decimal
+
+from mo_dots import Data, DataObject, to_data
+from mo_testing.fuzzytestcase import FuzzyTestCase
+from mo_times import Date, Duration
+
+from mo_json import value2json, estimate_json_size
+from tests import speedtest_json
+
+
+class TestEstimate(FuzzyTestCase):
+    def assertSize(self, value, keep_whitespace=True):
+        expected = len(value2json(value, keep_whitespace=keep_whitespace).encode("utf8"))
+        self.assertEqual(estimate_json_size(value, keep_whitespace=keep_whitespace), expected)
+
+    def test_speedtest_cases(self):
+        for case in speedtest_json.cases:
+            data, _ = getattr(speedtest_json, case)
+            self.assertSize(data)
+
+    def test_primitives(self):
+        for value in [None, True, False, 0, -1, 42, 3.5, 1e-7, 1e300, 10.0, "", " ", "text", Decimal("0.33")]:
+            self.assertSize(value)
+
+    def test_escaped_strings(self):
+        self.assertSize('quote " and \\ backslash')
+        self.assertSize("tab\tnew line\n\x00\x1f control")
+        self.assertSize("unicode ąćż and \U0001F600")
+
+    def test_missing_values_dropped(self):
+        self.assertSize({"a": None, "b": "", "c": [], "d": {}, "e": [None, None], "f": float("nan")})
+
+    def test_whitespace(self):
+        value = {"a": "  padded  ", "b": "   "}
+        self.assertSize(value, keep_whitespace=True)
+        self.assertSize(value, keep_whitespace=False)
+
+    def test_temporal(self):
+        self.assertSize({
+            "date": datetime.date(2013, 11, 13),
+            "datetime": datetime.datetime(2013, 11, 13, 1, 2, 3, 456000),
+            "delta": datetime.timedelta(days=1, microseconds=5),
+            "Date": Date("2024-03-15"),
+            "Duration": Duration("day"),
+        })
+
+    def test_wrapped(self):
+        self.assertSize(to_data({"a": {"b": [1, 2, {"c": "d"}]}}))
+        self.assertSize(Data(a=1, b=Data(c="x")))
+        self.assertSize(DataObject(Date("2024-03-15")))
+
+    def test_data_method(self):
+        class MyClass(object):
+            def __init__(self, a, b):
+                self.a = a
+                self.b = b
+
+            def __data__(self):
+                return self.__dict__
+
+        self.assertSize([MyClass(a="name", b=42), MyClass(a=None, b=[1, 2])])
+
+    def test_bad_key(self):
+        self.assertRaises(Exception, estimate_json_size, {24: "value"})
@@ -0,0 +1,106 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import json
+import random
+
+import hjson
+from mo_dots import from_data
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_json import json2value, remove_line_comment, strip_comments
+from tests.speedtest_flexible import make_config
+
+EXAMPLES = [
+    '{"a": 1 # comment\n}',
+    '{"a": 1// comment\n, "b": 2}',
+    '{"a": [1, 2, ], }',
+    "[1, /* comment */ 2]",
+    '{"a": "x" /* multi\n line */}',
+    "[1,\n# comment\n]",
+    '{"url": "http://example.com/#a", // comment\n "b": "\\"#", }',
+    '{"a": "/* not a comment */", "b": "// nor this"}',
+    '["a,]", "b" , ]',
+    '{"a": [[], {}, ], "b": {"c": [1,], }, }',
+    "{a: 1, // comment\n b: 2}",
+    "http.headers.referer: http://example.com",
+    "{\n  a: '''\n  multi\n  line\n  '''\n}",
+]
+
+
+def old_remove_line_comment(line):
+    mode = 0  # 0=code, 1=inside_string, 2=escaping
+    for i, c in enumerate(line):
+        if c == '"':
+            if mode == 0:
+                mode = 1
+            elif mode == 1:
+                mode = 0
+            else:
+                mode = 1
+        elif c == "\\":
+            if mode == 0:
+                mode = 0
+            elif mode == 1:
+                mode = 2
+            else:
+                mode = 1
+        elif mode == 2:
+            mode = 1
+        elif c == "#" and mode == 0:
+            return line[0:i]
+        elif c == "/" and mode == 0 and line[i + 1] == "/":
+            return line[0:i]
+    return line
+
+
+class TestFlexible(FuzzyTestCase):
+    def test_same_as_hjson(self):
+        for text in EXAMPLES:
+            self.assertEqual(from_data(json2value(text, flexible=True)), hjson.loads(text), text)
+
+    def test_random_comments(self):
+        rand = random.Random(11)
+        pieces = ["// c\n", "# c\n", "/* c */", "/* \n */", " ", "\n"]
+        for _ in range(300):
+            doc = {
+                f"k{i}": rand.choice([1, "x // y", 'a "#" b', [1, "/*"], {"z": None}, "\\"])
+                for i in range(rand.randint(1, 4))
+            }
+            tokens = json.dumps(doc).split(", ")
+            text = (", " + rand.choice(pieces)).join(tokens)
+            if rand.random() < 0.5:
+                text = text[:-1] + "," + rand.choice(pieces) + "}"
+            self.assertEqual(from_data(json2value(text, flexible=True)), doc, text)
+
+    def test_strip_comments(self):
+        self.assertEqual(strip_comments('{"a": [1, 2, ], } // end'), '{"a": [1, 2 ] } ')
+        self.assertEqual(strip_comments('["#", "\\"//"]'), '["#", "\\"//"]')
+
+    def test_unterminated(self):
+        # NOT JSON, SO THEY GO TO hjson, WHICH COMPLAINS
+        for text in ['{"a": "x // y}', "[1, /* comment", '["a\\"]']:
+            with self.assertRaises(Exception):
+                json2value(text, flexible=True)
+
+    def test_remove_line_comment(self):
+        rand = random.Random(13)
+        for _ in range(1000):
+            line = "".join(rand.choice(['"', "\\", "#", "/", "a", " "]) for _ in range(rand.randint(0, 12))) + "x"
+            self.assertEqual(remove_line_comment(line), old_remove_line_comment(line), line)
+
+    def test_hooks(self):
+        text = '{"a.b": 1, // comment\n "c": {"$base64": "AP8="},}'
+        self.assertEqual(from_data(json2value(text, flexible=True, leaves=True)), {"a": {"b": 1}, "c": {"$base64": "AP8="}})
+        self.assertEqual(json2value(text, flexible=True, binary=True).c, b"\x00\xff")
+        self.assertEqual(json2value(text, flexible=True, leaves=True, binary=True).c, b"\x00\xff")
+
+    def test_config(self):
+        text = make_config(100)
+        self.assertEqual(from_data(json2value(text, flexible=True)), hjson.loads(text))
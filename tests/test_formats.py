@@ -0,0 +1,129 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from datetime import datetime
+from decimal import Decimal
+
+from mo_dots import Data, FlatList, to_data
+from mo_testing.fuzzytestcase import FuzzyTestCase
+from mo_times import Date, Duration
+
+from mo_json import ISO, cbor2value, json2value, msgpack2value, value2cbor, value2json, value2msgpack
+from tests import speedtest_json
+
+# EXAMPLES FROM RFC 8949 APPENDIX A, AND THE MessagePack SPEC
+CBOR_EXAMPLES = [
+    (0, "00"),
+    (23, "17"),
+    (24, "1818"),
+    (1000, "1903e8"),
+    (1000000000000, "1b000000e8d4a51000"),
+    (18446744073709551615, "1bffffffffffffffff"),
+    (18446744073709551616, "c249010000000000000000"),
+    (-18446744073709551617, "c349010000000000000000"),
+    (-1, "20"),
+    (-1000, "3903e7"),
+    (1.1, "fb3ff199999999999a"),
+    (False, "f4"),
+    (True, "f5"),
+    (None, "f6"),
+    ("a", "6161"),
+    ("ü", "62c3bc"),
+    ([1, [2, 3], [4, 5]], "8301820203820405"),
+    ({"a": 1, "b": [2, 3]}, "a26161016162820203"),
+]
+
+MSGPACK_EXAMPLES = [
+    (0, "00"),
+    (127, "7f"),
+    (128, "cc80"),
+    (-1, "ff"),
+    (-33, "d0df"),
+    (65536, "ce00010000"),
+    (2 ** 63, "cf8000000000000000"),
+    (-(2 ** 63), "d38000000000000000"),
+    (1.5, "cb3ff8000000000000"),
+    (None, "c0"),
+    (True, "c3"),
+    ("a", "a161"),
+    ("x" * 32, "d920" + "78" * 32),
+    ([1, 2], "920102"),
+    ({"a": 1}, "81a16101"),
+    (b"\x00", "c40100"),
+]
+
+
+class Thing:
+    def __init__(self, name):
+        self.name = name
+
+    def __data__(self):
+        return {"name": self.name, "size": Decimal("2.50")}
+
+
+class TestFormats(FuzzyTestCase):
+    def test_cbor_examples(self):
+        for value, expected in CBOR_EXAMPLES:
+            self.assertEqual(value2cbor(value).hex(), expected)
+            self.assertEqual(cbor2value(bytes.fromhex(expected)), value)
+
+    def test_msgpack_examples(self):
+        for value, expected in MSGPACK_EXAMPLES:
+            self.assertEqual(value2msgpack(value).hex(), expected)
+            self.assertEqual(msgpack2value(bytes.fromhex(expected)), value)
+
+    def test_same_type_rules_as_json(self):
+        value = Data(
+            a=FlatList([1, None, "b"]),
+            when=Date("2020-01-02"),
+            wait=Duration("hour"),
+            thing=Thing("t"),
+            empty=None,
+        )
+        expected = json2value(value2json(value))
+        self.assertEqual(cbor2value(value2cbor(value)), expected)
+        self.assertEqual(msgpack2value(value2msgpack(value)), expected)
+
+    def test_time_format(self):
+        value = {"when": datetime(2020, 1, 2)}
+        self.assertEqual(cbor2value(value2cbor(value, time_format=ISO)), {"when": "2020-01-02T00:00:00Z"})
+
+    def test_binary_is_native(self):
+        value = {"blob": bytearray(b"\x00\x01"), "view": memoryview(b"abcdef")[::2]}
+        self.assertEqual(msgpack2value(value2msgpack(value)), {"blob": b"\x00\x01", "view": b"ace"})
+        self.assertEqual(cbor2value(value2cbor(value)), {"blob": b"\x00\x01", "view": b"ace"})
+
+    def test_long_containers(self):
+        value = {"text": "x" * 70000, "list": list(range(70000)), "map": {str(i): i for i in range(20)}}
+        self.assertEqual(msgpack2value(value2msgpack(value)), value)
+        self.assertEqual(cbor2value(value2cbor(value)), value)
+
+    def test_cbor_indefinite_length(self):
+        # [_ 1, "a" "b" streamed, {_ "k": 2}]
+        data = bytes.fromhex("9f01" + "7f61616162ff" + "bf616b02ff" + "ff")
+        self.assertEqual(cbor2value(data), [1, "ab", {"k": 2}])
+
+    def test_cbor_float_sizes(self):
+        self.assertEqual(cbor2value(bytes.fromhex("f93e00")), 1.5)
+        self.assertEqual(cbor2value(bytes.fromhex("fa47c35000")), 100000.0)
+
+    def test_truncated(self):
+        with self.assertRaises(Exception):
+            msgpack2value(value2msgpack({"a": "hello"})[:-2])
+        with self.assertRaises(Exception):
+            cbor2value(value2cbor([1.5])[:-1])
+        with self.assertRaises(Exception):
+            cbor2value(value2cbor(1) + b"\x00")
+
+    def test_smaller_than_json(self):
+        data, _ = speedtest_json.NESTED
+        self.assertLess(len(value2msgpack(data)), len(value2json(data).encode("utf8")))
+        self.assertLess(len(value2cbor(data)), len(value2json(data).encode("utf8")))
+        data, _ = speedtest_json.SIMPLE
+        self.assertEqual(to_data(cbor2value(value2cbor(data))), json2value(value2json(data)))
@@ -0,0 +1,106 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import json
+import random
+
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_json import JsonDecodeError, LimitExceeded, Limits, check_depth, json2value
+from mo_json.guard import check_limits
+
+
+def depth(value):
+    if isinstance(value, dict):
+        return 1 + max(map(depth, value.values()), default=0)
+    if isinstance(value, list):
+        return 1 + max(map(depth, value), default=0)
+    return 0
+
+
+def random_value(rand, level=0):
+    kind = rand.randint(0, 5 if level < 6 else 2)
+    if kind == 0:
+        return rand.choice([None, True, 1, 2.5])
+    if kind == 1:
+        return rand.choice(["", "a", 'quote " and \\ slash', "[{", "\\", "é"]) * rand.randint(1, 3)
+    if kind == 2:
+        return rand.choice([[], {}])
+    if kind == 3:
+        return [random_value(rand, level + 1) for _ in range(rand.randint(1, 3))]
+    return {f"k{i}]": random_value(rand, level + 1) for i in range(rand.randint(1, 3))}
+
+
+class TestGuard(FuzzyTestCase):
+    def test_exact_depth(self):
+        rand = random.Random(42)
+        for _ in range(500):
+            value = random_value(rand)
+            for text in [json.dumps(value), json.dumps(value, ensure_ascii=False).encode("utf8")]:
+                expected = depth(value)
+                check_limits(text, Limits(max_depth=expected))
+                if expected:
+                    with self.assertRaises(LimitExceeded):
+                        check_limits(text, Limits(max_depth=expected - 1))
+
+    def test_string_length(self):
+        text = json.dumps({"a": "x" * 10, "b": 'y"\\' + "z" * 5})
+        check_limits(text, Limits(max_string=10))
+        try:
+            check_limits(text, Limits(max_string=9))
+            self.fail("expecting error")
+        except LimitExceeded as cause:
+            self.assertEqual(cause.limit, "max_string")
+            self.assertIn("string of 10 bytes", str(cause))
+
+    def test_brackets_in_strings(self):
+        text = json.dumps(["[[[[{{{{", '\\"[[[[', "]]]]"])
+        check_limits(text, Limits(max_depth=1, max_elements=3))
+
+    def test_elements(self):
+        text = json.dumps([{"a": 1, "b": [1, 2, 3]}, "x, y", []])
+        check_limits(text, Limits(max_elements=9))
+        with self.assertRaises(LimitExceeded):
+            check_limits(text, Limits(max_elements=8))
+
+    def test_bytes(self):
+        text = '["é"]'
+        check_limits(text, Limits(max_bytes=6))
+        with self.assertRaises(LimitExceeded):
+            check_limits(text, Limits(max_bytes=5))
+        with self.assertRaises(LimitExceeded):
+            check_limits(memoryview(text.encode("utf8")), Limits(max_bytes=5))
+
+    def test_json2value(self):
+        limits = Limits(max_depth=3)
+        self.assertEqual(json2value("[[[1]]]", limits=limits), [[[1]]])
+        self.assertEqual(json2value(b"[[[[1]]]]", limits=limits, default="rejected"), "rejected")
+        try:
+            json2value("[[[[1]]]]", limits=limits)
+            self.fail("expecting error")
+        except JsonDecodeError as cause:
+            self.assertIsInstance(cause.problem, LimitExceeded)
+            self.assertIn("Can not decode JSON: JSON is nested more than 3 deep", cause.message)
+
+    def test_lazy_is_guarded(self):
+        with self.assertRaises(JsonDecodeError):
+            json2value("[" * 100_000 + "]" * 100_000, lazy=True, limits=Limits(max_depth=100))
+
+    def test_hostile_is_rejected(self):
+        # THE DECODER WOULD RUN OUT OF STACK; THE GUARD STOPS AT THE FIRST CHUNK
+        text = "[" * 10_000_000
+        with self.assertRaises(JsonDecodeError):
+            json2value(text, limits=Limits(max_depth=64))
+
+    def test_check_depth(self):
+        check_depth("[" * 30 + "]" * 30)
+        with self.assertRaises(Exception):
+            check_depth("[" * 31 + "]" * 31)
+        with self.assertRaises(Exception):
+            check_depth("{" * 100)
@@ -0,0 +1,68 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import tracemalloc
+
+from mo_dots import from_data
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_json import BINARY_BASE64, StringMemo, json2value, value2json
+from tests.speedtest_intern import decode_all, make_ndjson
+
+LINE = '{"status": "200", "tags": ["a", "b"], "long": "%s", "user": {"country": "US"}}'
+
+
+class TestIntern(FuzzyTestCase):
+    def test_same_value(self):
+        for line in make_ndjson(0.1):
+            self.assertEqual(json2value(line, intern=True), json2value(line))
+
+    def test_shared_strings(self):
+        memo = StringMemo()
+        first = from_data(json2value(LINE % ("x" * 40), intern=memo))
+        second = from_data(json2value((LINE % ("x" * 40)).encode("utf8"), intern=memo))
+        self.assertEqual(first, second)
+        for a, b in [
+            (list(first.keys())[0], list(second.keys())[0]),
+            (first["status"], second["status"]),
+            (first["tags"][1], second["tags"][1]),
+            (first["user"]["country"], second["user"]["country"]),
+        ]:
+            self.assertIs(a, b)
+        self.assertIsNot(first["long"], second["long"])
+
+    def test_bounded(self):
+        memo = StringMemo(max_size=100)
+        for i in range(1000):
+            json2value('{"id": "%d"}' % i, intern=memo)
+        self.assertLessEqual(len(memo.memo), 102)
+
+    def test_with_other_options(self):
+        memo = StringMemo()
+        result = json2value('{"a.b": "x", "c": null}', leaves=True, intern=memo)
+        self.assertEqual(from_data(result), {"a": {"b": "x"}})
+        encoded = value2json({"blob": b"\x00\x01"}, binary_policy=BINARY_BASE64)
+        self.assertEqual(json2value(encoded, binary=True, intern=memo).blob, b"\x00\x01")
+        self.assertEqual(json2value('{a: "x" // comment\n}', flexible=True, intern=memo), {"a": "x"})
+        with self.assertRaises(Exception):
+            json2value("{}", lazy=True, intern=True)
+
+    def test_less_memory(self):
+        lines = make_ndjson(1)
+
+        def held(intern):
+            tracemalloc.start()
+            try:
+                result = decode_all(lines, StringMemo() if intern else False)
+                return tracemalloc.get_traced_memory()[0]
+            finally:
+                tracemalloc.stop()
+                del result
+
+        self.assertLess(held(True), held(False) * 0.75)
@@ -0,0 +1,80 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import tracemalloc
+from array import array
+
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_json import BINARY_BASE64, json2value, use_backend, value2json
+from mo_json.backends import ORJSON, available_backends, current_backend
+
+DOC = '{"a": [1, 2.5, "ąćż"], "big": 18446744073709551617, "b": {"c": null}}'
+
+
+class TestJsonBytes(FuzzyTestCase):
+    def setUp(self):
+        self.backup = current_backend()
+
+    def tearDown(self):
+        use_backend(self.backup)
+
+    def test_binary_types(self):
+        expected = json2value(DOC)
+        data = DOC.encode("utf8")
+        for name in available_backends():
+            use_backend(name)
+            for value in [data, bytearray(data), memoryview(data), memoryview(b"xx" + data + b"yy")[2:-2]]:
+                result = json2value(value)
+                self.assertEqual(result, expected)
+                self.assertEqual(result.big, 18446744073709551617)
+
+    def test_odd_memoryviews(self):
+        strided = memoryview(b"[x1x,x2x]")[::2]  # NOT CONTIGUOUS
+        self.assertEqual(json2value(strided), [1, 2])
+        wide = memoryview(array("B", b"[3]")).cast("B", shape=[1, 3])  # NOT ONE-DIMENSIONAL
+        self.assertEqual(json2value(wide), [3])
+
+    def test_options_with_bytes(self):
+        self.assertEqual(json2value(b'{"a": {{x}}}', params={"x": 1}), {"a": 1})
+        self.assertEqual(json2value(b"{a: 1, // comment\n b: 2}", flexible=True), {"a": 1, "b": 2})
+        self.assertEqual(json2value(memoryview(b'{"a.b": 1}'), leaves=True), {"a": {"b": 1}})
+        encoded = value2json({"blob": b"\x00\x01"}, binary_policy=BINARY_BASE64).encode("utf8")
+        self.assertEqual(json2value(encoded, binary=True), {"blob": b"\x00\x01"})
+
+    def test_error_location(self):
+        for name in available_backends():
+            use_backend(name)
+            try:
+                json2value(memoryview('{"a": 1,\n "ąą": }'.encode("utf8")))
+                self.fail("expecting error")
+            except Exception as cause:
+                self.assertIn("line 2 column 8", str(cause), name)
+
+    def test_not_utf8(self):
+        try:
+            json2value(b'{"a":\n "\xc4\x85\xff"}')
+            self.fail("expecting error")
+        except Exception as cause:
+            self.assertIn("not UTF-8 at line 2, column 4", str(cause))
+
+    def test_no_text_copy(self):
+        if ORJSON not in available_backends():
+            self.skipTest("orjson is not installed")
+        use_backend(ORJSON)
+        data = b"[1, 2, 3]" + b" " * 10_000_000
+        view = memoryview(data)
+        tracemalloc.start()
+        try:
+            result = json2value(view)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(result, [1, 2, 3])
+        self.assertLess(peak, 1_000_000)
@@ -0,0 +1,117 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from mo_dots import Data, Null, from_data
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_json import LazyList, LazyObject, json2value, value2json
+from tests.speedtest_lazy import make_document
+
+RECORDS = [{"a": i, "s": 'x"]}[{' * 5, "n": [i, None, {"z": i}], "o": None} for i in range(3000)]
+DOC = {"meta": {"version": 3}, "records": RECORDS, "é\"\\": "odd key", "tail": {"count": len(RECORDS)}}
+TEXT = json.dumps(DOC)
+
+
+class TestLazy(FuzzyTestCase):
+    def test_small_is_data(self):
+        result = json2value('{"a": [1, 2]}', lazy=True)
+        self.assertIsInstance(result, Data)
+        self.assertEqual(result, {"a": [1, 2]})
+
+    def test_reads(self):
+        for text in [TEXT, TEXT.encode("utf8"), memoryview(("  " + TEXT + "\n").encode("utf8"))]:
+            doc = json2value(text, lazy=True)
+            self.assertIsInstance(doc, LazyObject)
+            self.assertIsInstance(doc.records, LazyList)
+            self.assertEqual(doc.meta.version, 3)
+            self.assertEqual(doc["tail.count"], 3000)
+            self.assertEqual(doc['é"\\'], "odd key")
+            self.assertEqual(doc.records[7].s, 'x"]}[{' * 5)
+            self.assertEqual(doc.records[-1].a, 2999)
+            self.assertEqual(doc.records[2:4].a, [2, 3])
+            self.assertEqual(doc.records[3].n, [3, None, {"z": 3}])
+            self.assertEqual(len(doc.records), 3000)
+            self.assertEqual(doc.records.a[:3], [0, 1, 2])
+            self.assertEqual(doc.keys(), set(DOC.keys()))
+            self.assertEqual(len(doc), 4)
+
+    def test_missing(self):
+        doc = json2value(TEXT, lazy=True)
+        self.assertIs(doc.nothing, Null)
+        self.assertIs(doc.records[5000], Null)
+        self.assertIs(doc.records[-5000], Null)
+        self.assertEqual(doc.get("nothing", 7), 7)
+        self.assertIn("meta", doc)
+        self.assertNotIn("nothing", doc)
+        self.assertEqual(doc["records.o"], [])
+
+    def test_whole_value(self):
+        doc = json2value(TEXT, lazy=True)
+        self.assertEqual(doc.meta.version, 3)
+        self.assertTrue(doc == DOC)
+        self.assertEqual(from_data(doc.__data__()), DOC)
+        self.assertEqual(value2json(doc), value2json(DOC))
+        self.assertEqual(list(doc.records)[-1].a, 2999)
+
+    def test_null_elements(self):
+        text = "[" + ", ".join(["null", "1", '"' + "x" * 100_000 + '"']) + "]"
+        doc = json2value(text, lazy=True)
+        self.assertEqual(len(list(doc)), 3)
+        self.assertTrue(doc)
+        self.assertEqual(doc[1], 1)
+
+    def test_repeated_name(self):
+        text = json.dumps({"b": [1, 2, 3], "records": RECORDS})[:-1] + ', "b": 7}'
+        doc = json2value(text, lazy=True)
+        self.assertEqual(doc.b, [1, 2, 3])
+        doc = json2value(text, lazy=True)
+        self.assertEqual(len(doc.keys()), 2)
+        self.assertEqual(doc.b, [1, 2, 3])
+
+    def test_null_is_cached(self):
+        doc = json2value(json.dumps({"n": None, "records": RECORDS}), lazy=True)
+        self.assertEqual(doc.n, None)
+        self.assertIn("n", doc._values)
+        self.assertIs(doc.n, doc._values["n"])
+
+    def test_read_only(self):
+        doc = json2value(TEXT, lazy=True)
+        with self.assertRaises(Exception):
+            doc["meta"] = 1
+
+    def test_bad_options(self):
+        with self.assertRaises(Exception):
+            json2value(TEXT, lazy=True, leaves=True)
+
+    def test_errors_when_read(self):
+        text = TEXT.replace('"tail": {"count": 3000}', '"tail": {"count": }')
+        doc = json2value(text, lazy=True)
+        self.assertEqual(doc.records[1].a, 1)
+        with self.assertRaises(Exception):
+            doc.tail.count
+
+    def test_scans_only_what_is_read(self):
+        doc = json2value(TEXT, lazy=True)
+        self.assertEqual(doc.records[10].a, 10)
+        self.assertEqual(len(doc._members), 2)
+        self.assertEqual(len(doc.records._members), 11)
+
+    def test_threads(self):
+        doc = json2value(TEXT, lazy=True)
+        with ThreadPoolExecutor(4) as pool:
+            result = list(pool.map(lambda i: doc.records[i * 300].a, range(10)))
+        self.assertEqual(result, [i * 300 for i in range(10)])
+        self.assertEqual(doc.tail.count, 3000)
+
+    def test_same_as_full(self):
+        text = make_document(5)
+        self.assertEqual(json2value(text, lazy=True).records[10], json2value(text).records[10])
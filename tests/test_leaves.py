@@ -0,0 +1,68 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import json
+import random
+
+from mo_dots import from_data, leaves_to_data
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_json import BINARY_BASE64, json2value, value2json
+from tests.speedtest_leaves import make_document, two_pass
+
+EXAMPLES = [
+    '{"a.b": 1, "a.c": null, "a": {"d": 2}}',
+    '{".": 5}',
+    '{".": [1], "x": 2}',
+    '{"x": 1, ".": 3}',
+    '[{"a..b": 1, "c.d.e": [{"f.g": null, "h": 1}]}]',
+    '{"a": {"b": 1}, "a.b": null}',
+    '{"a": 1, "a.b": 2}',
+    '{"a.b": 1, "a": 3}',
+    '{"k": null, "l": [null, {}]}',
+    "[]",
+    '"text"',
+]
+
+
+def old_way(text):
+    return from_data(leaves_to_data(json.loads(text)))
+
+
+class TestLeaves(FuzzyTestCase):
+    def test_same_as_leaves_to_data(self):
+        for text in EXAMPLES:
+            self.assertEqual(from_data(json2value(text, leaves=True)), old_way(text), text)
+
+    def test_random_paths(self):
+        rand = random.Random(7)
+        for _ in range(300):
+            doc = {}
+            for _ in range(rand.randint(1, 6)):
+                key = ".".join(rand.choice(["a", "b", "c"]) for _ in range(rand.randint(1, 3)))
+                doc[key] = rand.choice([None, 1, "x", [1, None], {"d.e": 2, "f": None}])
+            text = json.dumps([doc])
+            self.assertEqual(from_data(json2value(text, leaves=True)), old_way(text), text)
+
+    def test_empty_key(self):
+        with self.assertRaises(Exception):
+            json2value('{"": 1}', leaves=True)
+
+    def test_flexible(self):
+        result = json2value("{a.b: 1, // comment\n c.d: null}", flexible=True, leaves=True)
+        self.assertEqual(from_data(result), {"a": {"b": 1}})
+
+    def test_binary(self):
+        text = value2json({"blob.data": b"\x00\x01"}, binary_policy=BINARY_BASE64)
+        result = json2value(text, leaves=True, binary=True)
+        self.assertEqual(result.blob.data, b"\x00\x01")
+
+    def test_same_as_two_pass(self):
+        text = make_document(2)
+        self.assertEqual(from_data(json2value(text, leaves=True)), from_data(two_pass(text)))
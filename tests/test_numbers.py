@@ -0,0 +1,72 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from decimal import Decimal
+from enum import IntEnum
+
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_json import DECIMAL_FLOAT, DECIMAL_STRING, Budget, json2value, value2json
+from mo_json.scrubber import Scrubber, _scrub_number
+
+BIG_ID = 2 ** 63 - 25  # NOT REPRESENTABLE AS A float
+
+
+class Color(IntEnum):
+    RED = 1
+
+
+class TestNumbers(FuzzyTestCase):
+    def test_int_untouched(self):
+        self.assertIs(_scrub_number(BIG_ID), BIG_ID)
+
+    def test_big_ids(self):
+        data = {"id": BIG_ID, "ids": [BIG_ID, BIG_ID + 1, -BIG_ID]}
+        result = value2json(data)
+        self.assertEqual(result, '{"id":%d,"ids":[%d,%d,%d]}' % (BIG_ID, BIG_ID, BIG_ID + 1, -BIG_ID))
+        self.assertEqual(json2value(result), data)
+
+    def test_big_id_in_mixed_list(self):
+        result = value2json([BIG_ID, "a", 1.5, None])
+        self.assertEqual(result, '[%d,"a",1.5,null]' % BIG_ID)
+
+    def test_int_subclass(self):
+        self.assertEqual(value2json({"a": Color.RED}), '{"a":1}')
+
+    def test_floats(self):
+        self.assertEqual(value2json([1.0, 1.5, float("nan"), float("inf"), 2]), "[1,1.5,null,null,2]")
+
+    def test_decimal_int_is_exact(self):
+        self.assertEqual(value2json(Decimal(BIG_ID)), str(BIG_ID))
+        self.assertEqual(value2json(Decimal("2.50")), "2.5")
+        self.assertEqual(value2json(Decimal("1E+30")), "1" + "0" * 30)
+        self.assertEqual(value2json({"a": Decimal("NaN")}), "{}")
+
+    def test_decimal_float(self):
+        self.assertEqual(value2json(Decimal("2"), decimal_policy=DECIMAL_FLOAT), "2.0")
+        self.assertEqual(value2json(Decimal("0.1"), decimal_policy=DECIMAL_FLOAT), "0.1")
+
+    def test_decimal_string(self):
+        value = Decimal("3.14159265358979323846264338327950288")
+        self.assertEqual(value2json({"pi": value}, decimal_policy=DECIMAL_STRING), '{"pi":"%s"}' % value)
+        self.assertEqual(
+            value2json({"pi": value}, budget=Budget(), decimal_policy=DECIMAL_STRING), '{"pi":"%s"}' % value
+        )
+
+    def test_unknown_policy(self):
+        with self.assertRaises(Exception):
+            Scrubber(decimal_policy="round")
+
+    def test_custom_scrub_number(self):
+        scrubber = Scrubber(scrub_number=lambda v: -v)
+        self.assertEqual(scrubber.scrub([1, 2.5]), [-1, -2.5])
+
+    def test_integer_lists(self):
+        data = [{"id": BIG_ID + i, "parent": i, "children": list(range(i, i + 50))} for i in range(20)]
+        self.assertEqual(Scrubber().scrub(data), data)
@@ -0,0 +1,116 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from copy import deepcopy
+
+from mo_dots import Data, to_data
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_json import json2value, json_diff, json_patch, value2json
+
+
+class TestPatch(FuzzyTestCase):
+    def assertRoundTrip(self, a, b):
+        patch = json_diff(a, b)
+        # THE PATCH MUST SURVIVE THE WIRE
+        patch = json2value(value2json(patch))
+        result = json_patch(deepcopy(a), patch)
+        self.assertEqual(value2json(result), value2json(b))
+        return patch
+
+    def test_identical(self):
+        doc = {"a": [1, 2, {"b": "c"}]}
+        self.assertEqual(json_diff(doc, doc), [])
+        self.assertEqual(json_diff(doc, deepcopy(doc)), [])
+
+    def test_properties(self):
+        patch = self.assertRoundTrip({"a": 1, "b": 2, "c": {"d": 3}}, {"a": 1, "b": 3, "c": {}, "e": 4})
+        self.assertEqual(
+            patch,
+            [
+                {"op": "replace", "path": "/b", "value": 3},
+                {"op": "remove", "path": "/c/d"},
+                {"op": "add", "path": "/e", "value": 4},
+            ],
+        )
+
+    def test_missing_is_absent(self):
+        self.assertEqual(json_diff({"a": None, "b": ""}, {"c": None}), [])
+
+    def test_array_insert(self):
+        a = {"list": [{"id": i} for i in range(1000)]}
+        b = deepcopy(a)
+        b["list"].insert(500, {"id": "new"})
+        patch = self.assertRoundTrip(a, b)
+        self.assertEqual(patch, [{"op": "add", "path": "/list/500", "value": {"id": "new"}}])
+
+    def test_array_remove(self):
+        a = {"list": list(range(100))}
+        b = {"list": list(range(10)) + list(range(20, 100))}
+        patch = self.assertRoundTrip(a, b)
+        self.assertEqual(len(patch), 10)
+
+    def test_array_change(self):
+        a = [{"id": i, "v": 0} for i in range(100)]
+        b = deepcopy(a)
+        b[40]["v"] = 1
+        patch = self.assertRoundTrip(a, b)
+        self.assertEqual(patch, [{"op": "replace", "path": "/40/v", "value": 1}])
+
+    def test_array_shrink_and_grow(self):
+        self.assertRoundTrip([1, 2, 3, 4, 5], [1, 9, 5])
+        self.assertRoundTrip([1, 5], [1, 7, 8, 9, 5])
+
+    def test_escaped_keys(self):
+        self.assertRoundTrip({"a/b": 1, "c~d": 2}, {"a/b": 2, "c~d": 3})
+
+    def test_root(self):
+        self.assertEqual(json_diff(1, 2), [{"op": "replace", "path": "", "value": 2}])
+        self.assertEqual(json_patch(1, [{"op": "replace", "path": "", "value": 2}]), 2)
+
+    def test_root_round_trip(self):
+        self.assertRoundTrip({"a": 1}, [1])
+        self.assertRoundTrip([1], "text")
+        self.assertRoundTrip(1, {"a": [1]})
+
+    def test_data(self):
+        a = to_data({"a": {"b": 1}, "c": [1, 2]})
+        b = Data(a={"b": 2}, c=[1, 2, 3])
+        patch = json_diff(a, b)
+        result = json_patch(a, patch)
+        self.assertIs(result, a)
+        self.assertEqual(a, {"a": {"b": 2}, "c": [1, 2, 3]})
+
+    def test_type_change(self):
+        self.assertRoundTrip({"a": "1"}, {"a": 1})
+        self.assertRoundTrip([True], [1, 2])
+        self.assertRoundTrip({"a": [1]}, {"a": {"b": 1}})
+
+    def test_bool_is_not_int(self):
+        self.assertEqual(json_diff({"r": True}, {"r": 1}), [{"op": "replace", "path": "/r", "value": 1}])
+        self.assertRoundTrip({"r": False, "s": [True, 0]}, {"r": 0, "s": [1, False]})
+        self.assertRoundTrip([[True]], [[1]])
+
+    def test_move_copy_test(self):
+        doc = {"a": {"b": 1}, "c": [1, 2]}
+        json_patch(
+            doc,
+            [
+                {"op": "test", "path": "/a/b", "value": 1},
+                {"op": "copy", "from": "/a", "path": "/d"},
+                {"op": "move", "from": "/c/0", "path": "/c/-"},
+            ],
+        )
+        self.assertEqual(doc, {"a": {"b": 1}, "c": [2, 1], "d": {"b": 1}})
+
+    def test_failed_test(self):
+        self.assertRaises(Exception, json_patch, {"a": 1}, [{"op": "test", "path": "/a", "value": 2}])
+
+    def test_bad_path(self):
+        self.assertRaises(Exception, json_patch, {"a": 1}, [{"op": "remove", "path": "/b"}])
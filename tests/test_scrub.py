@@ -0,0 +1,94 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import tracemalloc
+from datetime import datetime
+from decimal import Decimal
+
+from mo_dots import FlatList, to_data
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_json import Compact, scrub
+from mo_json.compact import CompactScrubber
+from mo_json.scrubber import Scrubber
+
+
+def sample():
+    return {
+        "a": 1,
+        "b": None,
+        "c": "  ",
+        "d": datetime(2020, 1, 1),
+        "e": Decimal("2.5"),
+        "f": [1, 2.0, float("nan"), {"g": None, "h": Decimal("3")}],
+        "t": (1, 2),
+        "x": {},
+    }
+
+
+class TestScrubInPlace(FuzzyTestCase):
+    def test_same_as_copy(self):
+        expected = scrub(sample())
+        value = sample()
+        result = scrub(value, in_place=True)
+        self.assertIs(result, value)
+        self.assertEqual(result, expected)
+        self.assertEqual(list(result.keys()), list(expected.keys()))
+        self.assertEqual(result["f"], [1, 2, None, {"h": 3}])
+
+    def test_containers_are_reused(self):
+        inner = {"when": datetime(2020, 1, 1), "gone": None}
+        items = [inner, 1.5, 2.0]
+        value = {"items": items}
+        result = scrub(value, in_place=True)
+        self.assertIs(result["items"], items)
+        self.assertIs(result["items"][0], inner)
+        self.assertEqual(inner, {"when": 1577836800})
+        self.assertEqual(items[1:], [1.5, 2])
+
+    def test_data_wrappers(self):
+        raw = {"a": {"b": None, "c": Decimal("1")}}
+        result = scrub(to_data(raw), in_place=True)
+        self.assertIs(result, raw)
+        self.assertEqual(raw, {"a": {"c": 1}})
+        raw_list = [None, Decimal("1.5")]
+        self.assertIs(scrub(FlatList(raw_list), in_place=True), raw_list)
+
+    def test_tuple_is_copied(self):
+        value = {"t": (1, None)}
+        self.assertEqual(scrub(value, in_place=True), {"t": [1, None]})
+
+    def test_copy_leaves_original(self):
+        value = sample()
+        scrub(value)
+        self.assertEqual(value["d"], datetime(2020, 1, 1))
+        self.assertIn("b", value)
+
+    def test_compact_in_place(self):
+        value = {"a": {}, "b": [], "c": {"d": None}, "e": 1.23456}
+        scrubber = CompactScrubber(Compact(significant_digits=3), in_place=True)
+        self.assertIs(scrubber.scrub(value), value)
+        self.assertEqual(value, {"e": 1.23})
+
+    def test_less_memory(self):
+        def records():
+            return [{"id": i, "when": datetime(2020, 1, 1), "missing": None, "name": f"n{i}"} for i in range(20000)]
+
+        copy_peak = _peak(Scrubber().scrub, records())
+        in_place_peak = _peak(Scrubber(in_place=True).scrub, records())
+        self.assertLess(in_place_peak * 3, copy_peak)
+
+
+def _peak(function, value):
+    tracemalloc.start()
+    try:
+        function(value)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
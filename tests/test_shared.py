@@ -0,0 +1,88 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import multiprocessing
+import pickle
+from multiprocessing.shared_memory import SharedMemory
+
+from mo_dots import Data
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_json import JsonDecodeError, SharedJson, shared2value, value2json, value2shared
+from mo_json.shared import CHUNK_SIZE, utf8_chunks
+
+
+def _consume(queue, results):
+    # RUNS IN THE CHILD PROCESS
+    doc = shared2value(queue.get())
+    results.put((len(doc.rows), doc.rows[7].text))
+
+
+class TestShared(FuzzyTestCase):
+    def test_round_trip(self):
+        doc = {"a": [1, 2, {"b": "ąćż"}], "c": "text"}
+        handle = value2shared(doc)
+        self.assertEqual(handle.size, len(value2json(doc).encode("utf8")))
+        result = shared2value(handle)
+        self.assertIsInstance(result, Data)
+        self.assertEqual(result, doc)
+
+    def test_chunks(self):
+        for text in ["ż" * (CHUNK_SIZE + 5), "a" * (CHUNK_SIZE + 5), ""]:
+            size, chunks = utf8_chunks(text)
+            data = b"".join(chunks)
+            self.assertEqual(data, text.encode("utf8"))
+            self.assertEqual(size, len(data))
+
+    def test_bad_json(self):
+        bad = b'{"a": [1, 2'
+        shm = SharedMemory(create=True, size=len(bad))
+        shm.buf[: len(bad)] = bad
+        handle = SharedJson(shm.name, len(bad))
+        shm.close()
+        try:
+            shared2value(handle)
+        except JsonDecodeError as cause:
+            error = cause
+        # THE BLOCK IS GONE, BUT THE MESSAGE CAN STILL BE MADE
+        self.assertIn("Can not decode JSON", str(error))
+        self.assertRaises(FileNotFoundError, SharedMemory, name=handle.name)
+
+    def test_block_is_freed(self):
+        handle = value2shared({"a": 1})
+        shared2value(handle)
+        self.assertRaises(FileNotFoundError, SharedMemory, name=handle.name)
+
+    def test_keep(self):
+        handle = value2shared({"a": 1})
+        self.assertEqual(shared2value(handle, keep=True), {"a": 1})
+        self.assertEqual(shared2value(handle), {"a": 1})
+
+    def test_release(self):
+        handle = value2shared({"a": 1})
+        handle.release()
+        self.assertRaises(FileNotFoundError, SharedMemory, name=handle.name)
+
+    def test_handle_is_small(self):
+        handle = value2shared({"rows": list(range(100000))})
+        try:
+            self.assertLess(len(pickle.dumps(handle)), 200)
+            copy = pickle.loads(pickle.dumps(handle))
+            self.assertEqual((copy.name, copy.size), (handle.name, handle.size))
+        finally:
+            handle.release()
+
+    def test_other_process(self):
+        context = multiprocessing.get_context("spawn")
+        queue, results = context.Queue(), context.Queue()
+        worker = context.Process(target=_consume, args=(queue, results))
+        worker.start()
+        queue.put(value2shared({"rows": [{"id": i, "text": "row " + str(i)} for i in range(10000)]}))
+        self.assertEqual(results.get(timeout=60), (10000, "row 7"))
+        worker.join()
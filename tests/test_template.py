@@ -0,0 +1,64 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import builtins
+
+from mo_dots import to_data
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_json import json2value
+from mo_json.template import compile_template
+
+TEMPLATE = '{"host": {{host|quote}}, "port": {{port}}, "name": {{name|upper|left(4)|quote}}}'
+
+
+class TestTemplate(FuzzyTestCase):
+    def test_expand(self):
+        for port in range(3):
+            result = json2value(TEMPLATE, params={"host": "example.com", "port": port, "name": "service"})
+            self.assertEqual(result, {"host": "example.com", "port": port, "name": "SERV"})
+
+    def test_compiled_once(self):
+        self.assertIs(compile_template(TEMPLATE), compile_template(TEMPLATE))
+        self.assertEqual(len(compile_template(TEMPLATE).placeholders), 3)
+        self.assertEqual(compile_template("no placeholders").expand(({},)), "no placeholders")
+
+    def test_paths(self):
+        self.assertEqual(compile_template("{{1}}").expand((["a", "b"],)), "b")
+        self.assertEqual(compile_template("{{a.b}}").expand((to_data({"a": {"b": 2}}),)), "2")
+        self.assertEqual(compile_template("{{..x}}-{{x}}").expand(({"x": 1}, {"x": 2})), "1-2")
+        self.assertEqual(compile_template("{{.}}").expand(("text",)), "text")
+
+    def test_huge_number_is_a_name(self):
+        self.assertEqual(json2value('{"a": "{{inf}}", "b": "{{1e400}}"}', params={"inf": 1, "1e400": 2}), {"a": "1", "b": "2"})
+
+    def test_formatter_arguments(self):
+        self.assertEqual(compile_template("{{x|round(decimal=1)}}").expand(({"x": 3.14159},)), "3.1")
+        self.assertEqual(compile_template('{{x|replace("a", "b")}}').expand(({"x": "banana"},)), "bbnbnb")
+
+    def test_nothing_evaluated(self):
+        found = []
+        builtins._template_probe = found.append
+        try:
+            result = compile_template("{{x|left(_template_probe(1))}}").expand(({"x": "text"},))
+        finally:
+            del builtins._template_probe
+        self.assertEqual(found, [])
+        self.assertIn("template expansion error", result)
+
+    def test_unknown_formatter(self):
+        result = compile_template("{{x|no_such_formatter}}").expand(({"x": 1},))
+        self.assertIn("no_such_formatter", result)
+
+    def test_unknown_formatter_does_not_grow(self):
+        template = compile_template("{{x|no_such_formatter}}")
+        first = template.expand(({"x": 1},))
+        for _ in range(50):
+            self.assertEqual(template.expand(({"x": 1},)), first)
+        self.assertIsInstance(template.placeholders[0].problem, str)
@@ -0,0 +1,122 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from datetime import date, datetime, timedelta, timezone
+from unittest import skipIf
+
+from mo_testing.fuzzytestcase import FuzzyTestCase
+from mo_times import Date
+
+from mo_json import ISO, MILLI, UNIX, Budget, convert_times, value2json
+from mo_json.encoder import pypy_json_encode
+from mo_json.scrubber import Scrubber
+from mo_json.temporal import datetime2iso, datetime2milli, datetime2unix
+from mo_json.typed_encoder import encode as typed_encode
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+MOMENT = datetime(2020, 1, 2, 3, 4, 5, 678000)
+MOMENT_UNIX = 1577934245.678
+
+
+class TestTemporal(FuzzyTestCase):
+    def test_naive_is_utc(self):
+        self.assertAlmostEqual(datetime2unix(MOMENT), MOMENT_UNIX, places=6)
+        self.assertEqual(datetime2unix(MOMENT), MOMENT.replace(tzinfo=timezone.utc).timestamp())
+
+    def test_aware(self):
+        eastern = timezone(timedelta(hours=-5))
+        moment = (MOMENT + timedelta(hours=-5)).replace(tzinfo=eastern)
+        self.assertEqual(datetime2unix(moment), datetime2unix(MOMENT))
+        self.assertEqual(datetime2iso(moment), "2020-01-02T03:04:05.678000Z")
+
+    def test_date(self):
+        self.assertEqual(datetime2unix(date(1970, 1, 2)), 86400)
+        self.assertEqual(datetime2milli(date(1969, 12, 31)), -86_400_000)
+        self.assertEqual(datetime2iso(date(2020, 1, 2)), "2020-01-02")
+
+    def test_milli_is_exact(self):
+        self.assertEqual(datetime2milli(MOMENT), 1577934245678)
+        self.assertIsInstance(datetime2milli(MOMENT), int)
+
+    def test_mo_times_date(self):
+        moment = Date(MOMENT)
+        self.assertAlmostEqual(datetime2unix(moment), MOMENT_UNIX, places=3)
+        self.assertEqual(datetime2iso(moment), "2020-01-02T03:04:05.678000Z")
+
+    def test_subclass(self):
+        class MyDatetime(datetime):
+            pass
+
+        self.assertEqual(datetime2unix(MyDatetime(1970, 1, 1, 0, 1)), 60)
+
+    def test_not_a_time(self):
+        with self.assertRaises(Exception):
+            datetime2unix("2020-01-01")
+        with self.assertRaises(Exception):
+            Scrubber(time_format="week")
+
+    def test_value2json_formats(self):
+        data = {"a": MOMENT, "b": date(1970, 1, 2)}
+        self.assertEqual(value2json(data), '{"a":1577934245.678,"b":86400}')
+        self.assertEqual(value2json(data, time_format=MILLI), '{"a":1577934245678,"b":86400000}')
+        self.assertEqual(
+            value2json(data, time_format=ISO), '{"a":"2020-01-02T03:04:05.678000Z","b":"1970-01-02"}',
+        )
+
+    def test_budget_uses_time_format(self):
+        self.assertEqual(value2json([MOMENT], budget=Budget(), time_format=MILLI), "[1577934245678]")
+
+    def test_typed_encode_formats(self):
+        self.assertEqual(typed_encode({"a": MOMENT}), '{"a":{"~n~":1577934245.678},"~e~":1}')
+        self.assertEqual(typed_encode({"a": MOMENT}, time_format=MILLI), '{"a":{"~n~":1577934245678},"~e~":1}')
+        self.assertEqual(
+            typed_encode({"a": MOMENT}, time_format=ISO), '{"a":{"~s~":"2020-01-02T03:04:05.678000Z"},"~e~":1}',
+        )
+
+    def test_typed_multivalue(self):
+        result = typed_encode({"a": [date(1970, 1, 2), date(1970, 1, 3)]}, time_format=MILLI)
+        self.assertEqual(result, '{"a":{"~t~":[86400000,172800000]},"~e~":1}')
+
+    def test_typed_multivalue_iso(self):
+        one = typed_encode({"a": datetime(2020, 1, 1)}, time_format=ISO)
+        many = typed_encode({"a": [datetime(2020, 1, 1)] * 2}, time_format=ISO)
+        self.assertEqual(one, '{"a":{"~s~":"2020-01-01T00:00:00Z"},"~e~":1}')
+        self.assertEqual(many, '{"a":{"~s~":["2020-01-01T00:00:00Z","2020-01-01T00:00:00Z"]},"~e~":1}')
+
+    def test_pypy_encoder_is_not_local_time(self):
+        self.assertEqual(pypy_json_encode(datetime(1970, 1, 1, 0, 0, 1)), "1")
+
+    def test_convert_times(self):
+        result = convert_times([MOMENT, date(1970, 1, 2), Date(MOMENT), None], MILLI)
+        self.assertEqual(result, [1577934245678, 86_400_000, 1577934245678, None])
+
+    @skipIf(numpy is None, "numpy not installed")
+    def test_numpy(self):
+        values = numpy.array(["1970-01-02T00:00:00", "NaT", "2020-01-02T03:04:05.678"], dtype="datetime64[ms]")
+        self.assertEqual(convert_times(values, UNIX), [86400.0, None, MOMENT_UNIX])
+        self.assertEqual(convert_times(values, MILLI), [86_400_000, None, 1577934245678])
+        self.assertEqual(convert_times(values, ISO), ["1970-01-02T00:00:00Z", None, "2020-01-02T03:04:05.678000Z"])
+        self.assertEqual(convert_times(values, ISO), [datetime2iso(v) for v in values])
+        self.assertEqual(datetime2unix(values[0]), 86400)
+        self.assertEqual(value2json({"a": values[2]}, time_format=MILLI), '{"a":1577934245678}')
+
+    @skipIf(numpy is None, "numpy not installed")
+    def test_numpy_nat(self):
+        value = {"a": numpy.datetime64("NaT"), "b": [numpy.datetime64("NaT")]}
+        self.assertEqual(value2json(value, time_format=UNIX), '{"b":[null]}')
+        self.assertEqual(value2json(value, time_format=MILLI), '{"b":[null]}')
+        self.assertEqual(value2json(value, time_format=ISO), '{"b":[null]}')
+
+    def test_many(self):
+        values = [MOMENT + timedelta(seconds=i) for i in range(1000)]
+        self.assertEqual(convert_times(values), [datetime2unix(v) for v in values])
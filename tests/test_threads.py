@@ -0,0 +1,101 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from decimal import Decimal
+
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_json import estimate_json_size, json_hash, scrub, value2json
+from mo_json.encoder import pypy_json_encode
+from mo_json.scrubber import shared_scrubber
+
+THREADS = 8
+
+
+class FailsOnce:
+    """
+    THE FAST ENCODER FAILS ON THIS; THE PRETTY ENCODER (THE RECOVERY) SUCCEEDS
+    """
+
+    def __init__(self, name, on_recover=None):
+        self.name = name
+        self.calls = 0
+        self.on_recover = on_recover
+
+    def __json__(self):
+        self.calls += 1
+        if self.calls == 1:
+            raise Exception("first call fails")
+        if self.on_recover:
+            self.on_recover()
+        return '"' + self.name + '"'
+
+
+class Custom:
+    def __init__(self, i):
+        self.i = i
+
+    def __data__(self):
+        return {"i": self.i, "when": datetime(2020, 1, 1), "size": Decimal(self.i) / 4}
+
+
+def documents():
+    return [
+        {"id": i, "name": f"n{i}", "tags": ["a", None, i / 3], "custom": Custom(i), "missing": None} for i in range(200)
+    ]
+
+
+class TestThreads(FuzzyTestCase):
+    def test_same_result_in_threads(self):
+        docs = documents()
+        functions = [value2json, scrub, estimate_json_size, json_hash, lambda d: value2json(d, pretty=True)]
+        expected = [[f(d) for d in docs] for f in functions]
+
+        def run(_):
+            return [[f(d) for d in docs] for f in functions]
+
+        with ThreadPoolExecutor(THREADS) as pool:
+            for result in pool.map(run, range(THREADS * 2)):
+                self.assertEqual(result, expected)
+
+    def test_scrubber_is_shared(self):
+        self.assertIs(shared_scrubber(), shared_scrubber())
+        self.assertIsNot(shared_scrubber(), shared_scrubber(in_place=True))
+
+    def test_problem_in_one_thread_does_not_leak(self):
+        # THREAD a IS RECOVERING FROM A PROBLEM WHILE THREAD b HITS ITS OWN
+        a_recovering = threading.Event()
+        b_done = threading.Event()
+        results = {}
+
+        def recover_slowly():
+            a_recovering.set()
+            b_done.wait(10)
+
+        def encode_a():
+            results["a"] = pypy_json_encode(FailsOnce("a", recover_slowly))
+
+        def encode_b():
+            a_recovering.wait(10)
+            try:
+                results["b"] = pypy_json_encode(FailsOnce("b"))
+            except Exception as cause:
+                results["b"] = cause
+            finally:
+                b_done.set()
+
+        threads = [threading.Thread(target=encode_a), threading.Thread(target=encode_b)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(20)
+        self.assertEqual(results, {"a": '"a"', "b": '"b"'})
@@ -0,0 +1,91 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from concurrent.futures import ThreadPoolExecutor
+
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_json import SlowPathTracer, json2value, value2json
+from mo_json import tracer as tracing
+from mo_json.backends import ORJSON, available_backends, use_backend
+
+
+class WithData:
+    def __data__(self):
+        return {"a": 1}
+
+
+class Plain:
+    def __init__(self):
+        self.b = 2
+
+
+class Text(str):
+    pass
+
+
+def find(summary, branch, type_):
+    name = f"{type_.__module__}.{type_.__qualname__}"
+    for row in summary:
+        if row["branch"] == branch and row["type"] == name:
+            return row
+    return None
+
+
+class TestTracer(FuzzyTestCase):
+    def test_branches_by_type(self):
+        value = {"d": [WithData() for _ in range(5)], "p": Plain(), "t": Text("x")}
+        with SlowPathTracer(every=1) as tracer:
+            value2json(value)
+        summary = tracer.summary()
+        self.assertEqual(find(summary, tracing.DATA_METHOD, WithData)["count"], 5)
+        self.assertEqual(find(summary, tracing.DATA_OBJECT, Plain)["count"], 1)
+        self.assertEqual(find(summary, tracing.STR_SUBCLASS, Text)["count"], 1)
+        for row in summary:
+            self.assertGreater(row["seconds"], 0)
+            self.assertIn(row["type"], row["advice"])
+
+    def test_fast_types_not_traced(self):
+        with SlowPathTracer(every=1) as tracer:
+            value2json({"a": [1, 2.5, "x", None, True], "b": {"c": {}}})
+        self.assertEqual(tracer.summary(), [])
+
+    def test_sampling(self):
+        with SlowPathTracer(every=10) as tracer:
+            value2json([WithData() for _ in range(100)])
+        row = find(tracer.summary(), tracing.DATA_METHOD, WithData)
+        self.assertEqual(row["count"], 100)
+        self.assertEqual(row["timed"], 10)
+
+    def test_stopped(self):
+        tracer = SlowPathTracer(every=1)
+        with tracer:
+            pass
+        value2json(WithData())
+        self.assertIsNone(tracing.active)
+        self.assertEqual(tracer.summary(), [])
+
+    def test_threads(self):
+        with SlowPathTracer() as tracer:
+            with ThreadPoolExecutor(4) as pool:
+                list(pool.map(lambda _: value2json([WithData()] * 50), range(8)))
+        self.assertEqual(find(tracer.summary(), tracing.DATA_METHOD, WithData)["count"], 400)
+
+    def test_backend_fallback(self):
+        if ORJSON not in available_backends():
+            self.skipTest("orjson is not installed")
+        previous = use_backend(ORJSON)
+        try:
+            with SlowPathTracer(every=1) as tracer:
+                value2json({"big": 2 ** 70})
+                json2value('{"big": 1180591620717411303424}')
+            rows = [r for r in tracer.summary() if r["branch"] == tracing.STDLIB_FALLBACK]
+            self.assertEqual(sum(r["count"] for r in rows), 2)
+        finally:
+            use_backend(previous)
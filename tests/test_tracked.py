@@ -0,0 +1,102 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+import random
+from datetime import datetime
+
+from mo_dots import Data
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_json import TrackedDocument, value2json
+
+
+class Counted:
+    count = 0
+
+    def __data__(self):
+        Counted.count += 1
+        return {"counted": True}
+
+
+class TestTracked(FuzzyTestCase):
+    def test_same_as_value2json(self):
+        value = {"a": {"b": 1, "c": [1, None, "x"]}, "d": "", "e": None, "f": {}, "g": datetime(2020, 1, 1)}
+        doc = TrackedDocument(value)
+        self.assertEqual(value2json(doc), value2json(value))
+        self.assertEqual(value2json(doc), value2json(doc))
+
+    def test_set_and_delete(self):
+        doc = TrackedDocument(Data(a={"b": 1}, x=1))
+        value2json(doc)
+        doc["a.c"] = 2
+        self.assertEqual(value2json(doc), '{"a":{"b":1,"c":2},"x":1}')
+        doc["new.deep.path"] = "v"
+        self.assertEqual(value2json(doc), '{"a":{"b":1,"c":2},"new":{"deep":{"path":"v"}},"x":1}')
+        del doc["a.b"]
+        doc["x"] = None
+        self.assertEqual(value2json(doc), '{"a":{"c":2},"new":{"deep":{"path":"v"}}}')
+        self.assertEqual(doc["new.deep.path"], "v")
+
+    def test_replace_subtree(self):
+        doc = TrackedDocument({"a": {"b": {"c": 1}}})
+        value2json(doc)
+        doc["a"] = {"z": 1}
+        self.assertEqual(value2json(doc), '{"a":{"z":1}}')
+        doc["."] = [1, 2]
+        self.assertEqual(value2json(doc), "[1,2]")
+
+    def test_touch_after_in_place_change(self):
+        doc = TrackedDocument({"a": {"list": [1]}, "b": 2})
+        value2json(doc)
+        doc["a.list"].append(2)
+        self.assertEqual(value2json(doc), '{"a":{"list":[1]},"b":2}')  # STALE, AS DOCUMENTED
+        doc.touch("a.list")
+        self.assertEqual(value2json(doc), '{"a":{"list":[1,2]},"b":2}')
+
+    def test_only_dirty_path_is_encoded(self):
+        doc = TrackedDocument({"clean": {"thing": Counted()}, "dirty": {"n": 0}})
+        value2json(doc)
+        before = Counted.count
+        for i in range(10):
+            doc["dirty.n"] = i
+            self.assertEqual(value2json(doc), '{"clean":{"thing":{"counted":true}},"dirty":{"n":%d}}' % i)
+        self.assertEqual(Counted.count, before)
+
+    def test_other_options_encode_fully(self):
+        doc = TrackedDocument({"a": {"b": 1}})
+        self.assertEqual(value2json(doc, pretty=True), value2json({"a": {"b": 1}}, pretty=True))
+
+    def test_nested_in_other_values(self):
+        doc = TrackedDocument({"a": 1})
+        self.assertEqual(value2json({"doc": doc}), '{"doc":{"a":1}}')
+
+    def test_random_mutations(self):
+        rand = random.Random(42)
+        plain = {}
+        doc = TrackedDocument({})
+        for _ in range(500):
+            path = ".".join(rand.choice("abc") for _ in range(rand.randint(1, 3)))
+            value = rand.choice([None, 1, "x", [1], {"k": 2}])
+            doc[path] = value
+            _set(plain, path, value)
+            if rand.random() < 0.3:
+                self.assertEqual(value2json(doc), value2json(plain))
+        self.assertEqual(value2json(doc), value2json(plain))
+
+
+def _set(doc, path, value):
+    steps = path.split(".")
+    for step in steps[:-1]:
+        if not isinstance(doc.get(step), dict):
+            doc[step] = {}
+        doc = doc[step]
+    if value is None:
+        doc.pop(steps[-1], None)
+    else:
+        doc[steps[-1]] = value
@@ -0,0 +1,85 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at https://www.mozilla.org/en-US/MPL/2.0/.
+#
+# Author: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+from mo_dots import to_data
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from mo_json import Budget, json2value, truncated_json, value2json
+from mo_json.encoder import pretty_json
+from tests import speedtest_json
+
+
+class TestTruncate(FuzzyTestCase):
+    def test_same_as_value2json_when_small(self):
+        for case in ["EMPTY", "UNICODE", "SIMPLE", "NESTED"]:
+            data, _ = getattr(speedtest_json, case)
+            self.assertEqual(value2json(data, budget=Budget()), value2json(data))
+
+    def test_list_length(self):
+        result = value2json({"a": list(range(1000))}, budget=Budget(max_items=3))
+        self.assertEqual(result, '{"a":[0,1,2,"... (997 more)"]}')
+
+    def test_object_size(self):
+        result = value2json({"a": 1, "b": 2, "c": 3}, budget=Budget(max_items=2))
+        self.assertEqual(json2value(result), {"a": 1, "b": 2, "...": "... (1 more)"})
+
+    def test_string_length(self):
+        result = value2json("abcdefghij", budget=Budget(max_string=3))
+        self.assertEqual(result, '"abc... (7 more characters)"')
+
+    def test_depth(self):
+        result = value2json({"a": {"b": {"c": [1]}}, "d": [[[1]]]}, budget=Budget(max_depth=2))
+        self.assertEqual(result, '{"a":{"b":"{...}"},"d":["[...]"]}')
+
+    def test_bytes(self):
+        data = [{"k": i, "s": "abc"} for i in range(100000)]
+        result = value2json(data, budget=Budget(max_bytes=1000))
+        self.assertLess(len(result), 1100)
+        decoded = json2value(result)
+        self.assertEqual(decoded.last(), "... (" + str(100000 - (len(decoded) - 1)) + " more)")
+
+    def test_bytes_cut_strings(self):
+        result = value2json(["x" * 900] * 10, budget=Budget(max_bytes=2000))
+        self.assertLess(len(result), 2100)
+        decoded = json2value(result)
+        self.assertEqual(decoded[:2], ["x" * 900] * 2)
+        self.assertTrue(decoded[2].endswith(" more characters)"))
+
+    def test_missing_values(self):
+        result = value2json({"a": None, "b": "", "c": [None]}, budget=Budget())
+        self.assertEqual(result, '{"c":[null]}')
+
+    def test_generator(self):
+        result = value2json((i for i in range(1000)), budget=Budget(max_items=2))
+        self.assertEqual(result, '[0,1,"..."]')
+
+    def test_loop(self):
+        a = {}
+        a["a"] = a
+        result = value2json(a, budget=Budget(max_depth=3))
+        self.assertEqual(result, '{"a":{"a":{"a":"{...}"}}}')
+
+    def test_plain_object(self):
+        class Thing(object):
+            def __init__(self):
+                self.values = list(range(50))
+
+        result = json2value(value2json(Thing(), budget=Budget(max_items=2)))
+        self.assertEqual(result, {"values": [0, 1, "... (48 more)"]})
+
+    def test_pretty(self):
+        result = pretty_json(to_data({"a": list(range(1000))}), budget=Budget(max_items=2))
+        self.assertEqual(result, '{"a": [0, 1, "... (998 more)"]}')
+        self.assertEqual(value2json({"a": list(range(1000))}, pretty=True, budget=Budget(max_items=2)), result)
+
+    def test_huge_is_cut(self):
+        huge = {"rows": [{"k": i, "v": "x" * 10} for i in range(1_000_000)]}
+        result = truncated_json(huge, Budget(max_bytes=10_000, max_items=1_000_000))
+        self.assertLess(len(result), 10_100)
+        self.assertEqual(json2value(result).rows[0], {"k": 0, "v": "x" * 10})